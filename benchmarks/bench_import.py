@@ -0,0 +1,74 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Measures the cold import time of the driver modules with ``python -X
+importtime``, and lists their heaviest dependencies.
+
+Run with::
+
+    $ python -m benchmarks.bench_import
+
+"""
+import subprocess
+import sys
+
+
+MODULES = (
+    'bigchaindb_driver',
+    'bigchaindb_driver.crypto',
+    'bigchaindb_driver.driver',
+    'bigchaindb_driver.offchain',
+)
+
+REPEAT = 5
+
+TOP = 5
+
+
+def import_times(module):
+    """Imports ``module`` in a fresh interpreter.
+
+    Returns:
+        tuple: The cumulative import time of ``module``, and a mapping
+        between the names of the modules it imported directly and their
+        cumulative import times, in microseconds.
+
+    """
+    stderr = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import ' + module],
+        stderr=subprocess.PIPE, check=True, universal_newlines=True).stderr
+    children = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        # NOTE: Modules are listed after their dependencies, which are
+        #       indented by two more spaces per level.
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        name = name.strip()
+        if depth == 0 and name == module:
+            return int(cumulative), children
+        if depth == 0:
+            children = {}
+        elif depth == 1:
+            children[name] = int(cumulative)
+    raise ValueError('{} was not imported'.format(module))
+
+
+def bench(module):
+    runs = [import_times(module) for _ in range(REPEAT)]
+    total = min(run[0] for run in runs)
+    dependencies = sorted(
+        ((min(run[1].get(name, 0) for run in runs), name)
+         for name in runs[0][1]),
+        reverse=True)[:TOP]
+    print('{:<28} {:>8.1f} ms   {}'.format(
+        module, total / 1000,
+        ', '.join('{} {:.1f}'.format(name, time / 1000)
+                  for time, name in dependencies)))
+
+
+if __name__ == '__main__':
+    for module in MODULES:
+        bench(module)
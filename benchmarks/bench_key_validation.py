@@ -0,0 +1,65 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Compares the recursive key validation of
+:mod:`bigchaindb_driver.common.utils` with the iterative
+:func:`bigchaindb_driver.validation.validate_keys` on wide, deep and
+large documents.
+
+Run with::
+
+    $ python -m benchmarks.bench_key_validation
+
+"""
+import timeit
+
+from bigchaindb_driver.common.utils import validate_all_keys, validate_key
+from bigchaindb_driver.common.utils import serialize
+from bigchaindb_driver.validation import validate_keys
+
+
+def wide_document(width=100000):
+    return {'key_{}'.format(i): i for i in range(width)}
+
+
+def deep_document(depth=900):
+    # NOTE: Stays below the recursion limit of `validate_all_keys`.
+    document = leaf = {}
+    for _ in range(depth):
+        leaf['child'] = {'value': 1}
+        leaf = leaf['child']
+    return document
+
+
+def large_document(size=5 * 1024 * 1024):
+    document = {}
+    i = 0
+    while True:
+        document['record_{}'.format(i)] = {
+            'name': 'record {}'.format(i),
+            'tags': {'tag_{}'.format(j): 'value {}'.format(j)
+                     for j in range(10)},
+            'nested': {'a': {'b': {'c': i}}},
+        }
+        i += 1
+        if i % 1000 == 0 and len(serialize(document)) >= size:
+            return document
+
+
+def bench(name, document, number=5):
+    recursive = min(timeit.repeat(
+        lambda: validate_all_keys('metadata', document, validate_key),
+        number=number, repeat=3)) / number
+    iterative = min(timeit.repeat(
+        lambda: validate_keys('metadata', document),
+        number=number, repeat=3)) / number
+    print('{:<8} recursive {:>9.2f} ms   iterative {:>9.2f} ms   '
+          'speedup x{:.1f}'.format(name, recursive * 1e3, iterative * 1e3,
+                                   recursive / iterative))
+
+
+if __name__ == '__main__':
+    bench('wide', wide_document())
+    bench('deep', deep_document(), number=100)
+    bench('large', large_document())
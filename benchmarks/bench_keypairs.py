@@ -0,0 +1,41 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Measures the throughput of key pair generation: one
+:func:`~bigchaindb_driver.crypto.generate_keypair` call per key pair,
+against batches generated with
+:func:`~bigchaindb_driver.crypto.generate_keypairs`, either random or
+derived from a master seed.
+
+Run with::
+
+    $ python -m benchmarks.bench_keypairs
+
+"""
+import os
+import time
+
+from bigchaindb_driver.crypto import generate_keypair, generate_keypairs
+
+
+COUNT = 20000
+
+
+def bench(name, func):
+    start = time.perf_counter()
+    keypairs = func()
+    elapsed = time.perf_counter() - start
+    assert len(keypairs) == COUNT
+    print('{:<24} {:>9.0f} keypairs/s'.format(name, COUNT / elapsed))
+
+
+if __name__ == '__main__':
+    seed = os.urandom(32)
+    print('{} CPU(s)'.format(os.cpu_count()))
+    bench('serial', lambda: [generate_keypair() for _ in range(COUNT)])
+    bench('batch, random', lambda: generate_keypairs(COUNT))
+    bench('batch, derived', lambda: generate_keypairs(
+        COUNT, master_seed=seed))
+    bench('batch, derived, 1 proc', lambda: generate_keypairs(
+        COUNT, master_seed=seed, workers=1))
@@ -0,0 +1,113 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Compares reading the amounts, public keys and links of the outputs
+of a large result set by walking the decoded dicts, with the views of
+:mod:`bigchaindb_driver.models`.
+
+Both start from the JSON body of a response:
+
+* ``dict walk``: decode the body, then convert the fields on each pass,
+  as callers of the endpoints do,
+* ``views``: decode the body item by item and wrap the transactions,
+  as :meth:`~.TransactionsEndpoint.get` does with ``view=True``, then
+  read the attributes.
+
+``decode ms`` is the time to decode (and wrap) the body, ``pass ms``
+the time of a pass over the outputs, and ``memory MiB`` the memory held
+by the result set, i.e. by the dicts or by the views.
+
+Run with::
+
+    $ python -m benchmarks.bench_models
+
+"""
+import json
+import time
+import tracemalloc
+
+import rapidjson
+
+from bigchaindb_driver.common.transaction import TransactionLink
+from bigchaindb_driver.crypto import generate_keypair
+from bigchaindb_driver.models import Transaction, decode_array
+from bigchaindb_driver.offchain import (
+    fulfill_transaction,
+    prepare_create_transaction,
+)
+
+
+COUNT = 20000
+
+PASSES = 5
+
+
+def make_body(count):
+    alice = generate_keypair()
+    transaction = fulfill_transaction(
+        prepare_create_transaction(
+            signers=alice.public_key,
+            recipients=[([alice.public_key], 1)] * 4,
+            asset={'data': {'serial': 0}}),
+        private_keys=alice.private_key)
+    return rapidjson.dumps([dict(transaction, id='{:064x}'.format(i))
+                            for i in range(count)])
+
+
+def decode(body):
+    return json.loads(body)
+
+
+def walk_dicts(transactions):
+    total = 0
+    for transaction in transactions:
+        for index, output in enumerate(transaction['outputs']):
+            total += int(output['amount'])
+            keys = tuple(output['public_keys'])
+            link = TransactionLink(transaction['id'], index)
+    return total, keys, link
+
+
+def wrap(body):
+    return [Transaction(transaction, text)
+            for transaction, text in decode_array(body)]
+
+
+def walk_views(views):
+    total = 0
+    for view in views:
+        for output in view.outputs:
+            total += output.amount
+            keys = output.public_keys
+            link = output.link
+    return total, keys, link
+
+
+def bench(name, prepare, walk, body):
+    tracemalloc.start()
+    prepared = prepare(body)
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del prepared
+    # NOTE: Timed without tracemalloc, which slows allocations down.
+    start = time.perf_counter()
+    prepared = prepare(body)
+    decoded = time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(PASSES):
+        total, _, _ = walk(prepared)
+    later = (time.perf_counter() - start) / PASSES
+    assert total == COUNT * 4
+    print('{:<11} {:>12.1f} {:>12.1f} {:>12.1f}'.format(
+        name, decoded * 1000, later * 1000, memory / 2 ** 20))
+
+
+if __name__ == '__main__':
+    body = make_body(COUNT)
+    print('{} transactions of 4 outputs, {:.1f} MiB of JSON'.format(
+        COUNT, len(body) / 2 ** 20))
+    print('{:<11} {:>12} {:>12} {:>12}'.format(
+        '', 'decode ms', 'pass ms', 'memory MiB'))
+    bench('dict walk', decode, walk_dicts, body)
+    bench('views', wrap, walk_views, body)
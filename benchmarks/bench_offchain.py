@@ -0,0 +1,226 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Microbenchmarks of the offchain and transaction hot paths:
+preparation, fulfillment, (de)serialization, id and input validation,
+depending on the size of the asset, on the number of inputs and outputs
+and on the depth of threshold conditions.
+
+Run with::
+
+    $ python -m benchmarks.bench_offchain
+
+The timings, in seconds per call, can be saved in a JSON baseline,
+and later runs compared against it. Cases slower than the baseline by
+more than the tolerance are reported as regressions, and make the run
+exit with status 1::
+
+    $ python -m benchmarks.bench_offchain --save
+    $ python -m benchmarks.bench_offchain --compare --tolerance 0.2
+
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import timeit
+
+from bigchaindb_driver.common.transaction import Transaction
+from bigchaindb_driver.common.utils import serialize
+from bigchaindb_driver.crypto import generate_keypair
+from bigchaindb_driver.offchain import (
+    fulfill_transaction,
+    prepare_create_transaction,
+    prepare_transfer_transaction,
+)
+
+
+BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                        'baseline_offchain.json')
+
+ASSET_SIZES = (100, 10000, 100000)
+IO_COUNTS = (1, 8, 32)
+THRESHOLD_DEPTHS = (1, 2, 4)
+
+
+def spendable_inputs(transaction, indices=None):
+    indices = range(len(transaction['outputs'])) if indices is None \
+        else indices
+    return [{
+        'fulfillment': transaction['outputs'][index]['condition']['details'],
+        'fulfills': {'transaction_id': transaction['id'],
+                     'output_index': index},
+        'owners_before': transaction['outputs'][index]['public_keys'],
+    } for index in indices]
+
+
+def asset_cases(alice):
+    for size in ASSET_SIZES:
+        asset = {'data': {'blob': 'x' * size}}
+        prepared = prepare_create_transaction(signers=alice.public_key,
+                                              asset=asset)
+        signed = fulfill_transaction(prepared,
+                                     private_keys=alice.private_key)
+        transaction = Transaction.from_dict(signed)
+        suffix = '/asset={}'.format(size)
+        yield 'prepare_create' + suffix, lambda asset=asset: \
+            prepare_create_transaction(signers=alice.public_key, asset=asset)
+        yield 'fulfill/create' + suffix, lambda prepared=prepared: \
+            fulfill_transaction(prepared, private_keys=alice.private_key)
+        yield 'serialize' + suffix, lambda signed=signed: serialize(signed)
+        yield 'from_dict' + suffix, lambda signed=signed: \
+            Transaction.from_dict(signed)
+        yield 'to_dict' + suffix, transaction.to_dict
+        yield 'validate_id' + suffix, lambda signed=signed: \
+            Transaction.validate_id(signed)
+        yield 'inputs_valid/create' + suffix, transaction.inputs_valid
+
+
+def io_cases(alice):
+    for count in IO_COUNTS:
+        create = fulfill_transaction(
+            prepare_create_transaction(
+                signers=alice.public_key,
+                recipients=[([alice.public_key], 1)] * count,
+                asset={'data': {'serial': count}}),
+            private_keys=alice.private_key)
+        inputs = spendable_inputs(create)
+        recipients = [([alice.public_key], 1)] * count
+        asset = {'id': create['id']}
+        prepared = prepare_transfer_transaction(
+            inputs=inputs, recipients=recipients, asset=asset)
+        signed = fulfill_transaction(prepared,
+                                     private_keys=alice.private_key)
+        transaction = Transaction.from_dict(signed)
+        outputs = Transaction.from_dict(create).outputs
+        suffix = '/io={}'.format(count)
+        yield 'prepare_transfer' + suffix, \
+            lambda inputs=inputs, recipients=recipients, asset=asset: \
+            prepare_transfer_transaction(inputs=inputs,
+                                         recipients=recipients, asset=asset)
+        yield 'fulfill/transfer' + suffix, lambda prepared=prepared: \
+            fulfill_transaction(prepared, private_keys=alice.private_key)
+        yield 'serialize' + suffix, lambda signed=signed: serialize(signed)
+        yield 'from_dict' + suffix, lambda signed=signed: \
+            Transaction.from_dict(signed)
+        yield 'to_dict' + suffix, transaction.to_dict
+        yield 'validate_id' + suffix, lambda signed=signed: \
+            Transaction.validate_id(signed)
+        yield 'inputs_valid/transfer' + suffix, \
+            lambda transaction=transaction, outputs=outputs: \
+            transaction.inputs_valid(outputs)
+
+
+def threshold_cases(alice):
+    for depth in THRESHOLD_DEPTHS:
+        # NOTE: A depth of ``d`` nests ``d`` threshold conditions of two
+        #       subconditions each, e.g. ``[k0, [k1, k2]]`` for 2.
+        keypairs = [generate_keypair() for _ in range(depth + 1)]
+        public_keys = [keypair.public_key for keypair in keypairs[-2:]]
+        for keypair in reversed(keypairs[:-2]):
+            public_keys = [keypair.public_key, public_keys]
+        create = fulfill_transaction(
+            prepare_create_transaction(
+                signers=alice.public_key,
+                recipients=[(public_keys, 1)],
+                asset={'data': {'depth': depth}}),
+            private_keys=alice.private_key)
+        inputs = spendable_inputs(create)
+        # NOTE: The signing code expects flat lists of owners.
+        inputs[0]['owners_before'] = [keypair.public_key
+                                      for keypair in keypairs]
+        prepared = prepare_transfer_transaction(
+            inputs=inputs, recipients=alice.public_key,
+            asset={'id': create['id']})
+        private_keys = [keypair.private_key for keypair in keypairs]
+        signed = fulfill_transaction(prepared, private_keys=private_keys)
+        transaction = Transaction.from_dict(signed)
+        outputs = Transaction.from_dict(create).outputs
+        suffix = '/threshold={}'.format(depth)
+        yield 'fulfill/transfer' + suffix, \
+            lambda prepared=prepared, private_keys=private_keys: \
+            fulfill_transaction(prepared, private_keys=private_keys)
+        yield 'from_dict' + suffix, lambda signed=signed: \
+            Transaction.from_dict(signed)
+        yield 'inputs_valid/transfer' + suffix, \
+            lambda transaction=transaction, outputs=outputs: \
+            transaction.inputs_valid(outputs)
+
+
+def cases():
+    alice = generate_keypair()
+    yield from asset_cases(alice)
+    yield from io_cases(alice)
+    yield from threshold_cases(alice)
+
+
+def measure(function, repeat=3):
+    timer = timeit.Timer(function)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def run(pattern=None):
+    results = {}
+    for name, function in cases():
+        if pattern and pattern not in name:
+            continue
+        results[name] = measure(function)
+        print('{:<36} {:>12.1f} us'.format(name, results[name] * 1e6))
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for name, seconds in sorted(results.items()):
+        previous = baseline.get(name)
+        if previous is None:
+            print('{:<36} {:>12}'.format(name, 'new'))
+            continue
+        ratio = seconds / previous
+        regressed = ratio > 1 + tolerance
+        if regressed:
+            regressions.append(name)
+        print('{:<36} {:>10.2f}x {}'.format(
+            name, ratio, 'REGRESSION' if regressed else '').rstrip())
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('-k', dest='pattern',
+                        help='only run the cases whose name contains it')
+    parser.add_argument('--save', nargs='?', const=BASELINE, metavar='PATH',
+                        help='save the timings (default: %(const)s)')
+    parser.add_argument('--compare', nargs='?', const=BASELINE,
+                        metavar='PATH',
+                        help='compare the timings with a baseline '
+                             '(default: %(const)s)')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='slowdown ratio reported as a regression '
+                             '(default: %(default)s)')
+    args = parser.parse_args(argv)
+
+    results = run(args.pattern)
+    status = 0
+    if args.compare:
+        with open(args.compare) as baseline:
+            regressions = compare(results, json.load(baseline)['results'],
+                                  args.tolerance)
+        status = 1 if regressions else 0
+    if args.save:
+        with open(args.save, 'w') as baseline:
+            json.dump({
+                'python': '{} {}'.format(platform.python_implementation(),
+                                         platform.python_version()),
+                'machine': platform.machine(),
+                'results': results,
+            }, baseline, indent=2, sort_keys=True)
+            baseline.write('\n')
+    return status
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Measures how many signed transactions per second
+:class:`~bigchaindb_driver.outbox.Outbox` journals and marks as sent,
+depending on the batch size.
+
+Run with::
+
+    $ python -m benchmarks.bench_outbox
+
+"""
+import os
+import tempfile
+import time
+
+from bigchaindb_driver.crypto import generate_keypair
+from bigchaindb_driver.offchain import (
+    fulfill_transaction,
+    prepare_create_transaction,
+)
+from bigchaindb_driver.outbox import Outbox
+
+
+COUNT = 50000
+
+
+def make_transactions(count):
+    alice = generate_keypair()
+    transaction = fulfill_transaction(
+        prepare_create_transaction(signers=alice.public_key,
+                                   asset={'data': {'serial': 0}}),
+        private_keys=alice.private_key)
+    # NOTE: Signing is not what is measured; copies with distinct ids
+    #       are as heavy to journal as distinct transactions.
+    return [dict(transaction, id='{:064x}'.format(i)) for i in range(count)]
+
+
+def bench(transactions, batch_size, synchronous):
+    with tempfile.TemporaryDirectory() as directory:
+        with Outbox(os.path.join(directory, 'outbox.db'),
+                    synchronous=synchronous) as outbox:
+            start = time.perf_counter()
+            for i in range(0, len(transactions), batch_size):
+                batch = transactions[i:i + batch_size]
+                outbox.record(batch)
+                outbox.mark([transaction['id'] for transaction in batch],
+                            'sent')
+            elapsed = time.perf_counter() - start
+    print('batch {:>5}  synchronous={:<6} {:>9.0f} transactions/s'.format(
+        batch_size, synchronous, len(transactions) / elapsed))
+
+
+if __name__ == '__main__':
+    transactions = make_transactions(COUNT)
+    for synchronous in ('NORMAL', 'FULL'):
+        for batch_size in (1, 100, 1000):
+            bench(transactions[:COUNT if batch_size > 1 else 5000],
+                  batch_size, synchronous)
@@ -0,0 +1,86 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Compares the client CPU time per request of the default
+:class:`~bigchaindb_driver.transport.Transport` and of
+:class:`~bigchaindb_driver.httpclient.HTTPClientTransport`, for small
+reads and for transaction submissions.
+
+The :class:`~bigchaindb_driver.fakenode.FakeNode` runs in a separate
+process, so that its own CPU time is not counted.
+
+Run with::
+
+    $ python -m benchmarks.bench_transport
+
+"""
+import multiprocessing
+import time
+
+from bigchaindb_driver import BigchainDB
+from bigchaindb_driver.crypto import generate_keypair
+from bigchaindb_driver.fakenode import FakeNode
+from bigchaindb_driver.httpclient import HTTPClientTransport
+from bigchaindb_driver.offchain import (
+    fulfill_transaction,
+    prepare_create_transaction,
+)
+from bigchaindb_driver.transport import Transport
+
+
+COUNT = 2000
+
+TRANSPORTS = (Transport, HTTPClientTransport)
+
+
+def serve(pipe):
+    with FakeNode() as node:
+        pipe.send(node.url)
+        pipe.recv()
+
+
+def make_transactions(count):
+    alice = generate_keypair()
+    return [fulfill_transaction(
+        prepare_create_transaction(signers=alice.public_key,
+                                   asset={'data': {'serial': i}}),
+        private_keys=alice.private_key) for i in range(count)]
+
+
+def bench(name, transport_class, call, count):
+    # NOTE: Warms the connections up.
+    call(0)
+    start = time.process_time()
+    wall = time.perf_counter()
+    for i in range(1, count + 1):
+        call(i)
+    cpu = time.process_time() - start
+    wall = time.perf_counter() - wall
+    print('{:<10} {:<20} {:>8.1f} us CPU/request {:>8.1f} us/request'.format(
+        name, transport_class.__name__, cpu / count * 1e6,
+        wall / count * 1e6))
+
+
+if __name__ == '__main__':
+    parent, child = multiprocessing.Pipe()
+    server = multiprocessing.Process(target=serve, args=(child,))
+    server.start()
+    try:
+        url = parent.recv()
+        transactions = make_transactions((COUNT // 4 + 2) * len(TRANSPORTS))
+        for transport_class in TRANSPORTS:
+            bdb = BigchainDB(url, transport_class=transport_class)
+            bench('info', transport_class, lambda i: bdb.info(), COUNT)
+            bdb.transactions.send_commit(transactions[0])
+            txid = transactions[0]['id']
+            bench('retrieve', transport_class,
+                  lambda i: bdb.transactions.retrieve(txid), COUNT)
+            batch, transactions = \
+                transactions[1:COUNT // 4 + 2], transactions[COUNT // 4 + 2:]
+            bench('send', transport_class,
+                  lambda i: bdb.transactions.send_async(batch[i]),
+                  COUNT // 4)
+    finally:
+        parent.send(None)
+        server.join()
@@ -2,7 +2,26 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
-from .driver import BigchainDB   # noqa
+import sys
+from types import ModuleType
+
+
+class _Module(ModuleType):
+
+    # NOTE: Imports the driver, hence `requests`, on first use, so that
+    #       e.g. `bigchaindb_driver.crypto` can be imported alone. The
+    #       class of a module can be set since Python 3.5, whereas the
+    #       module level __getattr__ of PEP 562 needs Python 3.7.
+    def __getattr__(self, name):
+        if name == 'BigchainDB':
+            from .driver import BigchainDB
+            setattr(self, name, BigchainDB)
+            return BigchainDB
+        raise AttributeError(
+            'module {!r} has no attribute {!r}'.format(self.__name__, name))
+
+
+sys.modules[__name__].__class__ = _Module
 
 
 __author__ = 'BigchainDB'
@@ -5,12 +5,12 @@
 import time
 
 from collections import namedtuple
-from datetime import datetime, timedelta
 
 from requests import Session
 from requests.exceptions import ConnectionError
 
 from .exceptions import HTTP_EXCEPTIONS, TransportError
+from .metrics import NOOP_METRICS, endpoint_label
 
 
 BACKOFF_DELAY = 0.5  # seconds
@@ -21,16 +21,20 @@ HttpResponse = namedtuple('HttpResponse', ('status_code', 'headers', 'data'))
 class Connection:
     """A Connection object to make HTTP requests to a particular node."""
 
-    def __init__(self, *, node_url, headers=None):
+    def __init__(self, *, node_url, headers=None, metrics=NOOP_METRICS):
         """Initializes a :class:`~bigchaindb_driver.connection.Connection`
         instance.
 
         Args:
             node_url (str):  Url of the node to connect to.
             headers (dict): Optional headers to send with each request.
+            metrics (:class:`~bigchaindb_driver.metrics.AbstractMetrics`):
+                Optional metrics sink. Defaults to
+                :data:`~bigchaindb_driver.metrics.NOOP_METRICS`.
 
         """
         self.node_url = node_url
+        self.metrics = metrics
         self.session = Session()
         if headers:
             self.session.headers.update(headers)
@@ -40,15 +44,16 @@ class Connection:
 
     def request(self, method, *, path=None, json=None,
                 params=None, headers=None, timeout=None,
-                backoff_cap=None, **kwargs):
+                backoff_cap=None, decode=True, **kwargs):
         """Performs an HTTP request with the given parameters.
 
            Implements exponential backoff.
 
            If `ConnectionError` occurs, a timestamp equal to now +
            the default delay (`BACKOFF_DELAY`) is assigned to the object.
-           The timestamp is in UTC. Next time the function is called, it either
-           waits till the timestamp is passed or raises `TimeoutError`.
+           The timestamp is given by :func:`time.monotonic`. Next time the
+           function is called, it either waits till the timestamp is passed
+           or raises `TimeoutError`.
 
            If `ConnectionError` occurs two or more times in a row,
            the retry count is incremented and the new timestamp is calculated
@@ -67,6 +72,8 @@ class Connection:
             timeout (int): Optional timeout in seconds.
             backoff_cap (int): The maximal allowed backoff delay in seconds
                                to be assigned to a node.
+            decode (bool): Whether to decode the JSON body of a successful
+                           response. Defaults to ``True``.
             kwargs: Optional keyword arguments.
 
         """
@@ -80,6 +87,10 @@ class Connection:
 
         connExc = None
         timeout = timeout if timeout is None else timeout - backoff_timedelta
+        metrics = self.metrics
+        if metrics.enabled:
+            start = time.monotonic()
+        response = error = None
         try:
             response = self._request(
                 method=method,
@@ -88,37 +99,57 @@ class Connection:
                 json=json,
                 params=params,
                 headers=headers,
+                decode=decode,
                 **kwargs,
             )
         except ConnectionError as err:
-            connExc = err
+            connExc = error = err
             raise err
+        except TransportError as err:
+            error = err
+            raise
         finally:
             self.update_backoff_time(success=connExc is None,
                                      backoff_cap=backoff_cap)
+            if metrics.enabled:
+                self._record_request(method, path, time.monotonic() - start,
+                                     response, error)
         return response
 
     def get_backoff_timedelta(self):
         if self.backoff_time is None:
             return 0
 
-        return (self.backoff_time - datetime.utcnow()).total_seconds()
+        return self.backoff_time - time.monotonic()
 
-    def update_backoff_time(self, success, backoff_cap=None):
+    def update_backoff_time(self, success, backoff_cap=None, retries=None):
         if success:
             self._retries = 0
             self.backoff_time = None
         else:
-            utcnow = datetime.utcnow()
+            # NOTE: `retries` overrides the count of the failures in a row
+            #       of the node, e.g. with the retries of a request after
+            #       HTTP errors, which `request` does not count.
+            if retries is not None:
+                self._retries = retries
             backoff_delta = BACKOFF_DELAY * 2 ** self._retries
             if backoff_cap is not None:
                 backoff_delta = min(backoff_delta, backoff_cap)
-            self.backoff_time = utcnow + timedelta(seconds=backoff_delta)
+            self.backoff_time = time.monotonic() + backoff_delta
             self._retries += 1
+            if self.metrics.enabled:
+                self.metrics.inc('bigchaindb_driver_backoffs_total',
+                                 node=self.node_url)
+                self.metrics.set('bigchaindb_driver_backoff_seconds',
+                                 backoff_delta, node=self.node_url)
 
-    def _request(self, **kwargs):
+    def _request(self, decode=True, **kwargs):
         response = self.session.request(**kwargs)
+        if self.metrics.enabled:
+            self._record_bytes(response)
         text = response.text
+        if not decode and 200 <= response.status_code < 300:
+            return HttpResponse(response.status_code, response.headers, text)
         try:
             json = response.json()
         except ValueError:
@@ -128,3 +159,27 @@ class Connection:
             raise exc_cls(response.status_code, text, json, kwargs['url'])
         data = json if json is not None else text
         return HttpResponse(response.status_code, response.headers, data)
+
+    def _record_request(self, method, path, duration, response, error):
+        endpoint = endpoint_label(path)
+        if response is not None:
+            status = response.status_code
+        else:
+            status = getattr(error, 'status_code', None) or 'error'
+        self.metrics.observe('bigchaindb_driver_request_duration_seconds',
+                             duration, node=self.node_url, endpoint=endpoint,
+                             method=method, status=status)
+        if error is not None:
+            self.metrics.inc('bigchaindb_driver_errors_total',
+                             node=self.node_url, endpoint=endpoint,
+                             error=type(error).__name__)
+
+    def _record_bytes(self, response):
+        request = response.request
+        endpoint = endpoint_label(request.path_url.partition('?')[0])
+        self.metrics.inc('bigchaindb_driver_request_bytes_total',
+                         len(request.body or ''), node=self.node_url,
+                         endpoint=endpoint)
+        self.metrics.inc('bigchaindb_driver_response_bytes_total',
+                         len(response.content), node=self.node_url,
+                         endpoint=endpoint)
@@ -2,13 +2,26 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
+import hashlib
+import hmac
 from collections import namedtuple
 
-from cryptoconditions import crypto
+# NOTE: Keys are generated with the libraries `cryptoconditions` builds on,
+#       as importing `cryptoconditions` itself is slow.
+from base58 import b58encode
+from nacl.signing import SigningKey
 
 
 CryptoKeypair = namedtuple('CryptoKeypair', ('private_key', 'public_key'))
 
+# NOTE: Key derivation follows SLIP-0010 for ed25519, in which all the
+#       derivation steps are hardened. See
+#       https://github.com/satoshilabs/slips/blob/master/slip-0010.md
+SLIP10_CURVE_KEY = b'ed25519 seed'
+HARDENED_OFFSET = 2 ** 31
+
+DEFAULT_CHUNK_SIZE = 1024
+
 
 def generate_keypair(seed=None):
     """Generates a cryptographic key pair.
@@ -23,5 +36,141 @@ def generate_keypair(seed=None):
         :attr:`~bigchaindb_driver.crypto.CryptoKeypair.public_key`.
 
     """
-    return CryptoKeypair(
-        *(k.decode() for k in crypto.ed25519_generate_key_pair(seed)))
+    signing_key = SigningKey(seed) if seed else SigningKey.generate()
+    return CryptoKeypair(b58encode(signing_key.encode()).decode(),
+                         b58encode(signing_key.verify_key.encode()).decode())
+
+
+def _parse_path(path):
+    if isinstance(path, int):
+        path = (path,)
+    elif isinstance(path, str):
+        parts = path.split('/')
+        if parts[0] != 'm':
+            raise ValueError('Derivation path must start with "m": '
+                             '{}'.format(path))
+        try:
+            path = [int(part.rstrip("'")) for part in parts[1:]]
+        except ValueError:
+            raise ValueError('Invalid derivation path: {}'.format(path))
+    path = tuple(path)
+    for index in path:
+        if not 0 <= index < HARDENED_OFFSET:
+            raise ValueError('Derivation indices must be in [0, 2**31), '
+                             'got {}'.format(index))
+    return path
+
+
+def _master_node(master_seed):
+    if not isinstance(master_seed, bytes) or \
+            not 16 <= len(master_seed) <= 64:
+        raise ValueError('`master_seed` must be between 16 and 64 bytes')
+    digest = hmac.new(SLIP10_CURVE_KEY, master_seed, hashlib.sha512).digest()
+    return digest[:32], digest[32:]
+
+
+def _child_node(node, index):
+    key, chain_code = node
+    data = b'\x00' + key + (index + HARDENED_OFFSET).to_bytes(4, 'big')
+    digest = hmac.new(chain_code, data, hashlib.sha512).digest()
+    return digest[:32], digest[32:]
+
+
+def _derive_node(master_seed, path):
+    node = _master_node(master_seed)
+    for index in path:
+        node = _child_node(node, index)
+    return node
+
+
+def derive_keypair(master_seed, path):
+    """Deterministically derives a child key pair from a master seed,
+    so that key pairs can be re-derived on demand instead of being
+    stored.
+
+    Derivation follows `SLIP-0010
+    <https://github.com/satoshilabs/slips/blob/master/slip-0010.md>`_
+    for ed25519, where every derivation step is hardened.
+
+    Args:
+        master_seed (bytes): The master seed, between 16 and 64 bytes
+            long. It MUST be kept secret, as it gives access to all the
+            derived private keys.
+        path (:obj:`int` | :obj:`str` | :obj:`list` of :obj:`int`): A
+            single index, a path of indices, or a path string such as
+            ``"m/44'/0'/3'"`` (all steps being hardened, the trailing
+            ``'`` is optional).
+
+    Returns:
+        :class:`~bigchaindb_driver.crypto.CryptoKeypair`: The derived
+        key pair.
+
+    Raises:
+        ValueError: If ``master_seed`` or ``path`` is invalid.
+
+    """
+    key, _ = _derive_node(master_seed, _parse_path(path))
+    return generate_keypair(key)
+
+
+def _generate_chunk(count):
+    return [generate_keypair() for _ in range(count)]
+
+
+def _derive_chunk(parent_node, indices):
+    return [generate_keypair(_child_node(parent_node, index)[0])
+            for index in indices]
+
+
+def generate_keypairs(count, *, master_seed=None, parent_path=(), start=0,
+                      workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Generates many key pairs at once, over a pool of processes.
+
+    Args:
+        count (int): Number of key pairs to generate.
+        master_seed (bytes): Optional master seed. If given, the key
+            pairs are derived deterministically with
+            :func:`~.derive_keypair`, at the indices ``start`` to
+            ``start + count - 1`` under ``parent_path``. Otherwise they
+            are random.
+        parent_path (:obj:`str` | :obj:`list` of :obj:`int`): Path of
+            the parent of the derived key pairs. Defaults to the master
+            node itself.
+        start (int): Index of the first derived key pair. Defaults to
+            ``0``.
+        workers (int): Number of worker processes. Defaults to ``None``,
+            meaning one per CPU. With ``1``, or if ``count`` fits in a
+            single chunk, the key pairs are generated in the current
+            process.
+        chunk_size (int): Number of key pairs generated by a worker at
+            once. Defaults to :data:`DEFAULT_CHUNK_SIZE`.
+
+    Returns:
+        :obj:`list` of :class:`~bigchaindb_driver.crypto.CryptoKeypair`:
+        The key pairs, in index order if derived.
+
+    Raises:
+        ValueError: If ``master_seed``, ``parent_path`` or the derived
+            indices are invalid.
+
+    """
+    if master_seed is None:
+        tasks = [(_generate_chunk, min(chunk_size, count - offset))
+                 for offset in range(0, count, chunk_size)]
+    else:
+        parent_node = _derive_node(master_seed, _parse_path(parent_path))
+        if count and not 0 <= start <= start + count <= HARDENED_OFFSET:
+            raise ValueError('Derivation indices must be in [0, 2**31)')
+        tasks = [(_derive_chunk, parent_node,
+                  range(start + offset,
+                        start + min(offset + chunk_size, count)))
+                 for offset in range(0, count, chunk_size)]
+
+    if workers == 1 or len(tasks) <= 1:
+        chunks = [task[0](*task[1:]) for task in tasks]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(*task) for task in tasks]
+            chunks = [future.result() for future in futures]
+    return [keypair for chunk in chunks for keypair in chunk]
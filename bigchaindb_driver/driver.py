@@ -2,8 +2,10 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
+from collections import OrderedDict
+
+from .exceptions import BigchaindbException, InvalidTransactionIdError
 from .transport import Transport
-from .offchain import prepare_transaction, fulfill_transaction
 from .utils import normalize_nodes
 
 
@@ -18,7 +20,7 @@ class BigchainDB:
     """
 
     def __init__(self, *nodes, transport_class=Transport,
-                 headers=None, timeout=20):
+                 headers=None, timeout=20, utxo_index=None):
         """Initialize a :class:`~bigchaindb_driver.BigchainDB` driver instance.
 
         Args:
@@ -36,6 +38,13 @@ class BigchainDB:
                 <.TransactionsEndpoint.send_commit>`).
             timeout (int): Optional timeout in seconds that will be passed
                 to each request.
+            utxo_index (:class:`~bigchaindb_driver.utxo.AbstractUTXOIndex`):
+                Optional UTXO index to keep up to date with the
+                transactions sent and retrieved through this driver.
+                Transactions sent with the modes ``async`` or ``sync``
+                are indexed once the node accepts them, before they are
+                committed, and stay indexed if they are never committed;
+                see :meth:`~.AbstractUTXOIndex.reconcile`.
         """
         self._nodes = normalize_nodes(*nodes, headers=headers)
         self._transport = transport_class(*self._nodes, timeout=timeout)
@@ -44,6 +53,7 @@ class BigchainDB:
         self._blocks = BlocksEndpoint(self)
         self._assets = AssetsEndpoint(self)
         self._metadata = MetadataEndpoint(self)
+        self._utxo_index = utxo_index
         self.api_prefix = '/api/v1'
 
     @property
@@ -59,6 +69,13 @@ class BigchainDB:
         """
         return self._transport
 
+    @property
+    def utxo_index(self):
+        """:class:`~bigchaindb_driver.utxo.AbstractUTXOIndex`: Local
+        index of unspent outputs, if any (``None`` otherwise).
+        """
+        return self._utxo_index
+
     @property
     def transactions(self):
         """:class:`~bigchaindb_driver.driver.TransactionsEndpoint`:
@@ -94,12 +111,14 @@ class BigchainDB:
         """
         return self._blocks
 
-    def info(self, headers=None):
+    def info(self, headers=None, timeout=None):
         """Retrieves information of the node being connected to via the
         root endpoint ``'/'``.
 
         Args:
             headers (dict): Optional headers to pass to the request.
+            timeout (float): Optional timeout in seconds, overriding
+                the timeout of the driver.
 
         Returns:
             dict: Details of the node that this instance is connected
@@ -115,14 +134,17 @@ class BigchainDB:
 
         """
         return self.transport.forward_request(
-            method='GET', path='/', headers=headers)
+            method='GET', path='/', headers=headers,
+            timeout=timeout)
 
-    def api_info(self, headers=None):
+    def api_info(self, headers=None, timeout=None):
         """Retrieves information provided by the API root endpoint
         ``'/api/v1'``.
 
         Args:
             headers (dict): Optional headers to pass to the request.
+            timeout (float): Optional timeout in seconds, overriding
+                the timeout of the driver.
 
         Returns:
             dict: Details of the HTTP API provided by the BigchainDB
@@ -133,6 +155,7 @@ class BigchainDB:
             method='GET',
             path=self.api_prefix,
             headers=headers,
+            timeout=timeout,
         )
 
 
@@ -245,6 +268,9 @@ class TransactionsEndpoint(NamespacedDriver):
             * The argument ``signers`` is ignored.
 
         """
+        # NOTE: Imported on first use, as the transaction machinery is
+        #       slow to import and not needed to read from the nodes.
+        from .offchain import prepare_transaction
         return prepare_transaction(
             operation=operation,
             signers=signers,
@@ -273,9 +299,11 @@ class TransactionsEndpoint(NamespacedDriver):
                 key is missing.
 
         """
+        from .offchain import fulfill_transaction
         return fulfill_transaction(transaction, private_keys=private_keys)
 
-    def get(self, *, asset_id, operation=None, headers=None):
+    def get(self, *, asset_id, operation=None, headers=None,
+            timeout=None, view=False):
         """Given an asset id, get its list of transactions (and
         optionally filter for only ``'CREATE'`` or ``'TRANSFER'``
         transactions).
@@ -286,6 +314,11 @@ class TransactionsEndpoint(NamespacedDriver):
                 should be. Either ``'CREATE'`` or ``'TRANSFER'``.
                 Defaults to ``None``.
             headers (dict): Optional headers to pass to the request.
+            timeout (float): Optional timeout in seconds, overriding
+                the timeout of the driver.
+            view (bool): Whether to return
+                :class:`~bigchaindb_driver.models.Transaction` views
+                rather than dicts. Defaults to ``False``.
 
         Note:
             Please note that the id of an asset in BigchainDB is
@@ -310,84 +343,233 @@ class TransactionsEndpoint(NamespacedDriver):
             list: List of transactions.
 
         """
-        return self.transport.forward_request(
+        # NOTE: Views keep the JSON text of each transaction, which is
+        #       sliced out of the body rather than encoded again.
+        body = self.transport.forward_request(
             method='GET',
             path=self.path,
             params={'asset_id': asset_id, 'operation': operation},
             headers=headers,
+            timeout=timeout,
+            decode=not view,
         )
-
-    def send_async(self, transaction, headers=None):
+        if not view:
+            for transaction in body:
+                self._index(transaction)
+            return body
+        from .models import Transaction, decode_array
+        views = []
+        for transaction, json in decode_array(body):
+            self._index(transaction)
+            views.append(Transaction(transaction, json))
+        return views
+
+    def send_async(self, transaction, headers=None, validate=False,
+                   timeout=None):
         """Submit a transaction to the Federation with the mode `async`.
 
         Args:
             transaction (dict): the transaction to be sent
                 to the Federation node(s).
             headers (dict): Optional headers to pass to the request.
+            validate (bool): Whether to validate the transaction against
+                the transaction schema before sending it. Defaults to
+                ``False``.
+            timeout (float): Optional timeout in seconds, overriding
+                the timeout of the driver.
 
         Returns:
             dict: The transaction sent to the Federation node(s).
 
+        Raises:
+            :exc:`~.exceptions.SchemaValidationError`: If ``validate``
+                is set and the transaction does not match the schema.
+
         """
-        return self.transport.forward_request(
-            method='POST',
-            path=self.path,
-            json=transaction,
-            params={'mode': 'async'},
-            headers=headers)
+        return self._send(transaction, mode='async', headers=headers,
+                          validate=validate, timeout=timeout)
 
-    def send_sync(self, transaction, headers=None):
+    def send_sync(self, transaction, headers=None, validate=False,
+                  timeout=None):
         """Submit a transaction to the Federation with the mode `sync`.
 
         Args:
             transaction (dict): the transaction to be sent
                 to the Federation node(s).
             headers (dict): Optional headers to pass to the request.
+            validate (bool): Whether to validate the transaction against
+                the transaction schema before sending it. Defaults to
+                ``False``.
+            timeout (float): Optional timeout in seconds, overriding
+                the timeout of the driver.
 
         Returns:
             dict: The transaction sent to the Federation node(s).
 
+        Raises:
+            :exc:`~.exceptions.SchemaValidationError`: If ``validate``
+                is set and the transaction does not match the schema.
+
         """
-        return self.transport.forward_request(
-            method='POST',
-            path=self.path,
-            json=transaction,
-            params={'mode': 'sync'},
-            headers=headers)
+        return self._send(transaction, mode='sync', headers=headers,
+                          validate=validate, timeout=timeout)
 
-    def send_commit(self, transaction, headers=None):
+    def send_commit(self, transaction, headers=None, validate=False,
+                    timeout=None):
         """Submit a transaction to the Federation with the mode `commit`.
 
         Args:
             transaction (dict): the transaction to be sent
                 to the Federation node(s).
             headers (dict): Optional headers to pass to the request.
+            validate (bool): Whether to validate the transaction against
+                the transaction schema before sending it. Defaults to
+                ``False``.
+            timeout (float): Optional timeout in seconds, overriding
+                the timeout of the driver.
 
         Returns:
             dict: The transaction sent to the Federation node(s).
 
+        Raises:
+            :exc:`~.exceptions.SchemaValidationError`: If ``validate``
+                is set and the transaction does not match the schema.
+
         """
-        return self.transport.forward_request(
-            method='POST',
-            path=self.path,
-            json=transaction,
-            params={'mode': 'commit'},
-            headers=headers)
+        return self._send(transaction, mode='commit', headers=headers,
+                          validate=validate, timeout=timeout)
 
-    def retrieve(self, txid, headers=None):
+    def retrieve(self, txid, headers=None, timeout=None, *, view=False):
         """Retrieves the transaction with the given id.
 
         Args:
             txid (str): Id of the transaction to retrieve.
             headers (dict): Optional headers to pass to the request.
+            timeout (float): Optional timeout in seconds, overriding
+                the timeout of the driver.
+            view (bool): Whether to return a
+                :class:`~bigchaindb_driver.models.Transaction` view
+                rather than a dict. Defaults to ``False``.
 
         Returns:
             dict: The transaction with the given id.
 
         """
         path = self.path + txid
-        return self.transport.forward_request(
-            method='GET', path=path, headers=None)
+        transaction = self.transport.forward_request(
+            method='GET', path=path, headers=None, timeout=timeout)
+        self._index(transaction)
+        if view:
+            from .models import Transaction
+            return Transaction(transaction)
+        return transaction
+
+    def retrieve_many(self, txids, *, concurrency=8, verify=False,
+                      headers=None, timeout=None, view=False, index=True):
+        """Retrieves the transactions with the given ids, with up to
+        ``concurrency`` requests in flight.
+
+        Each id is retrieved once, however often it is given. An id that
+        cannot be retrieved does not stop the others from being
+        retrieved: the error takes the place of its transaction.
+
+        Args:
+            txids (iterable): Ids of the transactions to retrieve.
+            concurrency (int): Maximum number of requests in flight.
+                Defaults to ``8``.
+            verify (bool): Whether to check that the id of each retrieved
+                transaction is the requested one and matches the hash of
+                its body. Defaults to ``False``.
+            headers (dict): Optional headers to pass to the requests.
+            timeout (float): Optional timeout in seconds of each request,
+                overriding the timeout of the driver.
+            view (bool): Whether to return
+                :class:`~bigchaindb_driver.models.Transaction` views
+                rather than dicts. Defaults to ``False``.
+            index (bool): Whether to add the transactions to the
+                :attr:`~.BigchainDB.utxo_index`. Defaults to ``True``.
+
+        Returns:
+            :class:`~collections.OrderedDict`: Mapping between the ids,
+            in the order in which they are first given, and the
+            transactions, or the exceptions raised while retrieving them,
+            e.g. :exc:`~.exceptions.NotFoundError`, or
+            :exc:`~.exceptions.InvalidTransactionIdError` if ``verify``
+            is set and the check fails, or while indexing them in the
+            :attr:`~.BigchainDB.utxo_index`.
+
+        """
+        txids = list(OrderedDict.fromkeys(txids))
+
+        def fetch(txid):
+            try:
+                transaction = self.transport.forward_request(
+                    method='GET', path=self.path + txid, headers=headers,
+                    timeout=timeout)
+                if verify:
+                    _verify_transaction_id(txid, transaction)
+            except BigchaindbException as exc:
+                return exc
+            return transaction
+
+        if concurrency > 1 and len(txids) > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(
+                    max_workers=min(concurrency, len(txids))) as executor:
+                results = list(executor.map(fetch, txids))
+        else:
+            results = [fetch(txid) for txid in txids]
+        if view:
+            from .models import Transaction
+        retrieved = OrderedDict()
+        for txid, result in zip(txids, results):
+            if not isinstance(result, BigchaindbException):
+                # NOTE: A transaction the index rejects, e.g. a malformed
+                #       one, must not lose the others.
+                try:
+                    if index:
+                        self._index(result)
+                except Exception as exc:
+                    result = exc
+                else:
+                    if view:
+                        result = Transaction(result)
+            retrieved[txid] = result
+        return retrieved
+
+    def _send(self, transaction, *, mode, headers, validate, timeout):
+        if validate:
+            from .schema import validate_transaction
+            validate_transaction(transaction)
+        response = self.transport.forward_request(
+            method='POST',
+            path=self.path,
+            json=transaction,
+            params={'mode': mode},
+            headers=headers,
+            timeout=timeout)
+        # NOTE: Indexed whatever the mode, i.e. optimistically for the
+        #       modes `async` and `sync`, see `utxo`.
+        self._index(transaction)
+        return response
+
+    def _index(self, transaction):
+        if self.driver.utxo_index is not None:
+            self.driver.utxo_index.add_transaction(transaction)
+
+
+def _verify_transaction_id(txid, transaction):
+    # NOTE: Imported here as `common.transaction` is slow to import.
+    from .common.transaction import Transaction
+    if not isinstance(transaction, dict) or transaction.get('id') != txid:
+        raise InvalidTransactionIdError(
+            'The node returned another transaction than {}'.format(txid),
+            txid)
+    body = Transaction._to_str(dict(transaction, id=None))
+    if Transaction._to_hash(body) != txid:
+        raise InvalidTransactionIdError(
+            "The id of transaction {} isn't equal to the hash of its "
+            'body'.format(txid), txid)
 
 
 class OutputsEndpoint(NamespacedDriver):
@@ -400,7 +582,7 @@ class OutputsEndpoint(NamespacedDriver):
 
     PATH = '/outputs/'
 
-    def get(self, public_key, spent=None, headers=None):
+    def get(self, public_key, spent=None, headers=None, timeout=None):
         """Get transaction outputs by public key. The public_key parameter
         must be a base58 encoded ed25519 public key associated with
         transaction output ownership.
@@ -413,6 +595,8 @@ class OutputsEndpoint(NamespacedDriver):
                 result includes all the outputs (both spent and unspent)
                 associated with the public key.
             headers (dict): Optional headers to pass to the request.
+            timeout (float): Optional timeout in seconds, overriding
+                the timeout of the driver.
 
         Returns:
             :obj:`list` of :obj:`str`: List of unfulfilled conditions.
@@ -432,6 +616,7 @@ class OutputsEndpoint(NamespacedDriver):
             path=self.path,
             params={'public_key': public_key, 'spent': spent},
             headers=headers,
+            timeout=timeout,
         )
 
 
@@ -445,13 +630,15 @@ class BlocksEndpoint(NamespacedDriver):
 
     PATH = '/blocks/'
 
-    def get(self, *, txid, headers=None):
+    def get(self, *, txid, headers=None, timeout=None):
         """Get the block that contains the given transaction id (``txid``)
            else return ``None``
 
         Args:
             txid (str): Transaction id.
             headers (dict): Optional headers to pass to the request.
+            timeout (float): Optional timeout in seconds, overriding
+                the timeout of the driver.
 
         Returns:
             :obj:`list` of :obj:`int`: List of block heights.
@@ -462,23 +649,34 @@ class BlocksEndpoint(NamespacedDriver):
             path=self.path,
             params={'transaction_id': txid},
             headers=headers,
+            timeout=timeout,
         )
         return block_list[0] if len(block_list) else None
 
-    def retrieve(self, block_height, headers=None):
+    def retrieve(self, block_height, headers=None, timeout=None, *,
+                 view=False):
         """Retrieves the block with the given ``block_height``.
 
         Args:
             block_height (str): height of the block to retrieve.
             headers (dict): Optional headers to pass to the request.
+            timeout (float): Optional timeout in seconds, overriding
+                the timeout of the driver.
+            view (bool): Whether to return a
+                :class:`~bigchaindb_driver.models.Block` view rather
+                than a dict. Defaults to ``False``.
 
         Returns:
             dict: The block with the given ``block_height``.
 
         """
         path = self.path + block_height
-        return self.transport.forward_request(
-            method='GET', path=path, headers=None)
+        block = self.transport.forward_request(
+            method='GET', path=path, headers=None, timeout=timeout)
+        if view:
+            from .models import Block
+            return Block(block)
+        return block
 
 
 class AssetsEndpoint(NamespacedDriver):
@@ -491,7 +689,8 @@ class AssetsEndpoint(NamespacedDriver):
 
     PATH = '/assets/'
 
-    def get(self, *, search, limit=0, headers=None):
+    def get(self, *, search, limit=0, headers=None, timeout=None,
+            view=False):
         """Retrieves the assets that match a given text search string.
 
         Args:
@@ -499,17 +698,27 @@ class AssetsEndpoint(NamespacedDriver):
             limit (int): Limit the number of returned documents. Defaults to
                 zero meaning that it returns all the matching assets.
             headers (dict): Optional headers to pass to the request.
+            timeout (float): Optional timeout in seconds, overriding
+                the timeout of the driver.
+            view (bool): Whether to return
+                :class:`~bigchaindb_driver.models.AssetHit` views rather
+                than dicts. Defaults to ``False``.
 
         Returns:
             :obj:`list` of :obj:`dict`: List of assets that match the query.
 
         """
-        return self.transport.forward_request(
+        hits = self.transport.forward_request(
             method='GET',
             path=self.path,
             params={'search': search, 'limit': limit},
-            headers=headers
+            headers=headers,
+            timeout=timeout,
         )
+        if view:
+            from .models import AssetHit
+            return [AssetHit(hit) for hit in hits]
+        return hits
 
 
 class MetadataEndpoint(NamespacedDriver):
@@ -522,7 +731,8 @@ class MetadataEndpoint(NamespacedDriver):
 
     PATH = '/metadata/'
 
-    def get(self, *, search, limit=0, headers=None):
+    def get(self, *, search, limit=0, headers=None, timeout=None,
+            view=False):
         """Retrieves the metadata that match a given text search string.
 
         Args:
@@ -530,14 +740,24 @@ class MetadataEndpoint(NamespacedDriver):
             limit (int): Limit the number of returned documents. Defaults to
                 zero meaning that it returns all the matching metadata.
             headers (dict): Optional headers to pass to the request.
+            timeout (float): Optional timeout in seconds, overriding
+                the timeout of the driver.
+            view (bool): Whether to return
+                :class:`~bigchaindb_driver.models.MetadataHit` views rather
+                than dicts. Defaults to ``False``.
 
         Returns:
             :obj:`list` of :obj:`dict`: List of metadata that match the query.
 
         """
-        return self.transport.forward_request(
+        hits = self.transport.forward_request(
             method='GET',
             path=self.path,
             params={'search': search, 'limit': limit},
-            headers=headers
+            headers=headers,
+            timeout=timeout,
         )
+        if view:
+            from .models import MetadataHit
+            return [MetadataHit(hit) for hit in hits]
+        return hits
@@ -27,6 +27,56 @@ class MissingPrivateKeyError(BigchaindbException):
     """Raised if a private key is missing."""
 
 
+class SchemaValidationError(BigchaindbException):
+    """Raised if a transaction does not match the transaction schema."""
+
+
+class InvalidKeysError(BigchaindbException):
+    """Raised if an asset or metadata document holds invalid keys."""
+
+    def __str__(self):
+        return self.args[0]
+
+    @property
+    def violations(self):
+        """Returns the :class:`~.validation.KeyViolation` instances found
+        in the document.
+        """
+        return self.args[1]
+
+
+class InsufficientFundsError(BigchaindbException):
+    """Raised if the available outputs do not cover the amount to
+    transfer.
+    """
+
+
+class CommitTimeoutError(BigchaindbException):
+    """Raised if a tracked transaction is not committed in time."""
+
+    @property
+    def transaction_id(self):
+        """Returns the id of the transaction that was not committed."""
+        return self.args[1]
+
+
+class InvalidTransactionIdError(BigchaindbException):
+    """Raised if the id of a retrieved transaction is not the requested
+    one, or does not match the hash of its body.
+    """
+
+    @property
+    def transaction_id(self):
+        """Returns the id of the requested transaction."""
+        return self.args[1]
+
+
+class StreamError(BigchaindbException):
+    """Raised if the connection to the event stream of a node fails, e.g.
+    because of an invalid WebSocket handshake.
+    """
+
+
 class TimeoutError(BigchaindbException):
     """Raised if the request algorithm times out."""
 
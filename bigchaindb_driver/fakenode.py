@@ -0,0 +1,457 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""In-process stand-in for BigchainDB nodes, serving the HTTP API from a
+background thread, so that the driver can be exercised and load tested
+without a network::
+
+    with FakeNode() as node:
+        bdb = BigchainDB(node.url)
+        bdb.transactions.send_commit(signed_tx)
+
+A :class:`~.Ledger` keeps the committed transactions in memory. It
+validates their schema, ids, signatures, inputs and amounts with the
+same code as the driver. Several nodes sharing a ledger behave as a
+network::
+
+    ledger = Ledger()
+    nodes = [FakeNode(ledger=ledger, latency=0.01) for _ in range(4)]
+
+The nodes can delay their responses, and answer with errors, either at
+random with ``error_rate``, or on demand with :meth:`FakeNode.fail_next`.
+
+"""
+import json
+import random
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+from urllib.parse import parse_qs, urlsplit
+
+from .common.exceptions import (
+    AmountError,
+    AssetIdMismatch,
+    BigchainDBError,
+    DoubleSpend,
+    DuplicateTransaction,
+    InputDoesNotExist,
+    InvalidSignature,
+)
+from .common.transaction import Output, Transaction
+from .exceptions import BigchaindbException
+from .schema import validate_transaction
+
+
+API_PREFIX = '/api/v1'
+
+VERSION = '2.0.0'
+
+
+class Ledger:
+    """In-memory ledger committing each valid transaction in a block of
+    its own.
+
+    """
+
+    def __init__(self):
+        self.transactions = {}
+        self.blocks = []
+        self._heights = {}
+        self._spent = {}
+        self._assets = {}
+        self._outputs = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self.transactions)
+
+    def validate(self, transaction):
+        """Validates a transaction against the ledger.
+
+        Args:
+            transaction (dict): The transaction.
+
+        Raises:
+            :exc:`~.exceptions.SchemaValidationError`: If the transaction
+                does not match the schema.
+            :exc:`~.common.exceptions.ValidationError`: If the id, the
+                signatures, the inputs or the amounts are not valid.
+
+        """
+        validate_transaction(transaction)
+        Transaction.validate_id(transaction)
+        with self._lock:
+            if transaction['id'] in self.transactions:
+                raise DuplicateTransaction(
+                    'Transaction {} already exists'.format(
+                        transaction['id']))
+            transaction_obj = Transaction.from_dict(transaction)
+            if transaction_obj.operation == Transaction.CREATE:
+                outputs = None
+            else:
+                outputs = self._spent_outputs(transaction)
+            if not transaction_obj.inputs_valid(outputs):
+                raise InvalidSignature('Transaction signature is invalid.')
+
+    def commit(self, transaction):
+        """Validates a transaction, and commits it in a new block.
+
+        Args:
+            transaction (dict): The transaction.
+
+        Returns:
+            int: The height of the block.
+
+        Raises:
+            The exceptions of :meth:`validate`.
+
+        """
+        with self._lock:
+            self.validate(transaction)
+            txid = transaction['id']
+            self.transactions[txid] = transaction
+            self.blocks.append([txid])
+            self._heights[txid] = height = len(self.blocks)
+            for input_ in transaction['inputs']:
+                if input_['fulfills']:
+                    self._spent[_link(input_['fulfills'])] = txid
+            self._assets.setdefault(_asset_id(transaction), []).append(txid)
+            for index, output in enumerate(transaction['outputs']):
+                for public_key in _flatten(output['public_keys']):
+                    self._outputs.setdefault(public_key, []).append(
+                        (txid, index))
+            return height
+
+    def get(self, txid):
+        """Returns the transaction ``txid``, or ``None``."""
+        with self._lock:
+            return self.transactions.get(txid)
+
+    def get_by_asset(self, asset_id, operation=None):
+        """Returns the transactions of an asset, in commit order,
+        optionally only those of the given operation.
+        """
+        with self._lock:
+            transactions = [self.transactions[txid]
+                            for txid in self._assets.get(asset_id, ())]
+        return [transaction for transaction in transactions
+                if operation is None or transaction['operation'] == operation]
+
+    def get_outputs(self, public_key, spent=None):
+        """Returns the links to the outputs of a public key, optionally
+        only the spent (``True``) or unspent (``False``) ones.
+        """
+        with self._lock:
+            return [{'transaction_id': txid, 'output_index': index}
+                    for txid, index in self._outputs.get(public_key, ())
+                    if spent is None or
+                    ((txid, index) in self._spent) == spent]
+
+    def get_height(self, txid):
+        """Returns the height of the block of ``txid``, or ``None``."""
+        with self._lock:
+            return self._heights.get(txid)
+
+    def get_block(self, height):
+        """Returns the block at ``height``, or ``None``."""
+        with self._lock:
+            if not 1 <= height <= len(self.blocks):
+                return None
+            return {'height': height,
+                    'transactions': [self.transactions[txid]
+                                     for txid in self.blocks[height - 1]]}
+
+    def search(self, text, *, field, limit=0):
+        """Searches the assets (``field='asset'``) or the metadata
+        (``field='metadata'``) containing ``text``, case insensitively,
+        in their keys or values.
+        """
+        text = text.lower()
+        results = []
+        with self._lock:
+            transactions = list(self.transactions.values())
+        for transaction in transactions:
+            if field == 'asset':
+                if transaction['operation'] != Transaction.CREATE:
+                    continue
+                key, value = 'data', transaction['asset']['data']
+            else:
+                key, value = 'metadata', transaction['metadata']
+            if value is None or text not in json.dumps(value).lower():
+                continue
+            results.append({'id': transaction['id'], key: value})
+            if limit and len(results) == limit:
+                break
+        return results
+
+    def _spent_outputs(self, transaction):
+        outputs = []
+        links = set()
+        amount = 0
+        asset_id = transaction['asset']['id']
+        for input_ in transaction['inputs']:
+            link = _link(input_['fulfills'])
+            parent = self.transactions.get(link[0])
+            if parent is None or link[1] >= len(parent['outputs']):
+                raise InputDoesNotExist(
+                    'Input {}:{} does not exist'.format(*link))
+            if link in self._spent or link in links:
+                raise DoubleSpend('Input {}:{} was already spent'.format(
+                    *link))
+            if _asset_id(parent) != asset_id:
+                raise AssetIdMismatch(
+                    'Input {}:{} is of another asset'.format(*link))
+            links.add(link)
+            output = parent['outputs'][link[1]]
+            outputs.append(Output.from_dict(output))
+            amount += int(output['amount'])
+        if amount != sum(int(output['amount'])
+                         for output in transaction['outputs']):
+            raise AmountError('The amount used in the inputs `{}` needs to '
+                              'be same as the amount used in the outputs'
+                              .format(amount))
+        return outputs
+
+
+def _link(fulfills):
+    return fulfills['transaction_id'], fulfills['output_index']
+
+
+def _flatten(public_keys):
+    # NOTE: The public keys of nested threshold conditions are nested.
+    for public_key in public_keys:
+        if isinstance(public_key, list):
+            yield from _flatten(public_key)
+        else:
+            yield public_key
+
+
+def _asset_id(transaction):
+    if transaction['operation'] == Transaction.CREATE:
+        return transaction['id']
+    return transaction['asset']['id']
+
+
+def _error(status, message):
+    return status, {'message': message, 'status': status}
+
+
+class _Server(ThreadingMixIn, HTTPServer):
+
+    daemon_threads = True
+
+
+class _Handler(BaseHTTPRequestHandler):
+
+    # NOTE: Keeps the connections alive, as a real node does, without
+    #       delaying the body sent after the headers.
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self._dispatch('GET')
+
+    def do_POST(self):
+        self._dispatch('POST')
+
+    def log_message(self, format, *args):
+        pass
+
+    def _dispatch(self, method):
+        url = urlsplit(self.path)
+        params = {key: values[-1]
+                  for key, values in parse_qs(url.query).items()}
+        length = int(self.headers.get('Content-Length') or 0)
+        try:
+            body = json.loads(self.rfile.read(length).decode()) \
+                if length else None
+        except ValueError:
+            status, data = _error(400, 'Invalid JSON')
+        else:
+            status, data = self.server.node.handle(method, url.path,
+                                                   params, body)
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class FakeNode:
+    """Stand-in for a BigchainDB node, serving the endpoints used by the
+    driver from a :class:`~.Ledger`.
+
+    Attributes:
+        requests (int): Number of requests received.
+
+    """
+
+    def __init__(self, host='127.0.0.1', port=0, *, ledger=None,
+                 latency=0, jitter=0, error_rate=0, error_status=503,
+                 seed=None):
+        """Initializes a :class:`~bigchaindb_driver.fakenode.FakeNode`
+        instance.
+
+        Args:
+            host (str): The address to listen on. Defaults to
+                ``'127.0.0.1'``.
+            port (int): The port to listen on. Defaults to ``0``, i.e. a
+                free port.
+            ledger (:class:`~.Ledger`): The ledger, possibly shared with
+                other nodes. Defaults to a new ledger.
+            latency (float): Delay, in seconds, before each response.
+                Defaults to ``0``.
+            jitter (float): Maximum random delay, in seconds, added to
+                ``latency``. Defaults to ``0``.
+            error_rate (float): Probability of answering a request with
+                ``error_status``. Defaults to ``0``.
+            error_status (int): The status of the random errors.
+                Defaults to ``503``.
+            seed: Seed of the random delays and errors. Defaults to
+                ``None``.
+
+        """
+        self.ledger = Ledger() if ledger is None else ledger
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self._random = random.Random(seed)
+        self._failures = deque()
+        self._lock = threading.Lock()
+        self._server = _Server((host, port), _Handler)
+        self._server.node = self
+        self._thread = threading.Thread(target=self._server.serve_forever,
+                                        daemon=True)
+
+    @property
+    def url(self):
+        """str: The URL of the node."""
+        host, port = self._server.server_address[:2]
+        return 'http://{}:{}'.format(host, port)
+
+    def start(self):
+        """Starts serving in a background thread."""
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stops serving."""
+        if self._thread.is_alive():
+            self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def fail_next(self, count=1, status=503):
+        """Answers the next ``count`` requests with ``status``."""
+        with self._lock:
+            self._failures.extend([status] * count)
+
+    def handle(self, method, path, params, body):
+        """Answers a request, after the configured delay, or with an
+        injected error.
+
+        Args:
+            method (str): The HTTP method.
+            path (str): The path of the request.
+            params (dict): The query parameters.
+            body: The decoded JSON body, or ``None``.
+
+        Returns:
+            tuple: The HTTP status code and the JSON payload.
+
+        """
+        with self._lock:
+            self.requests += 1
+            delay = self.latency + self._random.uniform(0, self.jitter) \
+                if self.jitter else self.latency
+            if self._failures:
+                status = self._failures.popleft()
+            elif self.error_rate and self._random.random() < self.error_rate:
+                status = self.error_status
+            else:
+                status = None
+        if delay:
+            time.sleep(delay)
+        if status is not None:
+            return _error(status, 'Injected error')
+        try:
+            return self._route(method, path.rstrip('/') or '/', params, body)
+        except (KeyError, TypeError, ValueError):
+            return _error(400, 'Invalid request')
+
+    def _route(self, method, path, params, body):
+        if path == '/' and method == 'GET':
+            return 200, {
+                'api': {'v1': self._api_info()},
+                'software': 'BigchainDB',
+                'version': VERSION,
+            }
+        if path != API_PREFIX and not path.startswith(API_PREFIX + '/'):
+            return _error(404, 'Not found')
+        resource, _, key = path[len(API_PREFIX) + 1:].partition('/')
+        if method == 'POST' and resource == 'transactions' and not key:
+            return self._post_transaction(body)
+        if method != 'GET':
+            return _error(405, 'Method not allowed')
+        if not resource:
+            return 200, self._api_info()
+        if resource == 'transactions' and key:
+            transaction = self.ledger.get(key)
+            if transaction is None:
+                return _error(404, 'Not found')
+            return 200, transaction
+        if resource == 'transactions':
+            return 200, self.ledger.get_by_asset(params['asset_id'],
+                                                 params.get('operation'))
+        if resource == 'outputs':
+            spent = params.get('spent')
+            spent = None if spent is None else spent.lower() == 'true'
+            return 200, self.ledger.get_outputs(params['public_key'], spent)
+        if resource == 'blocks' and key:
+            block = self.ledger.get_block(int(key))
+            if block is None:
+                return _error(404, 'Not found')
+            return 200, block
+        if resource == 'blocks':
+            height = self.ledger.get_height(params['transaction_id'])
+            return 200, [] if height is None else [height]
+        if resource in ('assets', 'metadata'):
+            return 200, self.ledger.search(
+                params['search'],
+                field='asset' if resource == 'assets' else 'metadata',
+                limit=int(params.get('limit', 0)))
+        return _error(404, 'Not found')
+
+    def _api_info(self):
+        api = self.url + API_PREFIX
+        return {
+            'docs': 'https://docs.bigchaindb.com/projects/server/en/v{}/'
+                    'http-client-server-api.html'.format(VERSION),
+            'transactions': api + '/transactions/',
+            'blocks': api + '/blocks/',
+            'assets': api + '/assets/',
+            'outputs': api + '/outputs/',
+            'metadata': api + '/metadata/',
+            'streams': api.replace('http', 'ws', 1) +
+            '/streams/valid_transactions',
+            'version': VERSION,
+        }
+
+    def _post_transaction(self, transaction):
+        try:
+            self.ledger.commit(transaction)
+        except (BigchaindbException, BigchainDBError) as exc:
+            return _error(400, 'Invalid transaction ({}): {}'.format(
+                type(exc).__name__, exc))
+        return 202, transaction
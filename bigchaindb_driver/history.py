@@ -0,0 +1,212 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Local history of an asset, as the graph of its transactions.
+
+:meth:`~.TransactionsEndpoint.get` returns the whole list of the
+transactions of an asset. :class:`~.AssetHistory` indexes them by id and
+by the outputs they spend, so that the current owners, the unspent
+outputs and the provenance of a transaction are answered without
+scanning the list again::
+
+    history = AssetHistory(asset_id)
+    history.refresh(bdb)
+    history.current_owners()
+    # ... later on, only the new transactions are indexed
+    history.refresh(bdb)
+
+"""
+from .utils import get_asset_id
+from .utxo import IndexedOutput
+
+
+class AssetHistory:
+    """Graph of the transactions of an asset, indexed by transaction id
+    and by spent output.
+
+    Transactions may be added in any order, e.g. a ``"TRANSFER"``
+    transaction before the transaction whose outputs it spends.
+
+    """
+
+    def __init__(self, asset_id):
+        """Initializes a :class:`~bigchaindb_driver.history.AssetHistory`
+        instance.
+
+        Args:
+            asset_id (str): The id of the asset, i.e. of its ``"CREATE"``
+                transaction.
+
+        """
+        self.asset_id = asset_id
+        self._transactions = {}
+        # NOTE: Maps `(transaction_id, output_index)` links to the id of
+        #       the transaction spending the output.
+        self._spent_by = {}
+        self._unspent = {}
+        # NOTE: Number of unspent outputs per public key.
+        self._owners = {}
+
+    def __len__(self):
+        return len(self._transactions)
+
+    def __contains__(self, txid):
+        return txid in self._transactions
+
+    def get(self, txid):
+        """Returns the transaction with the given id, or ``None`` if it
+        is not in the history.
+        """
+        return self._transactions.get(txid)
+
+    def update(self, transactions):
+        """Adds the transactions not in the history yet.
+
+        Args:
+            transactions (iterable): Transactions of the asset.
+
+        Returns:
+            :obj:`list` of :obj:`dict`: The transactions added.
+
+        Raises:
+            :exc:`ValueError`: If a transaction is of another asset, in
+                which case none of the transactions is added.
+
+        """
+        transactions = list(transactions)
+        for transaction in transactions:
+            asset_id = get_asset_id(transaction)
+            if asset_id != self.asset_id:
+                raise ValueError(
+                    'Transaction {} is of asset {}, not {}'.format(
+                        transaction['id'], asset_id, self.asset_id))
+        added = []
+        for transaction in transactions:
+            if transaction['id'] not in self._transactions:
+                self._add(transaction)
+                added.append(transaction)
+        return added
+
+    def refresh(self, driver, headers=None, timeout=None):
+        """Retrieves the transactions of the asset from a node, and adds
+        those not in the history yet.
+
+        The node still returns the whole list of transactions, but only
+        the new ones are indexed.
+
+        Args:
+            driver (:class:`~bigchaindb_driver.BigchainDB`): The driver
+                to query the node with.
+            headers (dict): Optional headers to pass to the request.
+            timeout (float): Optional timeout in seconds, overriding the
+                timeout of the driver.
+
+        Returns:
+            :obj:`list` of :obj:`dict`: The transactions added.
+
+        """
+        return self.update(driver.transactions.get(
+            asset_id=self.asset_id, headers=headers, timeout=timeout))
+
+    def spent_by(self, txid, output_index):
+        """Returns the id of the transaction spending an output, or
+        ``None`` if the output is not spent by any transaction of the
+        history.
+        """
+        return self._spent_by.get((txid, output_index))
+
+    def unspent_outputs(self, public_key=None):
+        """Returns the outputs not spent by any transaction of the
+        history.
+
+        Args:
+            public_key (str): Only return the outputs locked with this
+                key. Defaults to ``None``.
+
+        Returns:
+            :obj:`list` of :class:`~.utxo.IndexedOutput`: The unspent
+            outputs.
+
+        """
+        return [output for output in self._unspent.values()
+                if public_key is None or public_key in output.public_keys]
+
+    def current_owners(self):
+        """Returns the public keys locking the unspent outputs.
+
+        Returns:
+            :obj:`set` of :obj:`str`: The public keys.
+
+        """
+        return set(self._owners)
+
+    def provenance(self, txid):
+        """Returns the chain of transactions leading to a transaction,
+        following the first input of each transaction back to the
+        ``"CREATE"`` transaction, in O(depth).
+
+        Args:
+            txid (str): The id of the transaction.
+
+        Returns:
+            :obj:`list` of :obj:`dict`: The transactions, from the
+            ``"CREATE"`` transaction to the given one. The chain stops
+            early at a transaction whose parent is not in the history,
+            or is already in the chain, as forged transactions may
+            form a cycle.
+
+        Raises:
+            :exc:`KeyError`: If the transaction is not in the history.
+
+        """
+        chain = [self._transactions[txid]]
+        visited = {txid}
+        while True:
+            fulfills = chain[-1]['inputs'][0]['fulfills']
+            if fulfills is None or fulfills['transaction_id'] in visited:
+                break
+            parent = self._transactions.get(fulfills['transaction_id'])
+            if parent is None:
+                break
+            visited.add(parent['id'])
+            chain.append(parent)
+        chain.reverse()
+        return chain
+
+    def _add(self, transaction):
+        txid = transaction['id']
+        self._transactions[txid] = transaction
+
+        for input_ in transaction['inputs']:
+            fulfills = input_['fulfills']
+            if fulfills is None:
+                continue
+            link = (fulfills['transaction_id'], fulfills['output_index'])
+            self._spent_by[link] = txid
+            output = self._unspent.pop(link, None)
+            if output is not None:
+                self._remove_owners(output)
+
+        for index, output in enumerate(transaction['outputs']):
+            if (txid, index) in self._spent_by:
+                continue
+            output = IndexedOutput(
+                transaction_id=txid,
+                output_index=index,
+                amount=int(output['amount']),
+                asset_id=self.asset_id,
+                condition_uri=output['condition']['uri'],
+                public_keys=tuple(output['public_keys']),
+            )
+            self._unspent[txid, index] = output
+            for public_key in output.public_keys:
+                self._owners[public_key] = self._owners.get(public_key, 0) + 1
+
+    def _remove_owners(self, output):
+        for public_key in output.public_keys:
+            count = self._owners[public_key] - 1
+            if count:
+                self._owners[public_key] = count
+            else:
+                del self._owners[public_key]
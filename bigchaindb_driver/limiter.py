@@ -0,0 +1,165 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Limiters of the number of requests in flight to a node.
+
+The :class:`~.transport.Transport` holds a limiter per node, given with
+its ``limiter_class`` argument. Requests wait for a free slot before
+being sent, and report their outcome once done, so that a limiter can
+adapt to the capacity of its node. E.g.::
+
+    from functools import partial
+
+    bdb = BigchainDB(
+        'https://node1:9984', 'https://node2:9984',
+        transport_class=partial(Transport, limiter_class=AIMDLimiter),
+    )
+
+"""
+import threading
+from abc import ABCMeta, abstractmethod
+from time import monotonic
+
+
+class AbstractLimiter(metaclass=ABCMeta):
+    """Abstract class for concurrency limiters."""
+
+    @property
+    def limit(self):
+        """int: Number of requests currently allowed in flight, or
+        ``None`` if unknown.
+        """
+        return None
+
+    @abstractmethod
+    def acquire(self, timeout=None):
+        """Waits for a free slot.
+
+        Args:
+            timeout (float): Maximum number of seconds to wait. Defaults
+                to ``None``, meaning no limit.
+
+        Returns:
+            The token to pass to :meth:`release`, or ``None`` if no slot
+            freed up in time.
+
+        """
+        pass    # pragma: no cover
+
+    @abstractmethod
+    def release(self, token, *, success, overloaded=False):
+        """Frees the slot of a finished request.
+
+        Args:
+            token: The token returned by :meth:`acquire`.
+            success (bool): Whether the request succeeded.
+            overloaded (bool): Whether the node reported to be
+                overloaded, e.g. with a 503 or 504 status.
+
+        """
+        pass    # pragma: no cover
+
+    def start(self, token):
+        """Marks the request of a token as sent, after any wait between
+        :meth:`acquire` and the request itself, e.g. for the backoff of
+        the node.
+
+        Args:
+            token: The token returned by :meth:`acquire`.
+
+        Returns:
+            The token to pass to :meth:`release` instead.
+
+        """
+        return token
+
+
+class AIMDLimiter(AbstractLimiter):
+    """Additive increase, multiplicative decrease (AIMD) limiter, as in
+    TCP congestion control.
+
+    Every successful request raises the limit by ``increase / limit``,
+    i.e. by about ``increase`` per round of ``limit`` requests. An
+    overloaded node, or a latency greater than ``latency_factor`` times
+    the smoothed latency of the node, multiplies the limit by
+    ``decrease``. Requests started before the last decrease do not cause
+    further decreases, so that a burst of failures only counts once.
+    Spikes still count in the smoothed latency, so that a lasting rise
+    of the latency stops counting as spikes after a while.
+
+    """
+
+    def __init__(self, *, initial_limit=4, min_limit=1, max_limit=256,
+                 increase=1, decrease=0.5, latency_factor=3,
+                 smoothing=0.1):
+        """Initializes a :class:`~bigchaindb_driver.limiter.AIMDLimiter`
+        instance.
+
+        Args:
+            initial_limit (int): Initial number of requests allowed in
+                flight. Defaults to ``4``.
+            min_limit (int): Lower bound of the limit. Defaults to ``1``.
+            max_limit (int): Upper bound of the limit. Defaults to
+                ``256``.
+            increase (float): Additive increase per round. Defaults to
+                ``1``.
+            decrease (float): Multiplicative decrease factor. Defaults
+                to ``0.5``.
+            latency_factor (float): Ratio to the smoothed latency above
+                which a latency counts as a spike. ``None`` disables
+                latency spike detection. Defaults to ``3``.
+            smoothing (float): Weight of the latest sample in the
+                exponentially weighted moving average of the latency.
+                Defaults to ``0.1``.
+
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.smoothing = smoothing
+        self.latency = None
+        self.in_flight = 0
+        self._limit = float(initial_limit)
+        self._last_decrease = float('-inf')
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        """int: Number of requests currently allowed in flight."""
+        return int(self._limit)
+
+    def acquire(self, timeout=None):
+        with self._condition:
+            if not self._condition.wait_for(
+                    lambda: self.in_flight < int(self._limit), timeout):
+                return None
+            self.in_flight += 1
+            return monotonic()
+
+    def start(self, token):
+        return monotonic()
+
+    def release(self, token, *, success, overloaded=False):
+        now = monotonic()
+        latency = now - token
+        with self._condition:
+            self.in_flight -= 1
+            spike = (self.latency_factor is not None and
+                     self.latency is not None and
+                     latency > self.latency_factor * self.latency)
+            if success:
+                self.latency = latency if self.latency is None else (
+                    self.smoothing * latency +
+                    (1 - self.smoothing) * self.latency)
+            if overloaded or spike:
+                if token >= self._last_decrease:
+                    self._limit = max(self.min_limit,
+                                      self._limit * self.decrease)
+                    self._last_decrease = now
+            elif success:
+                self._limit = min(self.max_limit,
+                                  self._limit + self.increase / self._limit)
+            self._condition.notify_all()
@@ -0,0 +1,315 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Load generator measuring the end-to-end throughput of BigchainDB
+nodes, installed as the ``bigchaindb-driver-bench`` command.
+
+It generates keypairs, prepares and signs ``"CREATE"`` transactions,
+each followed by a chain of ``"TRANSFER"`` transactions, then submits
+them at a target rate or concurrency. It reports the throughput and the
+latency percentiles per phase and per node::
+
+    $ bigchaindb-driver-bench https://node1:9984 https://node2:9984 \\
+        --count 1000 --transfers 2 --mode sync --concurrency 32
+
+With ``--local N``, the transactions are sent to ``N``
+:class:`~.fakenode.FakeNode` instances sharing a ledger, so that no
+network is needed.
+
+"""
+import argparse
+import itertools
+import json
+import math
+import os
+import threading
+from contextlib import ExitStack
+from time import perf_counter, sleep
+
+from .crypto import generate_keypairs
+from .driver import BigchainDB
+from .exceptions import BigchaindbException
+from .fakenode import FakeNode, Ledger
+from .offchain import (
+    build_transfer_chain,
+    fulfill_transaction,
+    prepare_create_transaction,
+)
+
+
+PERCENTILES = (50, 90, 99)
+
+MODES = ('async', 'sync', 'commit')
+
+LOCAL = 'local'
+
+
+def percentile(latencies, rank):
+    """Returns the nearest-rank percentile of sorted latencies."""
+    if not latencies:
+        return None
+    index = max(0, math.ceil(rank / 100 * len(latencies)) - 1)
+    return latencies[index]
+
+
+class Phase:
+    """Latencies and duration of a phase of the load test."""
+
+    def __init__(self, name):
+        self.name = name
+        self.duration = 0.0
+        self._samples = {}
+        self._errors = {}
+        self._lock = threading.Lock()
+
+    def record(self, node, latency, success=True):
+        with self._lock:
+            self._samples.setdefault(node, []).append(latency)
+            if not success:
+                self._errors[node] = self._errors.get(node, 0) + 1
+
+    def summary(self):
+        """Returns the statistics of the phase, overall and per node.
+
+        Returns:
+            :obj:`list` of :obj:`dict`: One row per node, preceded by an
+            ``'all'`` row if several nodes took part in the phase.
+            Latencies are in seconds.
+
+        """
+        with self._lock:
+            samples = {node: sorted(latencies)
+                       for node, latencies in self._samples.items()}
+            errors = dict(self._errors)
+        rows = [(node, samples[node], errors.get(node, 0))
+                for node in sorted(samples)]
+        if len(rows) > 1:
+            rows.insert(0, ('all',
+                            sorted(itertools.chain(*samples.values())),
+                            sum(errors.values())))
+        return [self._row(*row) for row in rows]
+
+    def _row(self, node, latencies, errors):
+        row = {
+            'phase': self.name,
+            'node': node,
+            'count': len(latencies),
+            'errors': errors,
+            'seconds': self.duration,
+            'throughput': len(latencies) / self.duration
+            if self.duration else None,
+        }
+        for rank in PERCENTILES:
+            row['p{}'.format(rank)] = percentile(latencies, rank)
+        row['max'] = latencies[-1] if latencies else None
+        return row
+
+
+def prepare(count, transfers, keypairs, phases):
+    """Prepares and signs ``count`` ``"CREATE"`` transactions, each one
+    followed by a chain of ``transfers`` ``"TRANSFER"`` transactions
+    handing the asset over from a keypair to the next.
+
+    Returns:
+        list: One list of transactions per hop, starting with the
+        ``"CREATE"`` transactions. The transactions of a hop spend the
+        outputs of the transactions of the previous hop.
+
+    """
+    keygen = phases['keygen']
+    start = perf_counter()
+    signers = generate_keypairs(keypairs)
+    keygen.duration = perf_counter() - start
+    keygen.record(LOCAL, keygen.duration)
+
+    # NOTE: Makes the assets, hence the transactions, unique per run, so
+    #       that a real node does not reject them as duplicates.
+    nonce = os.urandom(8).hex()
+    hops = [[] for _ in range(transfers + 1)]
+    prepare_create = phases['prepare-create']
+    prepare_transfer = phases['prepare-transfer']
+    for i in range(count):
+        owners = [signers[(i + hop) % keypairs]
+                  for hop in range(transfers + 1)]
+        start = perf_counter()
+        create = fulfill_transaction(
+            prepare_create_transaction(
+                signers=owners[0].public_key,
+                asset={'data': {'loadgen': nonce, 'serial': i}}),
+            private_keys=owners[0].private_key)
+        latency = perf_counter() - start
+        prepare_create.duration += latency
+        prepare_create.record(LOCAL, latency)
+        hops[0].append(create)
+        if not transfers:
+            continue
+        start = perf_counter()
+        chain = build_transfer_chain(
+            create,
+            hops=[(recipient.public_key, sender.private_key)
+                  for sender, recipient in zip(owners, owners[1:])])
+        latency = perf_counter() - start
+        prepare_transfer.duration += latency
+        for hop, transaction in enumerate(chain, 1):
+            prepare_transfer.record(LOCAL, latency / transfers)
+            hops[hop].append(transaction)
+    return hops
+
+
+def submit(transactions, drivers, phase, *, mode, concurrency, rate=None):
+    """Sends transactions from ``concurrency`` threads, spreading them
+    evenly over the nodes.
+
+    With a ``rate``, the ``i``-th transaction is not sent before ``i /
+    rate`` seconds, and its latency is measured from that time rather
+    than from the time it is actually sent, so that the queueing delay
+    of an overloaded node is accounted for.
+
+    """
+    method = 'send_' + mode
+    counter = itertools.count()
+    lock = threading.Lock()
+    start = perf_counter()
+
+    def work():
+        while True:
+            with lock:
+                index = next(counter)
+            if index >= len(transactions):
+                return
+            node, driver = drivers[index % len(drivers)]
+            sent = perf_counter()
+            if rate:
+                scheduled = start + index / rate
+                if scheduled > sent:
+                    sleep(scheduled - sent)
+                sent = scheduled
+            success = True
+            try:
+                getattr(driver.transactions, method)(transactions[index])
+            except BigchaindbException:
+                success = False
+            phase.record(node, perf_counter() - sent, success)
+
+    threads = [threading.Thread(target=work, daemon=True)
+               for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    phase.duration = perf_counter() - start
+
+
+def run(nodes, *, count, transfers=0, keypairs=8, mode='sync',
+        concurrency=8, rate=None):
+    """Runs a load test.
+
+    Args:
+        nodes (list): The URLs of the nodes.
+        count (int): The number of ``"CREATE"`` transactions.
+        transfers (int): The number of ``"TRANSFER"`` transactions after
+            each ``"CREATE"`` transaction. Defaults to ``0``.
+        keypairs (int): The number of keypairs signing the transactions.
+            Defaults to ``8``.
+        mode (str): The mode of the submissions, one of ``'async'``,
+            ``'sync'`` and ``'commit'``. Defaults to ``'sync'``.
+        concurrency (int): The number of transactions in flight.
+            Defaults to ``8``.
+        rate (float): The target number of transactions sent per second,
+            or ``None`` for no limit. Defaults to ``None``.
+
+    Returns:
+        :obj:`list` of :obj:`dict`: The statistics of the phases. See
+        :meth:`Phase.summary`.
+
+    """
+    phases = {name: Phase(name) for name in (
+        'keygen', 'prepare-create', 'prepare-transfer', 'submit-create',
+        'submit-transfer')}
+    hops = prepare(count, transfers, keypairs, phases)
+    drivers = [(node, BigchainDB(node)) for node in nodes]
+    submit(hops[0], drivers, phases['submit-create'], mode=mode,
+           concurrency=concurrency, rate=rate)
+    # NOTE: Hops are sent one after the other, so that the transactions
+    #       they spend have been sent already.
+    duration = 0.0
+    for transactions in hops[1:]:
+        submit(transactions, drivers, phases['submit-transfer'], mode=mode,
+               concurrency=concurrency, rate=rate)
+        duration += phases['submit-transfer'].duration
+    phases['submit-transfer'].duration = duration
+    return [row for phase in phases.values() for row in phase.summary()]
+
+
+def format_report(rows):
+    """Formats the statistics of the phases as a table, with the
+    latencies in milliseconds.
+    """
+    def milliseconds(value):
+        return '-' if value is None else '{:.2f}'.format(value * 1000)
+
+    width = max([len(row['node']) for row in rows] + [len('node')])
+    header = ['phase', 'node', 'count', 'errors', 'tx/s'] + [
+        'p{} ms'.format(rank) for rank in PERCENTILES] + ['max ms']
+    line = '{:<16} {:<{width}} {:>7} {:>6} {:>9}' + \
+        ' {:>9}' * (len(PERCENTILES) + 1)
+    lines = [line.format(*header, width=width)]
+    for row in rows:
+        lines.append(line.format(
+            row['phase'], row['node'], row['count'], row['errors'],
+            '-' if row['throughput'] is None
+            else '{:.1f}'.format(row['throughput']),
+            *[milliseconds(row['p{}'.format(rank)])
+              for rank in PERCENTILES],
+            milliseconds(row['max']),
+            width=width))
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    """Entry point of the ``bigchaindb-driver-bench`` command.
+
+    Returns:
+        int: The exit status, ``1`` if some submissions failed.
+
+    """
+    parser = argparse.ArgumentParser(
+        prog='bigchaindb-driver-bench',
+        description='Measures the throughput of BigchainDB nodes.')
+    parser.add_argument('nodes', nargs='*', metavar='NODE',
+                        help='URL of a node, e.g. http://localhost:9984')
+    parser.add_argument('--local', type=int, default=0, metavar='N',
+                        help='send to N local stand-in nodes instead')
+    parser.add_argument('--count', type=int, default=100,
+                        help='number of CREATE transactions '
+                             '(default: %(default)s)')
+    parser.add_argument('--transfers', type=int, default=0,
+                        help='number of TRANSFER transactions after each '
+                             'CREATE transaction (default: %(default)s)')
+    parser.add_argument('--keypairs', type=int, default=8,
+                        help='number of signing keypairs '
+                             '(default: %(default)s)')
+    parser.add_argument('--mode', choices=MODES, default='sync',
+                        help='submission mode (default: %(default)s)')
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help='transactions in flight (default: %(default)s)')
+    parser.add_argument('--rate', type=float,
+                        help='target transactions per second '
+                             '(default: no limit)')
+    parser.add_argument('--json', action='store_true',
+                        help='print the report as JSON')
+    args = parser.parse_args(argv)
+    if not args.nodes and not args.local:
+        parser.error('give the URL of a node, or --local')
+
+    with ExitStack() as stack:
+        ledger = Ledger()
+        nodes = list(args.nodes) + [
+            stack.enter_context(FakeNode(ledger=ledger)).url
+            for _ in range(args.local)]
+        rows = run(nodes, count=args.count, transfers=args.transfers,
+                   keypairs=args.keypairs, mode=args.mode,
+                   concurrency=args.concurrency, rate=args.rate)
+    print(json.dumps(rows, indent=2) if args.json else format_report(rows))
+    return 1 if any(row['errors'] for row in rows) else 0
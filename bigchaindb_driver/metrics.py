@@ -0,0 +1,224 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Metrics instrumentation of the transport and of the connections.
+
+The :class:`~.transport.Transport` and its
+:class:`~.connection.Connection` instances report to a metrics object,
+given with the ``metrics`` argument of the transport. It defaults to
+:data:`NOOP_METRICS`, whose ``enabled`` attribute is ``False``: the
+instrumented code checks it first, so that it pays nothing more when
+metrics are off. :class:`~.MetricsRegistry` keeps the metrics in
+memory, and exports them in the Prometheus text format::
+
+    from functools import partial
+
+    registry = MetricsRegistry()
+    bdb = BigchainDB(transport_class=partial(Transport, metrics=registry))
+    ...
+    print(registry.export_prometheus())
+
+Attributes:
+    METRICS (dict): Mapping between the names of the metrics reported
+        by the driver and their descriptions.
+    DEFAULT_BUCKETS (tuple): Default upper bounds, in seconds, of the
+        buckets of the histograms.
+
+"""
+import threading
+from abc import ABCMeta, abstractmethod
+from bisect import bisect_left
+
+
+METRICS = {
+    'bigchaindb_driver_request_duration_seconds':
+        'Duration of the HTTP requests sent to a node.',
+    'bigchaindb_driver_request_bytes_total':
+        'Bytes sent in the bodies of the HTTP requests.',
+    'bigchaindb_driver_response_bytes_total':
+        'Bytes received in the bodies of the HTTP responses.',
+    'bigchaindb_driver_errors_total':
+        'Failed HTTP requests, per error class.',
+    'bigchaindb_driver_backoffs_total':
+        'Times a node was put in backoff.',
+    'bigchaindb_driver_backoff_seconds':
+        'Current backoff delay of a node.',
+    'bigchaindb_driver_forward_duration_seconds':
+        'Duration of the forwarded requests, retries included.',
+    'bigchaindb_driver_retries_total':
+        'Retried HTTP requests, per reason.',
+    'bigchaindb_driver_concurrency_limit':
+        'Requests currently allowed in flight to a node.',
+}
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_COUNTER = 'counter'
+_GAUGE = 'gauge'
+_HISTOGRAM = 'histogram'
+
+
+def endpoint_label(path):
+    """Returns the endpoint of a request path, without the API prefix nor
+    the resource ids, to keep the number of label values bounded. E.g.:
+    ``'/api/v1/transactions/abc'`` gives ``'/transactions'``.
+    """
+    parts = [part for part in (path or '/').split('/') if part]
+    if parts[:2] == ['api', 'v1']:
+        parts = parts[2:]
+    return '/' + parts[0] if parts else '/'
+
+
+class AbstractMetrics(metaclass=ABCMeta):
+    """Abstract class for metrics sinks.
+
+    Attributes:
+        enabled (bool): Whether the metrics are recorded. Instrumented
+            code skips the computation of the values and labels
+            otherwise.
+
+    """
+
+    enabled = True
+
+    @abstractmethod
+    def inc(self, name, value=1, **labels):
+        """Increments the counter ``name`` by ``value``."""
+        pass    # pragma: no cover
+
+    @abstractmethod
+    def set(self, name, value, **labels):
+        """Sets the gauge ``name`` to ``value``."""
+        pass    # pragma: no cover
+
+    @abstractmethod
+    def observe(self, name, value, **labels):
+        """Records ``value`` in the histogram ``name``."""
+        pass    # pragma: no cover
+
+
+class NoopMetrics(AbstractMetrics):
+    """Metrics sink discarding everything."""
+
+    enabled = False
+
+    def inc(self, name, value=1, **labels):
+        pass
+
+    def set(self, name, value, **labels):
+        pass
+
+    def observe(self, name, value, **labels):
+        pass
+
+
+NOOP_METRICS = NoopMetrics()
+
+
+class MetricsRegistry(AbstractMetrics):
+    """In-process registry of counters, gauges and histograms."""
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        """Initializes a :class:`~bigchaindb_driver.metrics.MetricsRegistry`
+        instance.
+
+        Args:
+            buckets (tuple): Sorted upper bounds of the buckets of the
+                histograms. Defaults to :data:`DEFAULT_BUCKETS`.
+
+        """
+        self.buckets = tuple(buckets)
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series(name, _COUNTER)
+            series[key] = series.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._series(name, _GAUGE)[key] = value
+
+    def observe(self, name, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series(name, _HISTOGRAM)
+            histogram = series.get(key)
+            if histogram is None:
+                # NOTE: Per bucket counts, then the sum and the count.
+                histogram = series[key] = [0] * (len(self.buckets) + 3)
+            histogram[bisect_left(self.buckets, value)] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+    def get(self, name, **labels):
+        """Returns the value of a counter or a gauge, or the ``(sum,
+        count)`` of a histogram, or ``None`` if nothing was recorded.
+        """
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            kind, series = self._metrics.get(name, (None, {}))
+            value = series.get(key)
+        if kind == _HISTOGRAM and value is not None:
+            return value[-2], value[-1]
+        return value
+
+    def export_prometheus(self):
+        """Exports the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The metrics.
+
+        """
+        lines = []
+        with self._lock:
+            metrics = sorted((name, kind, dict(series))
+                             for name, (kind, series)
+                             in self._metrics.items())
+        for name, kind, series in metrics:
+            if name in METRICS:
+                lines.append('# HELP {} {}'.format(name, METRICS[name]))
+            lines.append('# TYPE {} {}'.format(name, kind))
+            for key, value in sorted(series.items()):
+                if kind != _HISTOGRAM:
+                    lines.append('{}{} {}'.format(
+                        name, _format_labels(key), _format_value(value)))
+                    continue
+                cumulative = 0
+                bounds = self.buckets + (float('inf'),)
+                for bound, count in zip(bounds, value):
+                    cumulative += count
+                    lines.append('{}_bucket{} {}'.format(
+                        name,
+                        _format_labels(key + (('le', _format_value(bound)),)),
+                        cumulative))
+                lines.append('{}_sum{} {}'.format(
+                    name, _format_labels(key), _format_value(value[-2])))
+                lines.append('{}_count{} {}'.format(
+                    name, _format_labels(key), value[-1]))
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def _series(self, name, kind):
+        entry = self._metrics.get(name)
+        if entry is None:
+            entry = self._metrics[name] = (kind, {})
+        return entry[1]
+
+
+def _format_labels(key):
+    if not key:
+        return ''
+    return '{' + ','.join(
+        '{}="{}"'.format(name, str(value).replace('\\', '\\\\')
+                         .replace('"', '\\"').replace('\n', '\\n'))
+        for name, value in key) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
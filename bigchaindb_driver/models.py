@@ -0,0 +1,376 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Read-only views over the JSON returned by the nodes.
+
+The endpoints return the decoded JSON as is, leaving callers to hold the
+whole of it, and to walk it and convert its fields on each read, e.g.
+the amounts, which are strings. The views are an opt-in alternative,
+returned by the endpoints when called with ``view=True``::
+
+    transactions = bdb.transactions.get(asset_id=asset_id, view=True)
+    total = sum(output.amount
+                for transaction in transactions
+                for output in transaction.outputs)
+
+A view keeps the fields callers read the most, converted once: the id,
+operation, version and asset id of a transaction, and the amount,
+public keys and position of its outputs. The rest of the transaction is
+kept as its JSON text, and decoded on access only, e.g. the asset, the
+metadata, the inputs and the conditions. A large result set of views
+thus holds about half the memory of the decoded JSON, and reads the
+converted fields faster than walking it, see
+``benchmarks/bench_models.py``.
+
+Note:
+    Reading the other fields decodes the whole transaction, on each
+    access: keep the result rather than reading them in a loop. Links
+    are :class:`~.common.transaction.TransactionLink` instances built on
+    access, so that views hold no per-field caches.
+
+"""
+import re
+from json import JSONDecoder
+
+import rapidjson
+
+from .utils import get_asset_id
+
+
+_TransactionLink = None
+
+_DECODER = JSONDecoder()
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+
+
+def decode_array(text):
+    """Decodes a JSON array item by item.
+
+    Args:
+        text (str): The JSON text of an array, e.g. the body of a
+            response.
+
+    Yields:
+        The ``(item, json)`` pairs of the decoded items and of their
+        JSON text, e.g. to pass to :class:`~.Transaction`.
+
+    Raises:
+        :exc:`ValueError`: If ``text`` is not a JSON array.
+
+    """
+    raw_decode = _DECODER.raw_decode
+    match = _WHITESPACE.match
+    start = match(text).end()
+    if text[start:start + 1] != '[':
+        raise ValueError('Expecting a JSON array')
+    start = match(text, start + 1).end()
+    if text[start:start + 1] == ']':
+        return
+    while True:
+        item, end = raw_decode(text, start)
+        yield item, text[start:end]
+        end = match(text, end).end()
+        delimiter = text[end:end + 1]
+        start = match(text, end + 1).end()
+        if delimiter == ']':
+            return
+        if delimiter != ',':
+            raise ValueError(
+                'Expecting , or ] at position {}'.format(end))
+
+
+def _transaction_link(txid, output_index):
+    global _TransactionLink
+    if _TransactionLink is None:
+        # NOTE: Imported here as `common.transaction` is slow to import.
+        from .common.transaction import TransactionLink as _TransactionLink
+    return _TransactionLink(txid, output_index)
+
+
+class _View:
+
+    __slots__ = ()
+
+    @property
+    def raw(self):
+        """The JSON, decoded anew on each access."""
+        raise NotImplementedError    # pragma: no cover
+
+    def __getitem__(self, key):
+        return self.raw[key]
+
+    def __eq__(self, other):
+        if type(other) is not type(self):
+            return NotImplemented
+        return self.raw == other.raw
+
+    __hash__ = None
+
+    def __repr__(self):
+        return '{}({!r})'.format(type(self).__name__, self.raw)
+
+
+class Output(_View):
+    """View over an output of a transaction, as given by
+    :attr:`Transaction.outputs`.
+    """
+
+    __slots__ = ('_transaction_id', '_output_index', '_amount',
+                 '_public_keys', '_transaction_json')
+
+    def __init__(self, transaction_id, output_index, amount, public_keys,
+                 transaction_json):
+        self._transaction_id = transaction_id
+        self._output_index = output_index
+        self._amount = amount
+        self._public_keys = public_keys
+        self._transaction_json = transaction_json
+
+    @property
+    def raw(self):
+        return rapidjson.loads(
+            self._transaction_json)['outputs'][self._output_index]
+
+    @property
+    def transaction_id(self):
+        """str: The id of the transaction holding the output."""
+        return self._transaction_id
+
+    @property
+    def output_index(self):
+        """int: The index of the output in its transaction."""
+        return self._output_index
+
+    @property
+    def amount(self):
+        """int: The amount of the output."""
+        return self._amount
+
+    @property
+    def public_keys(self):
+        """:obj:`tuple` of :obj:`str`: The public keys locking the
+        output.
+        """
+        return self._public_keys
+
+    @property
+    def link(self):
+        """:class:`~.common.transaction.TransactionLink`: The link to
+        the output.
+        """
+        return _transaction_link(self._transaction_id, self._output_index)
+
+    @property
+    def condition_uri(self):
+        """str: The URI of the condition of the output, decoded on
+        access.
+        """
+        return self.raw['condition']['uri']
+
+    @property
+    def condition_details(self):
+        """dict: The details of the condition of the output, decoded on
+        access.
+        """
+        return self.raw['condition']['details']
+
+
+class Input(_View):
+    """View over an input of a transaction, as given by
+    :attr:`Transaction.inputs`.
+    """
+
+    __slots__ = ('_data',)
+
+    def __init__(self, data):
+        self._data = data
+
+    @property
+    def raw(self):
+        return self._data
+
+    @property
+    def owners_before(self):
+        """:obj:`tuple` of :obj:`str`: The public keys of the owners of
+        the spent output.
+        """
+        return tuple(self._data['owners_before'])
+
+    @property
+    def fulfillment(self):
+        """:obj:`str` | :obj:`dict`: The fulfillment of the input."""
+        return self._data['fulfillment']
+
+    @property
+    def fulfills(self):
+        """:class:`~.common.transaction.TransactionLink`: The link to
+        the spent output, or ``None`` for the input of a ``"CREATE"``
+        transaction.
+        """
+        fulfills = self._data['fulfills']
+        if fulfills is None:
+            return None
+        return _transaction_link(fulfills['transaction_id'],
+                                 fulfills['output_index'])
+
+
+class Transaction(_View):
+    """View over a transaction."""
+
+    __slots__ = ('_json', '_id', '_operation', '_version', '_asset_id',
+                 '_outputs')
+
+    def __init__(self, data, json=None):
+        """Initializes a :class:`~bigchaindb_driver.models.Transaction`
+        instance.
+
+        The view does not hold on to ``data``.
+
+        Args:
+            data (dict): The transaction.
+            json (str): The JSON text of ``data``, if at hand, e.g. as
+                given by :func:`decode_array`. Defaults to ``None``, in
+                which case ``data`` is encoded.
+
+        """
+        if json is None:
+            json = rapidjson.dumps(data)
+        self._json = json
+        txid = self._id = data['id']
+        self._operation = data['operation']
+        self._version = data['version']
+        self._asset_id = get_asset_id(data)
+        self._outputs = tuple([
+            Output(txid, index, int(output['amount']),
+                   tuple(output['public_keys']), json)
+            for index, output in enumerate(data['outputs'])])
+
+    @property
+    def raw(self):
+        return rapidjson.loads(self._json)
+
+    @property
+    def id(self):
+        """str: The id of the transaction."""
+        return self._id
+
+    @property
+    def operation(self):
+        """str: The operation of the transaction, e.g. ``'CREATE'``."""
+        return self._operation
+
+    @property
+    def version(self):
+        """str: The version of the transaction model."""
+        return self._version
+
+    @property
+    def asset_id(self):
+        """str: The id of the asset, i.e. of its ``"CREATE"``
+        transaction.
+        """
+        return self._asset_id
+
+    @property
+    def outputs(self):
+        """:obj:`tuple` of :class:`~.Output`: The outputs of the
+        transaction.
+        """
+        return self._outputs
+
+    @property
+    def asset(self):
+        """dict: The asset of the transaction, decoded on access."""
+        return self.raw['asset']
+
+    @property
+    def metadata(self):
+        """dict: The metadata of the transaction, decoded on access."""
+        return self.raw['metadata']
+
+    @property
+    def inputs(self):
+        """:obj:`tuple` of :class:`~.Input`: The inputs of the
+        transaction, decoded on access.
+        """
+        return tuple(Input(input_) for input_ in self.raw['inputs'])
+
+
+class Block(_View):
+    """View over a block."""
+
+    __slots__ = ('_height', '_transactions')
+
+    def __init__(self, data):
+        self._height = data['height']
+        self._transactions = tuple([
+            Transaction(transaction)
+            for transaction in data['transactions']])
+
+    @property
+    def raw(self):
+        return {'height': self._height,
+                'transactions': [transaction.raw
+                                 for transaction in self._transactions]}
+
+    @property
+    def height(self):
+        """int: The height of the block."""
+        return self._height
+
+    @property
+    def transactions(self):
+        """:obj:`tuple` of :class:`~.Transaction`: The transactions of
+        the block.
+        """
+        return self._transactions
+
+
+class _Hit(_View):
+
+    __slots__ = ('_id', '_json')
+
+    FIELD = None
+
+    def __init__(self, data):
+        self._id = data['id']
+        self._json = rapidjson.dumps(data[self.FIELD])
+
+    @property
+    def raw(self):
+        return {'id': self._id, self.FIELD: rapidjson.loads(self._json)}
+
+    @property
+    def id(self):
+        """str: The id of the ``"CREATE"`` transaction of the asset, or
+        of the transaction holding the metadata.
+        """
+        return self._id
+
+
+class AssetHit(_Hit):
+    """View over a result of :meth:`~.AssetsEndpoint.get`."""
+
+    __slots__ = ()
+
+    FIELD = 'data'
+
+    @property
+    def data(self):
+        """dict: The data of the asset, decoded on access."""
+        return rapidjson.loads(self._json)
+
+
+class MetadataHit(_Hit):
+    """View over a result of :meth:`~.MetadataEndpoint.get`."""
+
+    __slots__ = ()
+
+    FIELD = 'metadata'
+
+    @property
+    def metadata(self):
+        """dict: The metadata, decoded on access."""
+        return rapidjson.loads(self._json)
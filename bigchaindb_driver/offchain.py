@@ -18,6 +18,7 @@ from .common.transaction import (
 from .common.exceptions import KeypairMismatchException
 
 from .exceptions import BigchaindbException, MissingPrivateKeyError
+from .tracing import span
 from .utils import (
     CreateOperation,
     TransferOperation,
@@ -27,6 +28,54 @@ from .utils import (
 logger = logging.getLogger(__name__)
 
 
+class _Transaction(Transaction):
+    """:class:`~.common.transaction.Transaction` opening a span around
+    each of its costly stages. See :mod:`~bigchaindb_driver.tracing`.
+
+    The removal of the signatures and the serialization of the message
+    to sign are not hooked, as they are called on the base class, so
+    they make up the self time of ``'transaction.sign'``.
+
+    """
+
+    @classmethod
+    def create(cls, *args, **kwargs):
+        with span('transaction.create'):
+            return super().create(*args, **kwargs)
+
+    @classmethod
+    def transfer(cls, *args, **kwargs):
+        with span('transaction.transfer'):
+            return super().transfer(*args, **kwargs)
+
+    @classmethod
+    def from_dict(cls, tx):
+        with span('transaction.from_dict'):
+            return super().from_dict(tx)
+
+    def to_dict(self):
+        with span('transaction.to_dict'):
+            return super().to_dict()
+
+    @property
+    def serialized(self):
+        with span('transaction.serialize'):
+            return Transaction._to_str(self.to_dict())
+
+    def _hash(self):
+        with span('transaction.hash'):
+            super()._hash()
+
+    def sign(self, private_keys):
+        with span('transaction.sign'):
+            return super().sign(private_keys)
+
+    @classmethod
+    def _sign_input(cls, input_, message, key_pairs):
+        with span('transaction.sign_input'):
+            return super()._sign_input(input_, message, key_pairs)
+
+
 @singledispatch
 def _prepare_transaction(operation,
                          signers=None,
@@ -123,14 +172,15 @@ def prepare_transaction(*, operation='CREATE', signers=None,
 
     """
     operation = _normalize_operation(operation)
-    return _prepare_transaction(
-        operation,
-        signers=signers,
-        recipients=recipients,
-        asset=asset,
-        metadata=metadata,
-        inputs=inputs,
-    )
+    with span('prepare_transaction'):
+        return _prepare_transaction(
+            operation,
+            signers=signers,
+            recipients=recipients,
+            asset=asset,
+            metadata=metadata,
+            inputs=inputs,
+        )
 
 
 def prepare_create_transaction(*,
@@ -189,7 +239,7 @@ def prepare_create_transaction(*,
     elif isinstance(recipients, tuple):
         recipients = [(list(recipients), 1)]
 
-    transaction = Transaction.create(
+    transaction = _Transaction.create(
         signers,
         recipients,
         metadata=metadata,
@@ -310,7 +360,7 @@ def prepare_transfer_transaction(*,
         for input_ in inputs
     ]
 
-    transaction = Transaction.transfer(
+    transaction = _Transaction.transfer(
         fulfillments,
         recipients,
         asset_id=asset['id'],
@@ -337,6 +387,19 @@ def fulfill_transaction(transaction, *, private_keys):
             key is missing.
 
     """
+    private_keys = _normalize_private_keys(private_keys)
+
+    with span('fulfill_transaction'):
+        transaction_obj = _Transaction.from_dict(transaction)
+        try:
+            signed_transaction = transaction_obj.sign(private_keys)
+        except KeypairMismatchException as exc:
+            raise MissingPrivateKeyError('A private key is missing!') from exc
+
+        return signed_transaction.to_dict()
+
+
+def _normalize_private_keys(private_keys):
     if not isinstance(private_keys, (list, tuple)):
         private_keys = [private_keys]
 
@@ -344,11 +407,136 @@ def fulfill_transaction(transaction, *, private_keys):
     # https://github.com/bigchaindb/bigchaindb/issues/797
     if isinstance(private_keys, tuple):
         private_keys = list(private_keys)
+    return private_keys
+
+
+def _transfer_from(parent, *, recipients, private_keys,
+                   indices=None, metadata=None):
+    """Prepares and signs a ``"TRANSFER"`` transaction spending the
+    outputs of the in-memory transaction ``parent``.
 
-    transaction_obj = Transaction.from_dict(transaction)
+    If ``recipients`` is given as a single public key or as a tuple of
+    public keys, the new output locks the total amount of the spent
+    outputs, so that chains of divisible assets do not need explicit
+    amounts.
+
+    """
+    indices = indices or range(len(parent.outputs))
+    if not isinstance(recipients, (list, tuple)):
+        recipients = (recipients,)
+    if isinstance(recipients, tuple):
+        amount = sum(parent.outputs[index].amount for index in indices)
+        recipients = [(list(recipients), amount)]
+
+    if parent.operation == Transaction.CREATE:
+        asset_id = parent.id
+    else:
+        asset_id = parent.asset['id']
+
+    transaction = _Transaction.transfer(
+        parent.to_inputs(indices),
+        recipients,
+        asset_id=asset_id,
+        metadata=metadata,
+    )
     try:
-        signed_transaction = transaction_obj.sign(private_keys)
+        return transaction.sign(_normalize_private_keys(private_keys))
     except KeypairMismatchException as exc:
         raise MissingPrivateKeyError('A private key is missing!') from exc
 
-    return signed_transaction.to_dict()
+
+def build_transfer_chain(transaction, *, hops, metadata=None):
+    """Builds a chain of signed ``"TRANSFER"`` transactions in one pass,
+    each one spending all the outputs of the previous one.
+
+    The inputs of each transaction are derived directly from the
+    in-memory outputs of its predecessor, which avoids the
+    prepare/fulfill round trip through dictionaries for every hop.
+
+    Args:
+        transaction (dict): The signed transaction whose outputs are
+            spent by the first hop.
+        hops (:obj:`list` of :obj:`tuple`): One ``(recipients,
+            private_keys)`` pair per hop. ``recipients`` takes the same
+            forms as for :func:`~.prepare_transfer_transaction`, except
+            that a single public key (or a tuple of public keys)
+            receives the total amount of the spent outputs.
+            ``private_keys`` are the keys of the current owner(s),
+            needed to fulfill the spent outputs.
+        metadata (:obj:`dict`, optional): Metadata associated with
+            every transaction of the chain. Defaults to ``None``.
+
+    Returns:
+        :obj:`list` of :obj:`dict`: The signed transactions of the
+        chain, in spending order, ready to be sent to a BigchainDB
+        federation.
+
+    Raises:
+        :exc:`~.exceptions.MissingPrivateKeyError`: If a private
+            key is missing.
+
+    Example:
+
+        Alice hands an asset over to Bob, who passes it on to Carol::
+
+            >>> build_transfer_chain(
+            ...     signed_create_tx,
+            ...     hops=[(bob.public_key, alice.private_key),
+            ...           (carol.public_key, bob.private_key)],
+            ... )
+
+    """
+    parent = _Transaction.from_dict(transaction)
+    chain = []
+    for recipients, private_keys in hops:
+        parent = _transfer_from(parent,
+                                recipients=recipients,
+                                private_keys=private_keys,
+                                metadata=metadata)
+        chain.append(parent.to_dict())
+    return chain
+
+
+def build_transfer_tree(transaction, *, levels, metadata=None):
+    """Builds a fan-out tree of signed ``"TRANSFER"`` transactions in
+    one pass.
+
+    Every output of every transaction of a level is spent by a
+    transaction of its own on the next level, so a level whose
+    ``recipients`` create ``n`` outputs multiplies the width of the
+    tree by ``n``.
+
+    Args:
+        transaction (dict): The signed transaction at the root of the
+            tree.
+        levels (:obj:`list` of :obj:`tuple`): One ``(recipients,
+            private_keys)`` pair per level, with the same semantics as
+            the hops of :func:`~.build_transfer_chain`.
+        metadata (:obj:`dict`, optional): Metadata associated with
+            every transaction of the tree. Defaults to ``None``.
+
+    Returns:
+        :obj:`list` of :obj:`list` of :obj:`dict`: The signed
+        transactions, grouped by level. Within a level, transactions
+        are ordered by parent and output index.
+
+    Raises:
+        :exc:`~.exceptions.MissingPrivateKeyError`: If a private
+            key is missing.
+
+    """
+    parents = [_Transaction.from_dict(transaction)]
+    tree = []
+    for recipients, private_keys in levels:
+        children = [
+            _transfer_from(parent,
+                           recipients=recipients,
+                           private_keys=private_keys,
+                           indices=[index],
+                           metadata=metadata)
+            for parent in parents
+            for index in range(len(parent.outputs))
+        ]
+        tree.append([child.to_dict() for child in children])
+        parents = children
+    return tree
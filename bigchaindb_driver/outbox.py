@@ -0,0 +1,284 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Durable journal of signed transactions and of their submission state,
+so that a submitter can resume after a crash without losing or
+re-signing transactions.
+
+Transactions are journaled once signed, before being sent::
+
+    outbox = Outbox('outbox.db')
+    outbox.record(signed_transactions)
+    for transaction in signed_transactions:
+        outbox.send(bdb, transaction)
+
+and, on restart, the unfinished ones are replayed::
+
+    outbox.replay(bdb)
+
+As transaction ids are deterministic hashes of their content, resending
+a transaction is safe: :meth:`~.Outbox.replay` first checks whether the
+node already knows the transaction, and only resends it otherwise.
+
+"""
+import sqlite3
+import threading
+from collections import namedtuple
+
+import rapidjson
+
+from .exceptions import BadRequest, BigchaindbException, NotFoundError
+
+
+PENDING = 'pending'
+SENT = 'sent'
+COMMITTED = 'committed'
+FAILED = 'failed'
+
+UNFINISHED_STATES = (PENDING, SENT)
+
+SEND_MODES = ('async', 'sync', 'commit')
+
+SYNCHRONOUS_MODES = ('OFF', 'NORMAL', 'FULL', 'EXTRA')
+
+Replay = namedtuple('Replay', ('resent', 'committed', 'failed'))
+
+
+class Outbox:
+    """Journal of signed transactions, persisted in a SQLite database.
+
+    The database runs in write-ahead logging mode, and writes are
+    batched: a call to :meth:`record` or :meth:`mark` is a single SQLite
+    transaction, whatever the number of transactions it covers. An
+    outbox may be shared between threads.
+
+    """
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS outbox ('
+        ' seq INTEGER PRIMARY KEY,'
+        ' transaction_id TEXT NOT NULL UNIQUE,'
+        ' body TEXT NOT NULL,'
+        ' state TEXT NOT NULL,'
+        ' error TEXT)',
+        'CREATE INDEX IF NOT EXISTS outbox_state ON outbox (state, seq)',
+    )
+
+    def __init__(self, path=':memory:', *, synchronous='NORMAL'):
+        """Initializes a :class:`~bigchaindb_driver.outbox.Outbox`
+        instance.
+
+        Args:
+            path (str): Path of the SQLite database file. Defaults to
+                ``':memory:'``.
+            synchronous (str): The SQLite ``synchronous`` setting.
+                ``'NORMAL'`` (the default) survives crashes of the
+                process, ``'FULL'`` also survives power losses, at the
+                cost of throughput. One of ``'OFF'``, ``'NORMAL'``,
+                ``'FULL'`` or ``'EXTRA'``.
+
+        Raises:
+            :exc:`ValueError`: If ``synchronous`` is not supported.
+
+        """
+        if synchronous not in SYNCHRONOUS_MODES:
+            raise ValueError(
+                'Unsupported synchronous setting: {}. Supported settings'
+                ' are: {}.'.format(synchronous, ', '.join(SYNCHRONOUS_MODES)))
+        self.path = path
+        # NOTE: The connection is shared between threads, and guarded by
+        #       the lock, as a connection is not safe for concurrent use.
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.execute('PRAGMA synchronous={}'.format(synchronous))
+        with self._db:
+            for statement in self.SCHEMA:
+                self._db.execute(statement)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute(
+                'SELECT COUNT(*) FROM outbox').fetchone()[0]
+
+    def record(self, transactions):
+        """Journals signed transactions in the ``'pending'`` state.
+
+        Transactions already in the journal are left untouched.
+
+        Args:
+            transactions (:obj:`dict` | :obj:`list` of :obj:`dict`): One
+                or more signed transactions.
+
+        """
+        if isinstance(transactions, dict):
+            transactions = (transactions,)
+        dumps = rapidjson.dumps
+        rows = [(transaction['id'], dumps(transaction), PENDING)
+                for transaction in transactions]
+        with self._lock, self._db:
+            self._db.executemany(
+                'INSERT OR IGNORE INTO outbox'
+                ' (transaction_id, body, state) VALUES (?, ?, ?)',
+                rows,
+            )
+
+    def mark(self, transaction_ids, state, error=None):
+        """Sets the state of journaled transactions.
+
+        Args:
+            transaction_ids (:obj:`str` | :obj:`list` of :obj:`str`): One
+                or more transaction ids.
+            state (str): One of ``'pending'``, ``'sent'``,
+                ``'committed'`` or ``'failed'``.
+            error (str): Optional description of the failure.
+
+        """
+        if isinstance(transaction_ids, str):
+            transaction_ids = (transaction_ids,)
+        with self._lock, self._db:
+            self._db.executemany(
+                'UPDATE outbox SET state = ?, error = ?'
+                ' WHERE transaction_id = ?',
+                ((state, error, txid) for txid in transaction_ids),
+            )
+
+    def state(self, transaction_id):
+        """Returns the state of a journaled transaction, or ``None`` if
+        the transaction is not in the journal.
+        """
+        with self._lock:
+            row = self._db.execute(
+                'SELECT state FROM outbox WHERE transaction_id = ?',
+                (transaction_id,)).fetchone()
+        return row and row[0]
+
+    def unfinished(self):
+        """Returns the journaled transactions that are ``'pending'`` or
+        ``'sent'``, in the order they were recorded.
+
+        Returns:
+            :obj:`list` of :obj:`dict`: The transactions.
+
+        """
+        with self._lock:
+            rows = self._db.execute(
+                'SELECT body FROM outbox WHERE state IN (?, ?) ORDER BY seq',
+                UNFINISHED_STATES).fetchall()
+        return [rapidjson.loads(body) for body, in rows]
+
+    def send(self, driver, transaction, mode='sync', headers=None):
+        """Journals (if needed) and sends a transaction, then records the
+        outcome.
+
+        Args:
+            driver (:class:`~bigchaindb_driver.BigchainDB`): The driver
+                to send the transaction with.
+            transaction (dict): The signed transaction.
+            mode (str): One of ``'async'``, ``'sync'`` or ``'commit'``.
+                Defaults to ``'sync'``.
+            headers (dict): Optional headers to pass to the request.
+
+        Returns:
+            dict: The transaction sent.
+
+        Raises:
+            :exc:`~.exceptions.BadRequest`: If the node rejects the
+                transaction, which is then marked as ``'failed'``.
+            :exc:`~.exceptions.TransportError`: For other errors, e.g.
+                if the node is unavailable. The transaction stays
+                unfinished.
+            :exc:`~.exceptions.TimeoutError`: If the node cannot be
+                reached. The transaction stays unfinished.
+
+        """
+        if mode not in SEND_MODES:
+            raise BigchaindbException(
+                'Unsupported send mode: {}. Supported modes are: {}.'
+                .format(mode, ', '.join(SEND_MODES)))
+        self.record(transaction)
+        send = getattr(driver.transactions, 'send_' + mode)
+        try:
+            response = send(transaction, headers=headers)
+        except BadRequest as exc:
+            self.mark(transaction['id'], FAILED, str(exc))
+            raise
+        self.mark(transaction['id'], COMMITTED if mode == 'commit' else SENT)
+        return response
+
+    def replay(self, driver, mode='sync', headers=None):
+        """Resends the unfinished transactions that the node does not
+        know about yet.
+
+        Each unfinished transaction is first looked up with
+        :meth:`~.TransactionsEndpoint.retrieve`: found transactions are
+        marked as ``'committed'`` without being resent. Transactions the
+        node rejects are marked as ``'failed'``.
+
+        Args:
+            driver (:class:`~bigchaindb_driver.BigchainDB`): The driver
+                to query the node with.
+            mode (str): The mode to resend transactions with. Defaults
+                to ``'sync'``.
+            headers (dict): Optional headers to pass to the requests.
+
+        Returns:
+            :class:`~.Replay`: The ids of the transactions that were
+            ``resent``, found ``committed``, or ``failed``.
+
+        Raises:
+            :exc:`~.exceptions.TransportError`: If the node fails, e.g.
+                is unavailable. Transactions handled so far keep their
+                new state.
+            :exc:`~.exceptions.TimeoutError`: If the node cannot be
+                reached.
+
+        """
+        replay = Replay([], [], [])
+        for transaction in self.unfinished():
+            txid = transaction['id']
+            try:
+                driver.transactions.retrieve(txid, headers=headers)
+            except NotFoundError:
+                pass
+            else:
+                self.mark(txid, COMMITTED)
+                replay.committed.append(txid)
+                continue
+            try:
+                self.send(driver, transaction, mode=mode, headers=headers)
+            except BadRequest:
+                replay.failed.append(txid)
+            else:
+                replay.resent.append(txid)
+        return replay
+
+    def purge(self, states=(COMMITTED,)):
+        """Deletes the journaled transactions in the given states.
+
+        Args:
+            states (:obj:`list` of :obj:`str`): Defaults to
+                ``('committed',)``.
+
+        Returns:
+            int: The number of deleted transactions.
+
+        """
+        with self._lock, self._db:
+            cursor = self._db.execute(
+                'DELETE FROM outbox WHERE state IN ({})'.format(
+                    ', '.join('?' * len(states))),
+                tuple(states))
+        return cursor.rowcount
+
+    def close(self):
+        """Closes the underlying database connection."""
+        with self._lock:
+            self._db.close()
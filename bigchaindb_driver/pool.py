@@ -3,7 +3,7 @@
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
 from abc import ABCMeta, abstractmethod
-from datetime import datetime
+from time import monotonic
 
 
 class AbstractPicker(metaclass=ABCMeta):
@@ -45,7 +45,7 @@ class RoundRobinPicker(AbstractPicker):
             return connections[0]
 
         def key(conn):
-            return (datetime.min
+            return (float('-inf')
                     if conn.backoff_time is None
                     else conn.backoff_time)
 
@@ -75,3 +75,83 @@ class Pool:
 
         """
         return self.picker.pick(self.connections)
+
+
+class SharedBackoff:
+    """Backoff state of the nodes, in shared memory.
+
+    Worker processes forked from the process creating it share it, so that
+    a node put in backoff by a worker is avoided by the other workers as
+    well, e.g. with gunicorn::
+
+        shared_backoff = SharedBackoff(2)
+
+        def post_fork(server, worker):
+            worker.bdb = BigchainDB(
+                'https://node1:9984', 'https://node2:9984',
+                transport_class=partial(Transport,
+                                        shared_backoff=shared_backoff))
+
+    Backoff times are given by :func:`time.monotonic`, whose reference
+    point is the same for all the processes of a host.
+
+    """
+
+    def __init__(self, size):
+        """Initializes a :class:`~bigchaindb_driver.pool.SharedBackoff`
+        instance.
+
+        Args:
+            size (int): The number of nodes.
+
+        """
+        import multiprocessing
+        # NOTE: A backoff time of 0 stands for no backoff.
+        self._backoff_times = multiprocessing.RawArray('d', size)
+        self._retries = multiprocessing.RawArray('i', size)
+        self._lock = multiprocessing.Lock()
+
+    def __len__(self):
+        return len(self._backoff_times)
+
+    def load(self, connections):
+        """Sets the backoff state of the given connections to the shared
+        one.
+
+        Args:
+            connections (list): List of
+                :class:`~bigchaindb_driver.connection.Connection`
+                instances, one per node.
+
+        """
+        with self._lock:
+            for index, connection in enumerate(connections):
+                backoff_time = self._backoff_times[index]
+                connection.backoff_time = backoff_time or None
+                connection._retries = self._retries[index]
+
+    def store(self, index, connection):
+        """Shares the backoff state of a connection.
+
+        Args:
+            index (int): The index of the node of the connection.
+            connection (:class:`~bigchaindb_driver.connection.Connection`):
+                The connection.
+
+        """
+        with self._lock:
+            self._backoff_times[index] = connection.backoff_time or 0
+            self._retries[index] = connection._retries
+
+    def backoff_times(self):
+        """Returns the remaining backoff delays of the nodes.
+
+        Returns:
+            :obj:`list` of :obj:`float`: The delays in seconds, ``0`` for
+            the nodes not in backoff.
+
+        """
+        now = monotonic()
+        with self._lock:
+            return [max(0, backoff_time - now) if backoff_time else 0
+                    for backoff_time in self._backoff_times]
@@ -0,0 +1,159 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Resolution of the outputs a key can spend into the inputs of
+``"TRANSFER"`` transactions.
+
+:meth:`~.OutputsEndpoint.get` only returns links to the outputs. Spending
+an output takes its condition and public keys, held by the transaction
+the link points to. :class:`~.InputResolver` retrieves these
+transactions concurrently, caches their outputs, as committed
+transactions never change, and groups the inputs by asset::
+
+    resolver = InputResolver(bdb)
+    spendables = resolver.resolve_public_key(alice.public_key)
+    for asset_id, spendable in spendables.items():
+        transfer = bdb.transactions.prepare(
+            operation='TRANSFER',
+            inputs=spendable.inputs,
+            recipients=[([bob.public_key], spendable.amount)],
+            asset={'id': asset_id},
+        )
+
+"""
+import threading
+from collections import OrderedDict, namedtuple
+from copy import deepcopy
+
+from .selection import spendable_output
+
+
+DEFAULT_CACHE_SIZE = 10000
+
+# NOTE: The sum of the `SpendableOutput` tuples of `selection` of an
+#       asset, as a single transfer spends them all.
+Spendable = namedtuple('Spendable', ('inputs', 'amount'))
+
+
+class InputResolver:
+    """Resolves links to outputs into the inputs spending them."""
+
+    def __init__(self, driver, *, concurrency=8,
+                 cache_size=DEFAULT_CACHE_SIZE):
+        """Initializes a :class:`~bigchaindb_driver.resolver.InputResolver`
+        instance.
+
+        Args:
+            driver (:class:`~bigchaindb_driver.BigchainDB`): The driver
+                to retrieve the transactions with.
+            concurrency (int): Maximum number of requests in flight.
+                Defaults to ``8``.
+            cache_size (int): Maximum number of transactions whose
+                outputs are cached, the least recently used ones being
+                evicted first. Defaults to :data:`DEFAULT_CACHE_SIZE`.
+
+        """
+        self.driver = driver
+        self.concurrency = concurrency
+        self.cache_size = cache_size
+        # NOTE: Maps the id of a transaction to the `SpendableOutput`
+        #       tuples of its outputs, rather than to the whole
+        #       transaction.
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._cache)
+
+    def add_transaction(self, transaction):
+        """Caches the outputs of a transaction, e.g. of one just sent,
+        so that spending them needs no request.
+
+        Args:
+            transaction (dict): A transaction.
+
+        """
+        self._store(transaction)
+
+    def resolve(self, links):
+        """Resolves links to outputs into inputs, grouped by asset.
+
+        Args:
+            links (iterable): The links to the outputs to spend, as
+                returned by :meth:`~.OutputsEndpoint.get`, i.e.
+                :obj:`dict` with the keys ``'transaction_id'`` and
+                ``'output_index'``. Duplicates are ignored.
+
+        Returns:
+            dict: Mapping between the ids of the assets, in the order in
+            which they are first met, and :class:`~.Spendable` tuples,
+            holding the ``inputs`` to pass to
+            :func:`~.offchain.prepare_transfer_transaction`, and the
+            total ``amount`` of the outputs they spend. The inputs are
+            copies, which callers are free to change.
+
+        Raises:
+            :exc:`~.exceptions.BigchaindbException`: If a transaction
+                cannot be retrieved, e.g.
+                :exc:`~.exceptions.NotFoundError`.
+
+        """
+        links = list(OrderedDict.fromkeys(
+            (link['transaction_id'], link['output_index'])
+            for link in links))
+        txids = list(OrderedDict.fromkeys(txid for txid, _ in links))
+        entries = self._lookup(txids)
+        missing = [txid for txid in txids if txid not in entries]
+        if missing:
+            transactions = self.driver.transactions.retrieve_many(
+                missing, concurrency=self.concurrency)
+            for txid, transaction in transactions.items():
+                if isinstance(transaction, Exception):
+                    raise transaction
+                entries[txid] = self._store(transaction)
+
+        spendables = OrderedDict()
+        for txid, output_index in links:
+            output = entries[txid][output_index]
+            inputs, total = spendables.get(output.asset_id, ([], 0))
+            inputs.append(deepcopy(output.input))
+            spendables[output.asset_id] = Spendable(
+                inputs, total + output.amount)
+        return spendables
+
+    def resolve_public_key(self, public_key):
+        """Resolves the unspent outputs of a public key into inputs,
+        grouped by asset.
+
+        Args:
+            public_key (str): The public key.
+
+        Returns:
+            dict: See :meth:`resolve`.
+
+        """
+        return self.resolve(self.driver.outputs.get(public_key, spent=False))
+
+    def _lookup(self, txids):
+        entries = {}
+        with self._lock:
+            for txid in txids:
+                entry = self._cache.get(txid)
+                if entry is not None:
+                    self._cache.move_to_end(txid)
+                    entries[txid] = entry
+        return entries
+
+    def _store(self, transaction):
+        # NOTE: Copied, so that the cache does not share the conditions
+        #       of the transaction, which the caller may change.
+        entry = deepcopy(tuple(
+            spendable_output(transaction, output_index)
+            for output_index in range(len(transaction['outputs']))))
+        with self._lock:
+            self._cache[transaction['id']] = entry
+            self._cache.move_to_end(transaction['id'])
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return entry
@@ -0,0 +1,186 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Retry policies for the HTTP errors a node may answer with.
+
+Without a policy, :meth:`~.transport.Transport.forward_request` only
+retries connection errors. With one, errors such as 503 (Service
+Unavailable) are retried on another node, subject to a retry budget::
+
+    from functools import partial
+
+    bdb = BigchainDB(
+        'https://node1:9984', 'https://node2:9984',
+        transport_class=partial(Transport, retry_policy=RetryPolicy()),
+    )
+
+Attributes:
+    ALL_METHODS (frozenset): All the HTTP methods.
+    IDEMPOTENT_METHODS (frozenset): The HTTP methods whose requests can
+        be sent more than once without side effects.
+    DEFAULT_RETRY_ON (dict): Default retry rules: 503 errors are
+        retried for all methods, as the node did not process the
+        request, while 502 and 504 errors are only retried for
+        idempotent methods.
+
+"""
+import threading
+from collections import Counter
+
+from .exceptions import TransportError
+
+
+ALL_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH',
+                         'DELETE'))
+
+IDEMPOTENT_METHODS = frozenset(('GET', 'HEAD', 'OPTIONS', 'PUT', 'DELETE'))
+
+DEFAULT_RETRY_ON = {
+    502: IDEMPOTENT_METHODS,
+    503: ALL_METHODS,
+    504: IDEMPOTENT_METHODS,
+}
+
+CONNECTION_ERROR = 'connection_error'
+
+
+class RetryBudget:
+    """Caps retries at a ratio of the requests, to prevent retry storms
+    when all the nodes are overloaded.
+
+    Every request deposits ``ratio`` in the budget, up to ``cap``, and
+    every retry withdraws ``1``. The budget starts with ``reserve``, so
+    that a low traffic can still retry.
+
+    """
+
+    def __init__(self, *, ratio=0.1, reserve=10, cap=100):
+        """Initializes a :class:`~bigchaindb_driver.retry.RetryBudget`
+        instance.
+
+        Args:
+            ratio (float): Number of retries allowed per request.
+                Defaults to ``0.1``, i.e. retries add at most 10% to the
+                traffic.
+            reserve (float): Initial balance. Defaults to ``10``.
+            cap (float): Maximum balance. Defaults to ``100``.
+
+        """
+        self.ratio = ratio
+        self.cap = cap
+        self.balance = float(reserve)
+        self._lock = threading.Lock()
+
+    def deposit(self):
+        with self._lock:
+            self.balance = min(self.cap, self.balance + self.ratio)
+
+    def withdraw(self):
+        """Returns whether a retry is allowed, and if so, charges it."""
+        with self._lock:
+            if self.balance < 1:
+                return False
+            self.balance -= 1
+            return True
+
+
+class RetryPolicy:
+    """Decides which failed requests are retried, and counts the retries
+    per reason.
+
+    """
+
+    def __init__(self, *, retry_on=None, max_retries=3, budget=None):
+        """Initializes a :class:`~bigchaindb_driver.retry.RetryPolicy`
+        instance.
+
+        Args:
+            retry_on (dict): Mapping between the HTTP status codes or the
+                :exc:`~.exceptions.TransportError` subclasses to retry,
+                and the HTTP methods they are retried for. Defaults to
+                :data:`DEFAULT_RETRY_ON`.
+            max_retries (int): Maximum number of retries of a request
+                after an HTTP error. Defaults to ``3``.
+            budget (:class:`~.RetryBudget`): The retry budget. Defaults
+                to a :class:`~.RetryBudget` with the default settings.
+
+        Note:
+            Connection errors are always retried until the transport
+            times out, as without a policy; they are only counted.
+
+        """
+        self.retry_on = DEFAULT_RETRY_ON if retry_on is None else retry_on
+        self.max_retries = max_retries
+        self.budget = RetryBudget() if budget is None else budget
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def counts(self):
+        """dict: Number of retries per reason, e.g. ``'status_503'``,
+        ``'ServiceUnavailable'`` or ``'connection_error'``, and of
+        retries denied by the budget, under ``'budget_exhausted'``.
+        """
+        with self._lock:
+            return dict(self._counts)
+
+    def on_request(self):
+        """Called once per request, before its first attempt."""
+        self.budget.deposit()
+
+    def on_connection_error(self):
+        """Called when an attempt fails with a connection error."""
+        self._count(CONNECTION_ERROR)
+
+    def should_retry(self, method, error, retries):
+        """Decides whether to retry a request that failed with an HTTP
+        error.
+
+        Args:
+            method (str): The HTTP method of the request.
+            error (:exc:`~.exceptions.TransportError`): The error.
+            retries (int): The number of retries of the request so far.
+
+        Returns:
+            bool: Whether to retry the request, on another node if
+            possible.
+
+        """
+        reason = self.reason(method, error)
+        if reason is None or retries >= self.max_retries:
+            return False
+        if not self.budget.withdraw():
+            self._count('budget_exhausted')
+            return False
+        self._count(reason)
+        return True
+
+    def reason(self, method, error):
+        """Returns the reason a request that failed with an HTTP error
+        is retried for, as counted in :attr:`counts`.
+
+        Args:
+            method (str): The HTTP method of the request.
+            error (:exc:`~.exceptions.TransportError`): The error.
+
+        Returns:
+            str: The reason, e.g. ``'status_503'`` or
+            ``'ServiceUnavailable'``, or ``None`` if the error is not
+            retried for the method.
+
+        """
+        if not isinstance(error, TransportError):
+            return None
+        methods = self.retry_on.get(error.status_code)
+        if methods is not None:
+            return 'status_{}'.format(error.status_code) \
+                if method in methods else None
+        for key, methods in self.retry_on.items():
+            if isinstance(key, type) and isinstance(error, key):
+                return type(error).__name__ if method in methods else None
+        return None
+
+    def _count(self, reason):
+        with self._lock:
+            self._counts[reason] += 1
@@ -0,0 +1,444 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Local validation of transactions against the JSON schemas enforced by
+BigchainDB nodes, so that malformed transactions can be rejected before
+they are sent.
+
+The schemas mirror the ``transaction``, ``transaction_create`` and
+``transaction_transfer`` schemas of the BigchainDB server. They are
+compiled once per version and operation with ``rapidjson_schema``, and
+cached.
+
+The regular expression engine of ``rapidjson`` is slow on the long
+bounded repetitions used for keys, hashes and condition URIs (about a
+millisecond per transaction), so these ``pattern`` keywords are left out
+of the compiled schemas and checked with :mod:`re` instead.
+
+Attributes:
+    TRANSACTION_SCHEMAS (dict): Mapping between transaction versions and
+        the schema common to all operations of that version.
+    OPERATION_SCHEMAS (dict): Mapping between ``(version, operation)``
+        pairs and the operation specific schemas.
+
+"""
+import re
+from copy import deepcopy
+from functools import lru_cache
+
+import rapidjson_schema
+
+from .common.utils import serialize
+from .exceptions import SchemaValidationError
+
+
+_BASE58_PATTERN = re.compile('[1-9a-zA-Z^OIl]{43,44}')
+_SHA3_HEXDIGEST_PATTERN = re.compile('[0-9a-f]{64}')
+_CONDITION_URI_PATTERN = re.compile(
+    '^ni:///sha-256;([a-zA-Z0-9_-]{0,86})[?]'
+    '(fpt=(ed25519|threshold)-sha-256(&)?|'
+    'cost=[0-9]+(&)?|'
+    'subtypes=ed25519-sha-256(&)?){2,3}$'
+)
+_FULFILLMENT_URI_PATTERN = re.compile('^[a-zA-Z0-9_-]*$')
+
+_SHA3_HEXDIGEST = {
+    'type': 'string',
+    'pattern': _SHA3_HEXDIGEST_PATTERN.pattern,
+}
+
+TRANSACTION_SCHEMA_V2 = {
+    '$schema': 'http://json-schema.org/draft-04/schema#',
+    'title': 'Transaction Schema',
+    'type': 'object',
+    'additionalProperties': False,
+    'required': ['id', 'inputs', 'outputs', 'operation', 'metadata',
+                 'asset', 'version'],
+    'properties': {
+        'id': {
+            'anyOf': [
+                {'$ref': '#/definitions/sha3_hexdigest'},
+                {'type': 'null'},
+            ],
+        },
+        'operation': {'$ref': '#/definitions/operation'},
+        'asset': {'$ref': '#/definitions/asset'},
+        'inputs': {
+            'type': 'array',
+            'items': {'$ref': '#/definitions/input'},
+        },
+        'outputs': {
+            'type': 'array',
+            'items': {'$ref': '#/definitions/output'},
+        },
+        'metadata': {'$ref': '#/definitions/metadata'},
+        'version': {
+            'type': 'string',
+            'pattern': '^2\\.0$',
+        },
+    },
+    'definitions': {
+        'offset': {
+            'type': 'integer',
+            'minimum': 0,
+        },
+        'base58': {
+            'type': 'string',
+            'pattern': _BASE58_PATTERN.pattern,
+        },
+        'public_keys': {
+            'anyOf': [
+                {
+                    'type': 'array',
+                    'items': {'$ref': '#/definitions/base58'},
+                },
+                {'type': 'null'},
+            ],
+        },
+        'sha3_hexdigest': _SHA3_HEXDIGEST,
+        'operation': {
+            'type': 'string',
+            'enum': ['CREATE', 'TRANSFER'],
+        },
+        'asset': {
+            'type': 'object',
+            'additionalProperties': False,
+            'properties': {
+                'id': {'$ref': '#/definitions/sha3_hexdigest'},
+                'data': {
+                    'anyOf': [
+                        {'type': 'object', 'additionalProperties': True},
+                        {'type': 'null'},
+                    ],
+                },
+            },
+        },
+        'output': {
+            'type': 'object',
+            'additionalProperties': False,
+            'required': ['amount', 'condition', 'public_keys'],
+            'properties': {
+                'amount': {
+                    'type': 'string',
+                    'pattern': '^[0-9]{1,20}$',
+                },
+                'condition': {
+                    'type': 'object',
+                    'additionalProperties': False,
+                    'required': ['details', 'uri'],
+                    'properties': {
+                        'details': {
+                            '$ref': '#/definitions/condition_details',
+                        },
+                        'uri': {
+                            'type': 'string',
+                            'pattern': _CONDITION_URI_PATTERN.pattern,
+                        },
+                    },
+                },
+                'public_keys': {'$ref': '#/definitions/public_keys'},
+            },
+        },
+        'input': {
+            'type': 'object',
+            'additionalProperties': False,
+            'required': ['owners_before', 'fulfillment'],
+            'properties': {
+                'owners_before': {'$ref': '#/definitions/public_keys'},
+                'fulfillment': {
+                    'anyOf': [
+                        {
+                            'type': 'string',
+                            'pattern': _FULFILLMENT_URI_PATTERN.pattern,
+                        },
+                        {'$ref': '#/definitions/condition_details'},
+                    ],
+                },
+                'fulfills': {
+                    'anyOf': [
+                        {
+                            'type': 'object',
+                            'additionalProperties': False,
+                            'required': ['output_index', 'transaction_id'],
+                            'properties': {
+                                'output_index': {
+                                    '$ref': '#/definitions/offset',
+                                },
+                                'transaction_id': {
+                                    '$ref': '#/definitions/sha3_hexdigest',
+                                },
+                            },
+                        },
+                        {'type': 'null'},
+                    ],
+                },
+            },
+        },
+        'metadata': {
+            'anyOf': [
+                {
+                    'type': 'object',
+                    'additionalProperties': True,
+                    'minProperties': 1,
+                },
+                {'type': 'null'},
+            ],
+        },
+        'condition_details': {
+            'anyOf': [
+                {
+                    'type': 'object',
+                    'additionalProperties': False,
+                    'required': ['type', 'public_key'],
+                    'properties': {
+                        'type': {
+                            'type': 'string',
+                            'pattern': '^ed25519-sha-256$',
+                        },
+                        'public_key': {'$ref': '#/definitions/base58'},
+                    },
+                },
+                {
+                    'type': 'object',
+                    'additionalProperties': False,
+                    'required': ['type', 'threshold', 'subconditions'],
+                    'properties': {
+                        'type': {
+                            'type': 'string',
+                            'pattern': '^threshold-sha-256$',
+                        },
+                        'threshold': {
+                            'type': 'integer',
+                            'minimum': 1,
+                            'maximum': 100,
+                        },
+                        'subconditions': {
+                            'type': 'array',
+                            'items': {
+                                '$ref': '#/definitions/condition_details',
+                            },
+                        },
+                    },
+                },
+            ],
+        },
+    },
+}
+
+TRANSACTION_CREATE_SCHEMA_V2 = {
+    '$schema': 'http://json-schema.org/draft-04/schema#',
+    'title': 'Transaction Schema - CREATE specific constraints',
+    'type': 'object',
+    'required': ['asset', 'inputs'],
+    'properties': {
+        'asset': {
+            'additionalProperties': False,
+            'required': ['data'],
+            'properties': {
+                'data': {
+                    'anyOf': [
+                        {'type': 'object', 'additionalProperties': True},
+                        {'type': 'null'},
+                    ],
+                },
+            },
+        },
+        'inputs': {
+            'type': 'array',
+            'minItems': 1,
+            'maxItems': 1,
+            'items': {
+                'type': 'object',
+                'required': ['fulfills'],
+                'properties': {
+                    'fulfills': {'type': 'null'},
+                },
+            },
+        },
+    },
+}
+
+TRANSACTION_TRANSFER_SCHEMA_V2 = {
+    '$schema': 'http://json-schema.org/draft-04/schema#',
+    'title': 'Transaction Schema - TRANSFER specific constraints',
+    'type': 'object',
+    'required': ['asset'],
+    'properties': {
+        'asset': {
+            'additionalProperties': False,
+            'required': ['id'],
+            'properties': {
+                'id': _SHA3_HEXDIGEST,
+            },
+        },
+        'inputs': {
+            'type': 'array',
+            'minItems': 1,
+            'items': {
+                'type': 'object',
+                'required': ['fulfills'],
+                'properties': {
+                    'fulfills': {'type': 'object'},
+                },
+            },
+        },
+    },
+}
+
+TRANSACTION_SCHEMAS = {
+    '2.0': TRANSACTION_SCHEMA_V2,
+}
+
+OPERATION_SCHEMAS = {
+    ('2.0', 'CREATE'): TRANSACTION_CREATE_SCHEMA_V2,
+    ('2.0', 'TRANSFER'): TRANSACTION_TRANSFER_SCHEMA_V2,
+}
+
+
+_SLOW_PATTERNS = frozenset((
+    _BASE58_PATTERN.pattern,
+    _SHA3_HEXDIGEST_PATTERN.pattern,
+    _CONDITION_URI_PATTERN.pattern,
+    _FULFILLMENT_URI_PATTERN.pattern,
+))
+
+
+def _without_slow_patterns(schema):
+    schema = deepcopy(schema)
+    stack = [schema]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            if node.get('pattern') in _SLOW_PATTERNS:
+                del node['pattern']
+            stack.extend(node.values())
+        elif isinstance(node, list):
+            stack.extend(node)
+    return schema
+
+
+@lru_cache(maxsize=None)
+def _compile(version, operation=None):
+    if operation is None:
+        schema = TRANSACTION_SCHEMAS[version]
+    else:
+        schema = OPERATION_SCHEMAS[(version, operation)]
+    return rapidjson_schema.loads(serialize(_without_slow_patterns(schema)))
+
+
+def _check_pattern(pattern, value, pointer):
+    # NOTE: The structure (and hence the type of `value`) has already been
+    #       validated by the compiled schema.
+    if value is not None and not pattern.search(value):
+        raise SchemaValidationError(
+            'Invalid transaction: schema keyword "pattern" failed at '
+            '"{}"'.format(pointer))
+
+
+def _check_public_keys(public_keys, pointer):
+    for index, public_key in enumerate(public_keys or ()):
+        _check_pattern(_BASE58_PATTERN, public_key,
+                       '{}/{}'.format(pointer, index))
+
+
+def _check_details(details, pointer):
+    stack = [(details, pointer)]
+    while stack:
+        details, pointer = stack.pop()
+        if 'public_key' in details:
+            _check_pattern(_BASE58_PATTERN, details['public_key'],
+                           pointer + '/public_key')
+        for index, subcondition in enumerate(
+                details.get('subconditions', ())):
+            stack.append(
+                (subcondition, '{}/subconditions/{}'.format(pointer, index)))
+
+
+def _check_slow_patterns(transaction):
+    _check_pattern(_SHA3_HEXDIGEST_PATTERN, transaction['id'], '#/id')
+    _check_pattern(_SHA3_HEXDIGEST_PATTERN, transaction['asset'].get('id'),
+                   '#/asset/id')
+    for index, input_ in enumerate(transaction['inputs']):
+        pointer = '#/inputs/{}'.format(index)
+        _check_public_keys(input_['owners_before'],
+                           pointer + '/owners_before')
+        if isinstance(input_['fulfillment'], dict):
+            _check_details(input_['fulfillment'], pointer + '/fulfillment')
+        else:
+            _check_pattern(_FULFILLMENT_URI_PATTERN, input_['fulfillment'],
+                           pointer + '/fulfillment')
+        if input_.get('fulfills'):
+            _check_pattern(_SHA3_HEXDIGEST_PATTERN,
+                           input_['fulfills']['transaction_id'],
+                           pointer + '/fulfills/transaction_id')
+    for index, output in enumerate(transaction['outputs']):
+        pointer = '#/outputs/{}'.format(index)
+        _check_public_keys(output['public_keys'], pointer + '/public_keys')
+        _check_details(output['condition']['details'],
+                       pointer + '/condition/details')
+        _check_pattern(_CONDITION_URI_PATTERN, output['condition']['uri'],
+                       pointer + '/condition/uri')
+
+
+def get_validators(version, operation):
+    """Returns the compiled validators for the given transaction version
+    and operation.
+
+    Args:
+        version (str): The transaction version, e.g. ``'2.0'``.
+        operation (str): ``'CREATE'`` or ``'TRANSFER'``.
+
+    Returns:
+        :obj:`tuple`: The validator common to all operations, and the
+        operation specific one. Both expose a ``validate(json_str)``
+        method.
+
+    Raises:
+        :exc:`~.exceptions.SchemaValidationError`: If there is no schema
+            for the given version and operation.
+
+    """
+    try:
+        known = (version, operation) in OPERATION_SCHEMAS
+    # NOTE: E.g. a list, from a malformed transaction.
+    except TypeError:
+        known = False
+    if not known:
+        raise SchemaValidationError(
+            'No schema for {} transactions of version {}'.format(
+                operation, version))
+    return _compile(version), _compile(version, operation)
+
+
+def validate_transaction(transaction):
+    """Validates the given transaction against the schema of its version
+    and operation.
+
+    Args:
+        transaction (dict): The transaction to validate.
+
+    Raises:
+        :exc:`~.exceptions.SchemaValidationError`: If the transaction
+            does not match the schema. The exception message holds the
+            failing schema keyword and the JSON pointer of the
+            offending part of the transaction.
+
+    """
+    try:
+        version = transaction['version']
+        operation = transaction['operation']
+    except (KeyError, TypeError):
+        raise SchemaValidationError(
+            'Transaction must be an object with `version` and `operation`')
+
+    serialized = serialize(transaction)
+    for validator in get_validators(version, operation):
+        try:
+            validator.validate(serialized)
+        except ValueError as exc:
+            keyword, _, document_pointer = (exc.args + ('', ''))[:3]
+            raise SchemaValidationError(
+                'Invalid transaction: schema keyword "{}" failed at '
+                '"{}"'.format(keyword, document_pointer)) from exc
+    _check_slow_patterns(transaction)
@@ -0,0 +1,277 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Coin selection for divisible assets: choosing which outputs to spend
+in order to transfer a given amount, and preparing the corresponding
+``"TRANSFER"`` transaction with a change output.
+
+Attributes:
+    strategies (dict): Mapping between strategy names and selection
+        functions. E.g.: The string ``'largest_first'`` is mapped to
+        :func:`~.largest_first`.
+
+"""
+from collections import namedtuple
+
+from .exceptions import BigchaindbException, InsufficientFundsError
+from .offchain import prepare_transfer_transaction
+from .utils import get_asset_id
+
+
+SpendableOutput = namedtuple('SpendableOutput', ('input', 'amount',
+                                                 'asset_id'))
+
+BNB_MAX_TRIES = 100000
+
+
+def spendable_outputs(transactions, public_key):
+    """Extracts the outputs of the given transactions that are locked
+    with ``public_key``.
+
+    Note:
+        This does not check whether the outputs are spent; pass the
+        transactions referenced by ``outputs.get(public_key,
+        spent=False)``, or use :func:`~.fetch_spendable_outputs`.
+
+    Args:
+        transactions (:obj:`list` of :obj:`dict`): Signed transactions.
+        public_key (str): The public key of the owner.
+
+    Returns:
+        :obj:`list` of :class:`~.SpendableOutput`: The spendable
+        outputs, each one holding an ``input`` :obj:`dict` as expected
+        by :func:`~.offchain.prepare_transfer_transaction`.
+
+    """
+    return [
+        spendable_output(transaction, output_index)
+        for transaction in transactions
+        for output_index, output in enumerate(transaction['outputs'])
+        if public_key in output['public_keys']
+    ]
+
+
+def spendable_output(transaction, output_index):
+    """Builds the spendable output of the given transaction at
+    ``output_index``, whoever it is locked with.
+
+    Args:
+        transaction (dict): A signed transaction.
+        output_index (int): The index of the output in the transaction.
+
+    Returns:
+        :class:`~.SpendableOutput`: The spendable output.
+
+    """
+    output = transaction['outputs'][output_index]
+    input_ = {
+        'fulfillment': output['condition']['details'],
+        'fulfills': {
+            'output_index': output_index,
+            'transaction_id': transaction['id'],
+        },
+        'owners_before': output['public_keys'],
+    }
+    return SpendableOutput(input_, int(output['amount']),
+                           get_asset_id(transaction))
+
+
+def fetch_spendable_outputs(driver, public_key, *, concurrency=8):
+    """Fetches the unspent outputs of ``public_key`` from a node.
+
+    The transactions holding the outputs are retrieved concurrently,
+    with :meth:`~.TransactionsEndpoint.retrieve_many`.
+
+    Args:
+        driver (:class:`~bigchaindb_driver.BigchainDB`): The driver to
+            query the node with.
+        public_key (str): The public key of the owner.
+        concurrency (int): Maximum number of requests in flight.
+            Defaults to ``8``.
+
+    Returns:
+        :obj:`list` of :class:`~.SpendableOutput`: The spendable
+        outputs.
+
+    Raises:
+        :exc:`~.exceptions.BigchaindbException`: If a transaction
+            cannot be retrieved, e.g.
+            :exc:`~.exceptions.NotFoundError`.
+
+    """
+    links = driver.outputs.get(public_key, spent=False)
+    transactions = driver.transactions.retrieve_many(
+        (link['transaction_id'] for link in links), concurrency=concurrency)
+    for transaction in transactions.values():
+        if isinstance(transaction, Exception):
+            raise transaction
+    return [spendable_output(transactions[link['transaction_id']],
+                             link['output_index'])
+            for link in links]
+
+
+def largest_first(candidates, amount):
+    """Selects the largest outputs first, which minimizes the number of
+    inputs needed to reach ``amount``.
+    """
+    return _accumulate(sorted(candidates, key=lambda c: c.amount,
+                              reverse=True), amount)
+
+
+def smallest_first(candidates, amount):
+    """Selects the smallest outputs first, which consolidates dust at the
+    cost of larger transactions.
+    """
+    return _accumulate(sorted(candidates, key=lambda c: c.amount), amount)
+
+
+def branch_and_bound(candidates, amount, max_tries=BNB_MAX_TRIES):
+    """Searches for the smallest set of outputs whose amounts add up to
+    exactly ``amount``, so that no change output is needed.
+
+    The search is a depth-first branch and bound over the candidates
+    sorted by decreasing amount, and gives up after ``max_tries``
+    visited nodes. If no exact match is found, falls back to
+    :func:`~.largest_first`.
+    """
+    ordered = sorted(candidates, key=lambda c: c.amount, reverse=True)
+    # NOTE: remaining[i] is the total amount of ordered[i:], used to prune
+    #       branches that cannot reach `amount` anymore.
+    remaining = [0] * (len(ordered) + 1)
+    for i in range(len(ordered) - 1, -1, -1):
+        remaining[i] = remaining[i + 1] + ordered[i].amount
+
+    # NOTE: Partial selections are stored as linked lists of
+    #       `(candidate, parent)` pairs, so that branches share their prefix.
+    best = None
+    stack = [(0, 0, 0, None)]
+    tries = 0
+    while stack and tries < max_tries:
+        tries += 1
+        index, total, count, selection = stack.pop()
+        if total == amount:
+            if best is None or count < best[0]:
+                best = (count, selection)
+            continue
+        if (index == len(ordered) or
+                total + remaining[index] < amount or
+                (best is not None and count + 1 >= best[0])):
+            continue
+        # NOTE: The inclusion branch is pushed last so that it is explored
+        #       first, i.e. larger outputs are tried first.
+        stack.append((index + 1, total, count, selection))
+        candidate = ordered[index]
+        if total + candidate.amount <= amount:
+            stack.append((index + 1, total + candidate.amount, count + 1,
+                          (candidate, selection)))
+
+    if best is None:
+        return largest_first(candidates, amount)
+    selected = []
+    selection = best[1]
+    while selection is not None:
+        candidate, selection = selection
+        selected.append(candidate)
+    return selected[::-1]
+
+
+def _accumulate(ordered, amount):
+    selected = []
+    total = 0
+    for candidate in ordered:
+        if total >= amount:
+            break
+        selected.append(candidate)
+        total += candidate.amount
+    if total < amount:
+        raise InsufficientFundsError(
+            'Cannot cover an amount of {} with outputs totalling {}'
+            .format(amount, total))
+    return selected
+
+
+strategies = {
+    'largest_first': largest_first,
+    'smallest_first': smallest_first,
+    'branch_and_bound': branch_and_bound,
+}
+
+
+def select_outputs(candidates, amount, *, strategy='largest_first'):
+    """Selects outputs covering ``amount`` among ``candidates``.
+
+    Args:
+        candidates (:obj:`list` of :class:`~.SpendableOutput`): The
+            outputs to choose from.
+        amount (int): The amount to cover.
+        strategy (str): One of ``'largest_first'``, ``'smallest_first'``
+            or ``'branch_and_bound'``. Defaults to ``'largest_first'``.
+
+    Returns:
+        :obj:`list` of :class:`~.SpendableOutput`: The selected outputs.
+
+    Raises:
+        :exc:`~.exceptions.InsufficientFundsError`: If the candidates do
+            not cover ``amount``.
+        :exc:`~.exceptions.BigchaindbException`: If ``strategy`` is
+            unknown.
+
+    """
+    try:
+        select = strategies[strategy]
+    except KeyError:
+        raise BigchaindbException(
+            'Unsupported coin selection strategy: {}. Supported strategies '
+            'are: {}.'.format(strategy, ', '.join(sorted(strategies))))
+    return select(candidates, amount)
+
+
+def prepare_divisible_transfer(*, candidates, asset_id, recipients, amount,
+                               change_public_key, strategy='largest_first',
+                               metadata=None):
+    """Selects outputs covering ``amount`` and prepares the
+    ``"TRANSFER"`` transaction spending them, with a change output for
+    whatever exceeds ``amount``.
+
+    Args:
+        candidates (:obj:`list` of :class:`~.SpendableOutput`): The
+            outputs to choose from, e.g. as returned by
+            :func:`~.fetch_spendable_outputs`. Outputs of other assets
+            are ignored.
+        asset_id (str): The id of the asset to transfer.
+        recipients (:obj:`str` | :obj:`list` | :obj:`tuple`): One or
+            more public keys of the recipient(s) of ``amount``.
+        amount (int): The amount to transfer.
+        change_public_key (str): The public key receiving the change.
+        strategy (str): The selection strategy, see
+            :func:`~.select_outputs`. Defaults to ``'largest_first'``.
+        metadata (:obj:`dict`): Metadata associated with the
+            transaction. Defaults to ``None``.
+
+    Returns:
+        dict: The prepared ``"TRANSFER"`` transaction, ready to be
+        fulfilled.
+
+    Raises:
+        :exc:`~.exceptions.InsufficientFundsError`: If the outputs of
+            the asset do not cover ``amount``.
+
+    """
+    if not isinstance(recipients, (list, tuple)):
+        recipients = [recipients]
+    selected = select_outputs(
+        [c for c in candidates if c.asset_id == asset_id],
+        amount,
+        strategy=strategy,
+    )
+    outputs = [(list(recipients), amount)]
+    change = sum(c.amount for c in selected) - amount
+    if change:
+        outputs.append(([change_public_key], change))
+    return prepare_transfer_transaction(
+        inputs=[c.input for c in selected],
+        recipients=outputs,
+        asset={'id': asset_id},
+        metadata=metadata,
+    )
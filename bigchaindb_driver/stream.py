@@ -0,0 +1,449 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Client for the event stream of BigchainDB nodes, which publishes
+every valid (i.e. committed) transaction over a WebSocket.
+
+Events can be consumed with callbacks, with an asynchronous iterator,
+or by waiting for given transactions::
+
+    stream = EventStream.from_driver(bdb)
+    stream.subscribe(print)
+    stream.start()
+    stream.waiter(txid).result(timeout=30)
+
+The WebSocket client is a minimal implementation of :rfc:`6455` on top
+of :mod:`asyncio` streams, restricted to what the event stream needs:
+text messages sent by the node, pings, and closing handshakes.
+
+"""
+import asyncio
+import base64
+import hashlib
+import json
+import logging
+import os
+import random
+import struct
+import threading
+from collections import namedtuple
+from concurrent.futures import Future
+from functools import partial
+from urllib.parse import urlsplit
+
+from .exceptions import BigchaindbException, StreamError
+
+
+logger = logging.getLogger(__name__)
+
+Event = namedtuple('Event', ('transaction_id', 'asset_id', 'height'))
+
+VALID_TRANSACTIONS_PATH = '/api/v1/streams/valid_transactions'
+
+MAX_MESSAGE_SIZE = 16 * 1024 * 1024
+
+_WEBSOCKET_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+_OP_CONTINUATION = 0x0
+_OP_TEXT = 0x1
+_OP_BINARY = 0x2
+_OP_CLOSE = 0x8
+_OP_PING = 0x9
+_OP_PONG = 0xA
+
+
+class _WebSocket:
+    """Client side of a WebSocket connection."""
+
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self.writer = writer
+
+    @classmethod
+    async def connect(cls, url, timeout=None):
+        parts = urlsplit(url)
+        if parts.scheme not in ('ws', 'wss'):
+            raise StreamError('Unsupported stream URL: {}'.format(url))
+        secure = parts.scheme == 'wss'
+        port = parts.port or (443 if secure else 80)
+        reader, writer = await asyncio.wait_for(
+            asyncio.open_connection(parts.hostname, port,
+                                    ssl=True if secure else None),
+            timeout)
+
+        key = base64.b64encode(os.urandom(16)).decode()
+        writer.write((
+            'GET {path} HTTP/1.1\r\n'
+            'Host: {host}:{port}\r\n'
+            'Upgrade: websocket\r\n'
+            'Connection: Upgrade\r\n'
+            'Sec-WebSocket-Key: {key}\r\n'
+            'Sec-WebSocket-Version: 13\r\n'
+            '\r\n'
+        ).format(path=(parts.path or '/') +
+                 ('?' + parts.query if parts.query else ''),
+                 host=parts.hostname, port=port, key=key).encode())
+
+        websocket = cls(reader, writer)
+        try:
+            headers = await asyncio.wait_for(websocket._read_response(),
+                                             timeout)
+        except Exception:
+            websocket.abort()
+            raise
+        accept = base64.b64encode(hashlib.sha1(
+            (key + _WEBSOCKET_GUID).encode()).digest()).decode()
+        if headers.get('sec-websocket-accept') != accept:
+            websocket.abort()
+            raise StreamError('Invalid WebSocket handshake')
+        return websocket
+
+    async def _read_response(self):
+        status_line = await self.reader.readline()
+        status = status_line.split(None, 2)
+        if len(status) < 2 or status[1] != b'101':
+            raise StreamError('WebSocket upgrade refused: {!r}'.format(
+                status_line.strip()))
+        headers = {}
+        while True:
+            line = await self.reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                return headers
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+    async def receive(self):
+        """Returns the next text or binary message, or ``None`` once the
+        connection is closed.
+        """
+        fragments = []
+        size = 0
+        while True:
+            fin, opcode, payload = await self._read_frame()
+            if opcode == _OP_PING:
+                self._send_frame(_OP_PONG, payload)
+            elif opcode == _OP_PONG:
+                continue
+            elif opcode == _OP_CLOSE:
+                self._send_frame(_OP_CLOSE, payload[:2])
+                self.abort()
+                return None
+            else:
+                if (opcode == _OP_CONTINUATION) != bool(fragments):
+                    raise StreamError('Unexpected WebSocket frame')
+                size += len(payload)
+                if size > MAX_MESSAGE_SIZE:
+                    raise StreamError('WebSocket message too large')
+                fragments.append(payload)
+                if fin:
+                    return b''.join(fragments)
+
+    async def _read_frame(self):
+        head = await self.reader.readexactly(2)
+        fin = head[0] & 0x80
+        opcode = head[0] & 0x0F
+        masked = head[1] & 0x80
+        length = head[1] & 0x7F
+        if length == 126:
+            length, = struct.unpack('!H', await self.reader.readexactly(2))
+        elif length == 127:
+            length, = struct.unpack('!Q', await self.reader.readexactly(8))
+        if length > MAX_MESSAGE_SIZE:
+            raise StreamError('WebSocket frame too large')
+        mask = await self.reader.readexactly(4) if masked else None
+        payload = await self.reader.readexactly(length)
+        if mask:
+            payload = _apply_mask(payload, mask)
+        return fin, opcode, payload
+
+    def _send_frame(self, opcode, payload):
+        # NOTE: Frames sent by clients must be masked.
+        length = len(payload)
+        if length < 126:
+            head = struct.pack('!BB', 0x80 | opcode, 0x80 | length)
+        elif length < 2 ** 16:
+            head = struct.pack('!BBH', 0x80 | opcode, 0x80 | 126, length)
+        else:
+            head = struct.pack('!BBQ', 0x80 | opcode, 0x80 | 127, length)
+        mask = os.urandom(4)
+        self.writer.write(head + mask + _apply_mask(payload, mask))
+
+    def close(self):
+        if not self.writer.transport.is_closing():
+            self._send_frame(_OP_CLOSE, struct.pack('!H', 1000))
+        self.abort()
+
+    def abort(self):
+        self.writer.close()
+
+
+def _apply_mask(payload, mask):
+    # NOTE: XOR the payload with the repeated mask, as a single integer
+    #       operation rather than byte per byte.
+    length = len(payload)
+    repeated = (mask * (length // 4 + 1))[:length]
+    return (int.from_bytes(payload, 'big') ^
+            int.from_bytes(repeated, 'big')).to_bytes(length, 'big')
+
+
+class _EventIterator:
+
+    def __init__(self, stream, queue):
+        self.stream = stream
+        self.queue = queue
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        event = await self.queue.get()
+        if event is None:
+            raise StopAsyncIteration
+        return event
+
+
+class EventStream:
+    """Consumes the valid transactions stream of a node, reconnecting
+    with exponential backoff when the connection is lost.
+
+    """
+
+    def __init__(self, url, *, asset_ids=None, transaction_ids=None,
+                 backoff_base=0.5, backoff_cap=30, connect_timeout=10):
+        """Initializes a :class:`~bigchaindb_driver.stream.EventStream`
+        instance.
+
+        Args:
+            url (str): The URL of the stream, e.g.
+                ``'ws://localhost:9985/api/v1/streams/valid_transactions'``.
+            asset_ids (:obj:`list` of :obj:`str`): Only dispatch the
+                events of these assets. Defaults to ``None``, meaning all
+                assets.
+            transaction_ids (:obj:`list` of :obj:`str`): Only dispatch the
+                events of these transactions. Defaults to ``None``,
+                meaning all transactions.
+            backoff_base (float): Delay in seconds before the first
+                reconnection attempt, doubled after each failed attempt.
+                Defaults to ``0.5``.
+            backoff_cap (float): Maximum delay in seconds between two
+                reconnection attempts. Defaults to ``30``.
+            connect_timeout (float): Timeout in seconds of a connection
+                attempt. Defaults to ``10``.
+
+        Note:
+            Filters only apply to callbacks and iterators; waiters see
+            all the events.
+
+        """
+        self.url = url
+        self.asset_ids = None if asset_ids is None else set(asset_ids)
+        self.transaction_ids = None if transaction_ids is None \
+            else set(transaction_ids)
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.connect_timeout = connect_timeout
+        self.connected = False
+        self._callbacks = []
+        self._queues = []
+        self._waiters = {}
+        self._lock = threading.Lock()
+        self._closed = False
+        self._loop = None
+        self._task = None
+        self._thread = None
+
+    @classmethod
+    def from_driver(cls, driver, **kwargs):
+        """Creates a stream consuming the first node of ``driver``.
+
+        The URL of the stream is read from the API root of the node,
+        falling back to the default port (``9985``) of the stream.
+
+        Args:
+            driver (:class:`~bigchaindb_driver.BigchainDB`): The driver.
+            **kwargs: Passed to
+                :meth:`~bigchaindb_driver.stream.EventStream.__init__`.
+
+        Returns:
+            :class:`~bigchaindb_driver.stream.EventStream`: The stream.
+
+        """
+        try:
+            url = driver.api_info()['streams']
+        except (BigchaindbException, KeyError, TypeError):
+            hostname = urlsplit(driver.nodes[0]['endpoint']).hostname
+            url = 'ws://{}:9985{}'.format(hostname, VALID_TRANSACTIONS_PATH)
+        return cls(url, **kwargs)
+
+    def subscribe(self, callback):
+        """Registers a function called with each matching
+        :class:`~.Event`, from the thread running the stream.
+
+        Exceptions raised by callbacks are logged and ignored.
+        """
+        self._callbacks.append(callback)
+
+    def events(self):
+        """Returns an asynchronous iterator over the matching events.
+
+        The stream must run in the event loop of the caller, see
+        :meth:`run`. Iteration stops when the stream is closed.
+        """
+        queue = asyncio.Queue()
+        self._queues.append(queue)
+        return _EventIterator(self, queue)
+
+    def __aiter__(self):
+        return self.events()
+
+    def waiter(self, transaction_id):
+        """Returns a :class:`concurrent.futures.Future` resolved with the
+        :class:`~.Event` of ``transaction_id``, once it is committed.
+
+        Waiters must be registered before the transaction is committed,
+        as the stream does not replay past events. Each call returns its
+        own future, so that cancelling it, e.g. by the timeout of
+        :meth:`wait_for`, does not affect the other waiters of the
+        transaction.
+        """
+        future = Future()
+        with self._lock:
+            self._waiters.setdefault(transaction_id, []).append(future)
+        future.add_done_callback(
+            partial(self._discard_waiter, transaction_id))
+        return future
+
+    def _discard_waiter(self, transaction_id, future):
+        if not future.cancelled():
+            return
+        with self._lock:
+            futures = self._waiters.get(transaction_id)
+            if futures is not None and future in futures:
+                futures.remove(future)
+                if not futures:
+                    del self._waiters[transaction_id]
+
+    async def wait_for(self, transaction_id, timeout=None):
+        """Waits until ``transaction_id`` is committed, see
+        :meth:`waiter`.
+
+        Returns:
+            :class:`~.Event`: The event of the transaction.
+
+        Raises:
+            :exc:`asyncio.TimeoutError`: If ``timeout`` expires first.
+
+        """
+        return await asyncio.wait_for(
+            asyncio.wrap_future(self.waiter(transaction_id)), timeout)
+
+    async def run(self):
+        """Consumes the stream until :meth:`close` is called."""
+        self._loop = asyncio.get_event_loop()
+        self._task = asyncio.ensure_future(self._run())
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            if not self._closed:
+                raise
+        finally:
+            for queue in self._queues:
+                queue.put_nowait(None)
+
+    def start(self):
+        """Runs the stream in a background thread, with its own event
+        loop.
+        """
+        if self._thread is None:
+            self._thread = threading.Thread(
+                target=self._run_in_thread, name='bigchaindb-event-stream',
+                daemon=True)
+            self._thread.start()
+
+    def close(self):
+        """Stops the stream. Pending waiters are cancelled."""
+        self._closed = True
+        if self._task is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._task.cancel)
+        if self._thread is not None:
+            self._thread.join()
+        with self._lock:
+            waiters, self._waiters = self._waiters, {}
+        for futures in waiters.values():
+            for future in futures:
+                future.cancel()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _run_in_thread(self):
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        try:
+            loop.run_until_complete(self.run())
+        finally:
+            loop.close()
+
+    async def _run(self):
+        attempts = 0
+        while not self._closed:
+            try:
+                websocket = await _WebSocket.connect(self.url,
+                                                     self.connect_timeout)
+            except (OSError, asyncio.TimeoutError, StreamError) as exc:
+                logger.warning('Cannot connect to %s: %s', self.url, exc)
+            else:
+                attempts = 0
+                self.connected = True
+                try:
+                    await self._consume(websocket)
+                except (OSError, asyncio.IncompleteReadError,
+                        StreamError) as exc:
+                    logger.warning('Lost connection to %s: %s',
+                                   self.url, exc)
+                finally:
+                    self.connected = False
+                    websocket.close()
+            delay = min(self.backoff_cap, self.backoff_base * 2 ** attempts)
+            attempts += 1
+            # NOTE: Jitter spreads the reconnections of many clients.
+            await asyncio.sleep(delay * random.uniform(0.5, 1))
+
+    async def _consume(self, websocket):
+        while not self._closed:
+            message = await websocket.receive()
+            if message is None:
+                return
+            try:
+                data = json.loads(message.decode())
+                event = Event(data['transaction_id'], data.get('asset_id'),
+                              data.get('height'))
+            except (ValueError, KeyError, TypeError):
+                logger.warning('Ignoring malformed event: %r', message)
+                continue
+            self._dispatch(event)
+
+    def _dispatch(self, event):
+        with self._lock:
+            futures = self._waiters.pop(event.transaction_id, ())
+        for future in futures:
+            if future.set_running_or_notify_cancel():
+                future.set_result(event)
+
+        if self.asset_ids is not None and \
+                event.asset_id not in self.asset_ids:
+            return
+        if self.transaction_ids is not None and \
+                event.transaction_id not in self.transaction_ids:
+            return
+        for callback in self._callbacks:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception('Event stream callback failed')
+        for queue in self._queues:
+            queue.put_nowait(event)
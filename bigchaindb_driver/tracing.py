@@ -0,0 +1,202 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Tracing of the stages of a transaction submission.
+
+The driver opens spans around the preparation, the fulfillment, the
+serialization, the hashing and the signing of transactions, and around
+the requests sent to the nodes. They are reported to the global tracer,
+set with :func:`set_tracer`. It defaults to :data:`NOOP_TRACER`, whose
+spans do nothing, so that tracing costs next to nothing when it is off.
+
+:class:`~.SpanAggregator` sums up the time spent per stage::
+
+    aggregator = SpanAggregator()
+    set_tracer(aggregator)
+    ...
+    print(aggregator.report())
+
+Other backends, e.g. OpenTelemetry, can be plugged in by subclassing
+:class:`~.AbstractTracer`.
+
+"""
+import threading
+from abc import ABCMeta, abstractmethod
+from time import perf_counter
+
+
+class AbstractTracer(metaclass=ABCMeta):
+    """Abstract class for tracers.
+
+    Attributes:
+        enabled (bool): Whether the spans are recorded.
+
+    """
+
+    enabled = True
+
+    @abstractmethod
+    def span(self, name):
+        """Opens a span.
+
+        Args:
+            name (str): The name of the stage, e.g.
+                ``'transaction.sign'``.
+
+        Returns:
+            A context manager delimiting the span.
+
+        """
+        pass    # pragma: no cover
+
+
+class _NoopSpan:
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class NoopTracer(AbstractTracer):
+    """Tracer discarding all the spans."""
+
+    enabled = False
+
+    def span(self, name):
+        return _NOOP_SPAN
+
+
+NOOP_TRACER = NoopTracer()
+
+_tracer = NOOP_TRACER
+
+
+def set_tracer(tracer):
+    """Sets the global tracer.
+
+    Args:
+        tracer (:class:`~.AbstractTracer`): The tracer, or ``None`` to
+            turn tracing off.
+
+    Returns:
+        :class:`~.AbstractTracer`: The previous tracer.
+
+    """
+    global _tracer
+    previous = _tracer
+    _tracer = NOOP_TRACER if tracer is None else tracer
+    return previous
+
+
+def get_tracer():
+    """Returns the global tracer."""
+    return _tracer
+
+
+def span(name):
+    """Opens a span with the global tracer. See
+    :meth:`AbstractTracer.span`.
+    """
+    return _tracer.span(name)
+
+
+class _Span:
+
+    __slots__ = ('aggregator', 'name', 'start', 'children')
+
+    def __init__(self, aggregator, name):
+        self.aggregator = aggregator
+        self.name = name
+        self.children = 0.0
+
+    def __enter__(self):
+        self.aggregator._stack().append(self)
+        self.start = perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        duration = perf_counter() - self.start
+        stack = self.aggregator._stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += duration
+        self.aggregator._record(self.name, duration,
+                                duration - self.children)
+        return False
+
+
+class SpanAggregator(AbstractTracer):
+    """Tracer summing up the number of spans, their total time and their
+    self time, i.e. the time not spent in nested spans, per stage.
+
+    The self times of all the stages add up to the total time of the
+    outermost spans, so they break down where the time went.
+
+    """
+
+    def __init__(self):
+        self._stats = {}
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def span(self, name):
+        return _Span(self, name)
+
+    @property
+    def stats(self):
+        """dict: Mapping between the stage names and their ``(count,
+        total, self)`` times, in seconds.
+        """
+        with self._lock:
+            return {name: tuple(stat) for name, stat in self._stats.items()}
+
+    def reset(self):
+        """Forgets the recorded spans."""
+        with self._lock:
+            self._stats.clear()
+
+    def report(self):
+        """Formats the per-stage time breakdown, the stages taking the
+        most self time first.
+
+        Returns:
+            str: The breakdown.
+
+        """
+        stats = sorted(self.stats.items(), key=lambda item: -item[1][2])
+        overall = sum(stat[2] for _, stat in stats) or 1
+        width = max([len(name) for name, _ in stats] + [len('stage')])
+        lines = ['{:<{width}} {:>8} {:>11} {:>10} {:>10} {:>6}'.format(
+            'stage', 'calls', 'total (ms)', 'mean (ms)', 'self (ms)',
+            'self %', width=width)]
+        for name, (count, total, self_time) in stats:
+            lines.append(
+                '{:<{width}} {:>8} {:>11.3f} {:>10.3f} {:>10.3f} {:>6.1f}'
+                .format(name, count, total * 1000, total * 1000 / count,
+                        self_time * 1000, self_time * 100 / overall,
+                        width=width))
+        return '\n'.join(lines)
+
+    def _stack(self):
+        try:
+            return self._local.stack
+        except AttributeError:
+            stack = self._local.stack = []
+            return stack
+
+    def _record(self, name, duration, self_time):
+        with self._lock:
+            stat = self._stats.get(name)
+            if stat is None:
+                stat = self._stats[name] = [0, 0.0, 0.0]
+            stat[0] += 1
+            stat[1] += duration
+            stat[2] += self_time
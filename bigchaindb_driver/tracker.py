@@ -0,0 +1,294 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Tracking of the commit of transactions sent with the modes ``async``
+or ``sync``, without blocking the sender.
+
+Each call to :meth:`~.CommitTracker.track` gets its own
+:class:`concurrent.futures.Future`, resolved with the height of the
+block holding the transaction, or failed with a
+:exc:`~.exceptions.CommitTimeoutError`. Pending
+transactions are polled in rounds: at most ``batch_size`` lookups per
+round, spread over a few threads (and thus over the nodes of the
+driver's pool), and at most ``max_rate`` requests per second. When a
+transaction is found, its block is retrieved once, which resolves all
+the other pending transactions it holds.
+
+"""
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import partial
+from time import monotonic, sleep
+
+from .exceptions import BigchaindbException, CommitTimeoutError
+
+
+DEFAULT_COMMIT_TIMEOUT = 60  # seconds
+
+
+class _RateLimiter:
+    """Token bucket allowing ``rate`` acquisitions per second, with bursts
+    of up to ``rate`` acquisitions.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = monotonic()
+                self._tokens = min(
+                    self.rate,
+                    self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            sleep(delay)
+
+
+def _chain(future, source):
+    if source.cancelled():
+        future.cancel()
+    elif future.set_running_or_notify_cancel():
+        if source.exception() is not None:
+            future.set_exception(source.exception())
+        else:
+            future.set_result(source.result())
+
+
+class _Pending:
+
+    __slots__ = ('future', 'callers', 'deadline', 'next_poll')
+
+    def __init__(self, future, deadline):
+        self.future = future
+        self.callers = []
+        self.deadline = deadline
+        self.next_poll = 0
+
+    @property
+    def abandoned(self):
+        # NOTE: Callers cancel their own futures only, e.g. on the timeout
+        #       of asyncio.wait_for, so the lookups go on for the others.
+        return all(caller.cancelled() for caller in self.callers)
+
+
+class CommitTracker:
+    """Resolves a future per tracked transaction once it is committed.
+
+    Trackers can be used as context managers, which closes them on
+    exit.
+
+    """
+
+    def __init__(self, driver, *, timeout=DEFAULT_COMMIT_TIMEOUT,
+                 poll_interval=0.5, batch_size=100, max_rate=50, workers=4,
+                 background=True):
+        """Initializes a :class:`~bigchaindb_driver.tracker.CommitTracker`
+        instance.
+
+        Args:
+            driver (:class:`~bigchaindb_driver.BigchainDB`): The driver
+                to poll the nodes with.
+            timeout (float): Default number of seconds after which a
+                tracked transaction that is still not committed fails
+                with a :exc:`~.exceptions.CommitTimeoutError`. Defaults
+                to :data:`DEFAULT_COMMIT_TIMEOUT`.
+            poll_interval (float): Minimum number of seconds between two
+                lookups of the same transaction. Defaults to ``0.5``.
+            batch_size (int): Maximum number of transactions looked up
+                per polling round. Defaults to ``100``.
+            max_rate (float): Maximum number of requests per second.
+                Defaults to ``50``.
+            workers (int): Number of threads sending the requests of a
+                round. Defaults to ``4``.
+            background (bool): Whether to poll in a background thread,
+                started by the first call to :meth:`track`. If
+                ``False``, :meth:`poll` must be called by the caller.
+                Defaults to ``True``.
+
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self.background = background
+        self._rate_limiter = _RateLimiter(max_rate)
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._pending = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = False
+        self._thread = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def pending(self):
+        """int: Number of tracked transactions not resolved yet."""
+        return len(self._pending)
+
+    def track(self, transaction, timeout=None):
+        """Tracks the commit of a transaction.
+
+        Each call returns its own future, so that cancelling it, e.g.
+        on the timeout of :func:`asyncio.wait_for`, leaves the futures
+        of the other callers tracking the same transaction untouched.
+
+        Args:
+            transaction (:obj:`dict` | :obj:`str`): The transaction, as
+                returned by
+                :meth:`~.TransactionsEndpoint.send_async`, or its id.
+            timeout (float): Number of seconds to wait for the commit.
+                Defaults to the timeout of the tracker.
+
+        Returns:
+            :class:`concurrent.futures.Future`: A future resolved with
+            the height of the block holding the transaction.
+
+        Raises:
+            :exc:`~.exceptions.BigchaindbException`: If the tracker is
+                closed.
+
+        """
+        txid = transaction if isinstance(transaction, str) \
+            else transaction['id']
+        timeout = self.timeout if timeout is None else timeout
+        with self._lock:
+            if self._closed:
+                raise BigchaindbException('The commit tracker is closed')
+            pending = self._pending.get(txid)
+            if pending is None or pending.future.done() or \
+                    pending.abandoned:
+                pending = _Pending(Future(), monotonic() + timeout)
+                self._pending[txid] = pending
+            future = Future()
+            pending.callers.append(future)
+            if self.background and self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._run, name='bigchaindb-commit-tracker',
+                    daemon=True)
+                self._thread.start()
+        pending.future.add_done_callback(partial(_chain, future))
+        self._wakeup.set()
+        return future
+
+    def track_async(self, transaction, timeout=None, loop=None):
+        """Same as :meth:`track`, but returns an :class:`asyncio.Future`
+        bound to ``loop``, or to the current event loop.
+        """
+        return asyncio.wrap_future(self.track(transaction, timeout),
+                                   loop=loop)
+
+    def poll(self):
+        """Runs a single polling round.
+
+        Returns:
+            int: The number of transactions resolved during the round,
+            either committed or timed out.
+
+        """
+        now = monotonic()
+        with self._lock:
+            expired = [(txid, pending)
+                       for txid, pending in self._pending.items()
+                       if pending.abandoned or pending.deadline <= now]
+            for txid, _ in expired:
+                del self._pending[txid]
+            due = sorted(
+                (pending.next_poll, txid)
+                for txid, pending in self._pending.items()
+                if pending.next_poll <= now
+            )[:self.batch_size]
+            for _, txid in due:
+                self._pending[txid].next_poll = now + self.poll_interval
+
+        resolved = 0
+        for txid, pending in expired:
+            if pending.abandoned or \
+                    not pending.future.set_running_or_notify_cancel():
+                pending.future.cancel()
+                continue
+            pending.future.set_exception(CommitTimeoutError(
+                'Transaction {} was not committed in time'.format(txid),
+                txid))
+            resolved += 1
+
+        lookups = [(txid, self._executor.submit(self._lookup, txid))
+                   for _, txid in due]
+        heights = set()
+        for txid, lookup in lookups:
+            height = lookup.result()
+            if height is not None:
+                resolved += self._resolve(txid, height)
+                heights.add(height)
+
+        # NOTE: Transactions are often committed together, so a single
+        #       block retrieval may resolve many pending transactions.
+        if self._pending:
+            blocks = self._executor.map(self._retrieve_block, heights)
+            for block in blocks:
+                if block is None:
+                    continue
+                for transaction in block.get('transactions', ()):
+                    resolved += self._resolve(transaction['id'],
+                                              block['height'])
+        return resolved
+
+    def close(self):
+        """Stops polling. Pending futures are cancelled."""
+        with self._lock:
+            self._closed = True
+            pending, self._pending = self._pending, {}
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+        self._executor.shutdown()
+        for entry in pending.values():
+            entry.future.cancel()
+
+    def _run(self):
+        while not self._closed:
+            self.poll()
+            if not self._pending:
+                self._wakeup.wait()
+                self._wakeup.clear()
+            else:
+                sleep(min(self.poll_interval, 0.1))
+
+    def _lookup(self, txid):
+        self._rate_limiter.acquire()
+        try:
+            return self.driver.blocks.get(txid=txid)
+        # NOTE: Failed lookups are retried at the next round.
+        except BigchaindbException:
+            return None
+
+    def _retrieve_block(self, height):
+        self._rate_limiter.acquire()
+        try:
+            return self.driver.blocks.retrieve(str(height))
+        except BigchaindbException:
+            return None
+
+    def _resolve(self, txid, height):
+        with self._lock:
+            pending = self._pending.pop(txid, None)
+        if pending is None:
+            return 0
+        if not pending.future.set_running_or_notify_cancel():
+            return 0
+        pending.future.set_result(height)
+        return 1
@@ -2,13 +2,21 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
-from time import time
+import os
+from time import monotonic, sleep
 
 from requests.exceptions import ConnectionError
 
 from .connection import Connection
-from .exceptions import TimeoutError
+from .exceptions import (
+    GatewayTimeout,
+    ServiceUnavailable,
+    TimeoutError,
+    TransportError,
+)
+from .metrics import NOOP_METRICS, endpoint_label
 from .pool import Pool
+from .tracing import span
 
 
 NO_TIMEOUT_BACKOFF_CAP = 10  # seconds
@@ -17,9 +25,23 @@ NO_TIMEOUT_BACKOFF_CAP = 10  # seconds
 class Transport:
     """Transport class.
 
+    The connections are not shared with child processes: the first
+    request made in a forked process replaces the connections, as well as
+    the limiters, with fresh ones, so that its sockets and backoff state
+    are its own. To share the backoff state of the nodes between worker
+    processes, give a :class:`~bigchaindb_driver.pool.SharedBackoff`.
+
+    Attributes:
+        connection_class: The class of the connections to the nodes.
+            Defaults to :class:`~bigchaindb_driver.connection.Connection`.
+
     """
 
-    def __init__(self, *nodes, timeout=None):
+    connection_class = Connection
+
+    def __init__(self, *nodes, timeout=None, limiter_class=None,
+                 limited_methods=('POST',), retry_policy=None,
+                 metrics=NOOP_METRICS, shared_backoff=None):
         """Initializes an instance of
         :class:`~bigchaindb_driver.transport.Transport`.
 
@@ -27,16 +49,74 @@ class Transport:
             nodes: each node is a dictionary with the keys `endpoint` and
                    `headers`
             timeout (int): Optional timeout in seconds.
+            limiter_class: Optional class of the concurrency limiters,
+                e.g. :class:`~bigchaindb_driver.limiter.AIMDLimiter`,
+                instantiated once per node. Defaults to ``None``,
+                meaning no limit.
+            limited_methods (:obj:`tuple` of :obj:`str`): HTTP methods
+                of the requests subject to the limiters. Defaults to
+                ``('POST',)``, i.e. writes.
+            retry_policy (:class:`~bigchaindb_driver.retry.RetryPolicy`):
+                Optional policy deciding which HTTP errors are retried.
+                Defaults to ``None``, meaning that HTTP errors are
+                raised.
+            metrics (:class:`~bigchaindb_driver.metrics.AbstractMetrics`):
+                Optional metrics sink, shared with the connections.
+                Defaults to
+                :data:`~bigchaindb_driver.metrics.NOOP_METRICS`.
+            shared_backoff (:class:`~bigchaindb_driver.pool.SharedBackoff`):
+                Optional backoff state shared with other processes, with
+                one entry per node. Defaults to ``None``, meaning that
+                the backoff state is local.
 
         """
+        if shared_backoff is not None and len(shared_backoff) != len(nodes):
+            raise ValueError('shared_backoff has {} entries for {} nodes'
+                             .format(len(shared_backoff), len(nodes)))
         self.nodes = nodes
         self.timeout = timeout
-        self.connection_pool = Pool([Connection(node_url=node['endpoint'],
-                                                headers=node['headers'])
-                                     for node in nodes])
+        self.limiter_class = limiter_class
+        self.limited_methods = frozenset(limited_methods)
+        self.retry_policy = retry_policy
+        self.metrics = metrics
+        self.shared_backoff = shared_backoff
+        self._connect()
+
+    @property
+    def connection_pool(self):
+        """The :class:`~bigchaindb_driver.pool.Pool` of connections of
+        the current process.
+        """
+        if self._pid != os.getpid():
+            self._connect()
+        return self._connection_pool
+
+    @property
+    def limiters(self):
+        """The limiters of the connections of the current process, if
+        any.
+        """
+        if self._pid != os.getpid():
+            self._connect()
+        return self._limiters
+
+    def _connect(self):
+        # NOTE: The connections of the parent process are dropped rather
+        #       than closed, as their sockets are still in use there.
+        self._pid = os.getpid()
+        self._connection_pool = Pool([
+            self.connection_class(node_url=node['endpoint'],
+                                  headers=node['headers'],
+                                  metrics=self.metrics)
+            for node in self.nodes])
+        self._limiters = {
+            connection: self.limiter_class()
+            for connection in self._connection_pool.connections
+        } if self.limiter_class is not None else {}
 
     def forward_request(self, method, path=None,
-                        json=None, params=None, headers=None):
+                        json=None, params=None, headers=None, timeout=None,
+                        deadline=None, decode=True):
         """Makes HTTP requests to the configured nodes.
 
            Retries connection errors
@@ -49,7 +129,18 @@ class Transport:
            Backoff delays are expressed as timestamps stored on the object and
            they are not reset in between multiple function calls.
 
-           Times out when `self.timeout` is expired, if not `None`.
+           Times out when `self.timeout` is expired, if not `None`. The
+           timeout can be overridden per call with `timeout`, and capped
+           with `deadline`. Time is measured with a monotonic clock, so
+           that changes of the system clock do not affect timeouts.
+
+           If the transport has a retry policy, the HTTP errors it deems
+           retryable are retried as well. The node that failed is put in
+           backoff, so that the request fails over to another node.
+
+           If the transport has limiters, requests with a limited method
+           first wait for a free slot on their node, and report whether
+           the node was overloaded (503 or 504 status) once done.
 
         Args:
             method (str): HTTP method name (e.g.: ``'GET'``).
@@ -58,37 +149,145 @@ class Transport:
             json (dict): Payload to be sent with the HTTP request.
             params (dict)): Dictionary of URL (query) parameters.
             headers (dict): Optional headers to pass to the request.
+            timeout (float): Optional timeout in seconds, overriding the
+                timeout of the transport.
+            deadline (float): Optional point in time, as given by
+                :func:`time.monotonic`, after which the request times
+                out.
+            decode (bool): Whether to decode the JSON body of a
+                successful response. Defaults to ``True``.
 
         Returns:
-            dict: Result of :meth:`requests.models.Response.json`
+            dict: Result of :meth:`requests.models.Response.json`, or
+            the body as a :obj:`str` if ``decode`` is ``False``.
 
         """
+        with span('transport.forward_request'):
+            if not self.metrics.enabled:
+                return self._forward_request(method, path, json, params,
+                                             headers, timeout, deadline,
+                                             decode)
+            start = monotonic()
+            outcome = 'error'
+            try:
+                data = self._forward_request(method, path, json, params,
+                                             headers, timeout, deadline,
+                                             decode)
+                outcome = 'success'
+                return data
+            finally:
+                self.metrics.observe(
+                    'bigchaindb_driver_forward_duration_seconds',
+                    monotonic() - start, method=method,
+                    endpoint=endpoint_label(path), outcome=outcome)
+
+    def _forward_request(self, method, path, json, params, headers, timeout,
+                         deadline, decode=True):
         error_trace = []
-        timeout = self.timeout
+        if timeout is None:
+            timeout = self.timeout
+        if deadline is not None:
+            remaining = deadline - monotonic()
+            timeout = remaining if timeout is None \
+                else min(timeout, remaining)
         backoff_cap = NO_TIMEOUT_BACKOFF_CAP if timeout is None \
             else timeout / 2
+        retry_policy = self.retry_policy
+        retries = 0
+        if retry_policy is not None:
+            retry_policy.on_request()
+        connection_pool = self.connection_pool
+        connections = connection_pool.connections
+        shared_backoff = self.shared_backoff
         while timeout is None or timeout > 0:
-            connection = self.connection_pool.get_connection()
+            if shared_backoff is not None:
+                shared_backoff.load(connections)
+            connection = connection_pool.get_connection()
 
-            start = time()
+            start = monotonic()
+            limiter = self._limiters.get(connection) \
+                if method in self.limited_methods else None
+            token = None
+            if limiter is not None:
+                token = limiter.acquire(timeout)
+                if token is None:
+                    break
             try:
-                response = connection.request(
-                    method=method,
-                    path=path,
-                    params=params,
-                    json=json,
-                    headers=headers,
-                    timeout=timeout,
-                    backoff_cap=backoff_cap,
-                )
+                with span('connection.request'):
+                    response = self._request(
+                        connection,
+                        limiter,
+                        token,
+                        method=method,
+                        path=path,
+                        params=params,
+                        json=json,
+                        headers=headers,
+                        timeout=timeout,
+                        backoff_cap=backoff_cap,
+                        decode=decode,
+                    )
             except ConnectionError as err:
                 error_trace.append(err)
+                if retry_policy is not None:
+                    retry_policy.on_connection_error()
+                if self.metrics.enabled:
+                    self.metrics.inc('bigchaindb_driver_retries_total',
+                                     reason='connection_error')
+                continue
+            except TransportError as err:
+                if retry_policy is None or \
+                        not retry_policy.should_retry(method, err, retries):
+                    raise
+                error_trace.append(err)
+                if self.metrics.enabled:
+                    self.metrics.inc(
+                        'bigchaindb_driver_retries_total',
+                        reason=retry_policy.reason(method, err))
+                # NOTE: `Connection.request` has reset the failure count of
+                #       the node on the HTTP response, so the delay grows
+                #       with the retries of the request instead.
+                connection.update_backoff_time(success=False,
+                                               backoff_cap=backoff_cap,
+                                               retries=retries)
+                retries += 1
                 continue
             else:
                 return response.data
             finally:
-                elapsed = time() - start
+                if shared_backoff is not None:
+                    shared_backoff.store(connections.index(connection),
+                                         connection)
+                elapsed = monotonic() - start
                 if timeout is not None:
                     timeout -= elapsed
 
         raise TimeoutError(error_trace)
+
+    def _request(self, connection, limiter, token, **kwargs):
+        if limiter is None:
+            return connection.request(**kwargs)
+        success = overloaded = False
+        try:
+            # NOTE: Waits for the backoff of the node here rather than in
+            #       `Connection.request`, so that the latency measured by
+            #       the limiter starts once the request is sent.
+            backoff_timedelta = connection.get_backoff_timedelta()
+            timeout = kwargs['timeout']
+            if backoff_timedelta > 0 and (
+                    timeout is None or timeout >= backoff_timedelta):
+                sleep(backoff_timedelta)
+                if timeout is not None:
+                    kwargs['timeout'] = timeout - backoff_timedelta
+            token = limiter.start(token)
+            response = connection.request(**kwargs)
+            success = True
+            return response
+        except (ServiceUnavailable, GatewayTimeout):
+            overloaded = True
+            raise
+        finally:
+            limiter.release(token, success=success, overloaded=overloaded)
+            if self.metrics.enabled and limiter.limit is not None:
+                self.metrics.set('bigchaindb_driver_concurrency_limit',
+                                 limiter.limit, node=connection.node_url)
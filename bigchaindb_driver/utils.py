@@ -96,3 +96,20 @@ def normalize_nodes(*nodes, headers=None):
     for node in nodes:
         normalized_nodes += (normalize_node(node, headers),)
     return normalized_nodes
+
+
+def get_asset_id(transaction):
+    """Returns the id of the asset of the given transaction, i.e. its own
+    id for a ``'CREATE'`` transaction, and the id of the asset it
+    transfers otherwise.
+
+    Args:
+        transaction (dict): The transaction.
+
+    Returns:
+        str: The id of the asset.
+
+    """
+    if transaction['operation'] == 'CREATE':
+        return transaction['id']
+    return transaction['asset']['id']
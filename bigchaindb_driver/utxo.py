@@ -0,0 +1,350 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Client-side index of unspent transaction outputs (UTXOs).
+
+The index is fed with the transactions the driver sends and reads, and
+answers "which outputs can this key spend?" without a round trip to a
+node. As transactions sent with the modes ``async`` or ``sync`` are
+indexed before they are committed, the index is optimistic:
+:meth:`~.AbstractUTXOIndex.reconcile` brings it back in line with what
+a node reports.
+
+"""
+import json
+import sqlite3
+import threading
+from abc import ABCMeta, abstractmethod
+from collections import defaultdict, namedtuple
+
+from .common.transaction import Transaction
+
+
+IndexedOutput = namedtuple(
+    'IndexedOutput', (
+        'transaction_id',
+        'output_index',
+        'amount',
+        'asset_id',
+        'condition_uri',
+        'public_keys',
+    )
+)
+
+Reconciliation = namedtuple('Reconciliation', ('added', 'removed'))
+
+
+class AbstractUTXOIndex(metaclass=ABCMeta):
+    """Abstract class for UTXO indexes.
+
+    Subclasses only implement the storage primitives; the derivation of
+    outputs and spent links from transactions is shared.
+
+    """
+
+    def add_transaction(self, transaction):
+        """Indexes the outputs of the given transaction, and marks the
+        outputs it spends as spent.
+
+        Adding the same transaction more than once is harmless, and
+        transactions may be added in any order.
+
+        Args:
+            transaction (:obj:`dict` |
+                :class:`~bigchaindb_driver.common.transaction.Transaction`):
+                A signed transaction.
+
+        """
+        self._index_transaction(transaction)
+
+    def _index_transaction(self, transaction):
+        if not isinstance(transaction, Transaction):
+            transaction = Transaction.from_dict(transaction)
+
+        for link in transaction.spent_outputs:
+            self._mark_spent((link['transaction_id'], link['output_index']))
+
+        unspent_outputs = zip(transaction.unspent_outputs,
+                              transaction.outputs)
+        for unspent_output, output in unspent_outputs:
+            self._add_output(IndexedOutput(
+                *unspent_output,
+                public_keys=tuple(output.public_keys or ()),
+            ))
+
+    @abstractmethod
+    def unspent(self, public_key=None, asset_id=None):
+        """Returns the indexed outputs that are not spent by any indexed
+        transaction.
+
+        Args:
+            public_key (str): Only return outputs locked with this key.
+                Defaults to ``None``.
+            asset_id (str): Only return outputs of this asset. Defaults
+                to ``None``.
+
+        Returns:
+            :obj:`list` of :class:`~.IndexedOutput`: The matching
+            unspent outputs.
+
+        """
+        pass    # pragma: no cover
+
+    def reconcile(self, driver, public_key):
+        """Reconciles the unspent outputs of ``public_key`` with those
+        reported by a node.
+
+        Outputs unknown to the index are fetched (with
+        :meth:`~.TransactionsEndpoint.retrieve_many`) and indexed, while
+        indexed outputs the node does not report as unspent are dropped.
+        The node is queried first, and the index is only updated once
+        all the transactions are fetched, at once.
+
+        Args:
+            driver (:class:`~bigchaindb_driver.BigchainDB`): The driver
+                to query the node with.
+            public_key (str): The public key to reconcile.
+
+        Returns:
+            :class:`~.Reconciliation`: The ``(transaction_id,
+            output_index)`` links that were ``added`` to, and
+            ``removed`` from the unspent outputs of ``public_key``.
+
+        Raises:
+            :exc:`~.exceptions.BigchaindbException`: If a transaction
+                cannot be fetched, in which case the index is left as
+                is.
+
+        """
+        remote = {(output['transaction_id'], output['output_index'])
+                  for output in driver.outputs.get(public_key, spent=False)}
+        local = {(output.transaction_id, output.output_index)
+                 for output in self.unspent(public_key=public_key)}
+        added = remote - local
+        removed = local - remote
+
+        # NOTE: Not indexed by the driver, as the outputs must be marked
+        #       unspent before their transactions are indexed.
+        transactions = driver.transactions.retrieve_many(
+            sorted({txid for txid, _ in added}), index=False)
+        for transaction in transactions.values():
+            if isinstance(transaction, Exception):
+                raise transaction
+
+        self._apply(added, transactions.values(), removed)
+        return Reconciliation(added=added, removed=removed)
+
+    def _apply(self, added, transactions, removed):
+        for link in added:
+            self._unmark_spent(link)
+        for transaction in transactions:
+            self._index_transaction(transaction)
+        for link in removed:
+            self._discard(link)
+
+    @abstractmethod
+    def _add_output(self, output):
+        pass    # pragma: no cover
+
+    @abstractmethod
+    def _mark_spent(self, link):
+        pass    # pragma: no cover
+
+    @abstractmethod
+    def _unmark_spent(self, link):
+        pass    # pragma: no cover
+
+    @abstractmethod
+    def _discard(self, link):
+        pass    # pragma: no cover
+
+
+class UTXOIndex(AbstractUTXOIndex):
+    """In-memory UTXO index.
+
+    Spent outputs are dropped, and only the ``(transaction_id,
+    output_index)`` links they had are kept, so that an output added
+    after the transaction spending it is not indexed.
+
+    """
+
+    def __init__(self):
+        """Initializes an empty :class:`~bigchaindb_driver.utxo.UTXOIndex`.
+        """
+        self._outputs = {}
+        self._spent = set()
+        self._by_public_key = defaultdict(set)
+        self._by_asset_id = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def add_transaction(self, transaction):
+        with self._lock:
+            super().add_transaction(transaction)
+
+    def unspent(self, public_key=None, asset_id=None):
+        with self._lock:
+            if public_key is not None:
+                links = self._by_public_key.get(public_key, set())
+                if asset_id is not None:
+                    links = links & self._by_asset_id.get(asset_id, set())
+            elif asset_id is not None:
+                links = self._by_asset_id.get(asset_id, set())
+            else:
+                links = self._outputs.keys()
+            return [self._outputs[link] for link in links]
+
+    def _apply(self, added, transactions, removed):
+        with self._lock:
+            super()._apply(added, transactions, removed)
+
+    def _add_output(self, output):
+        link = (output.transaction_id, output.output_index)
+        if link in self._spent:
+            return
+        self._outputs[link] = output
+        for public_key in output.public_keys:
+            self._by_public_key[public_key].add(link)
+        self._by_asset_id[output.asset_id].add(link)
+
+    def _mark_spent(self, link):
+        self._spent.add(link)
+        self._discard(link)
+
+    def _unmark_spent(self, link):
+        self._spent.discard(link)
+
+    def _discard(self, link):
+        output = self._outputs.pop(link, None)
+        if output is None:
+            return
+        for public_key in output.public_keys:
+            self._discard_link(self._by_public_key, public_key, link)
+        self._discard_link(self._by_asset_id, output.asset_id, link)
+
+    @staticmethod
+    def _discard_link(links_by_key, key, link):
+        links = links_by_key[key]
+        links.discard(link)
+        if not links:
+            del links_by_key[key]
+
+
+class SqliteUTXOIndex(AbstractUTXOIndex):
+    """UTXO index persisted in a SQLite database, for sets that do not
+    fit in memory or must survive a restart.
+
+    As in :class:`~.UTXOIndex`, spent outputs are deleted, and only
+    their links are kept.
+
+    """
+
+    SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS outputs ('
+        ' transaction_id TEXT NOT NULL,'
+        ' output_index INTEGER NOT NULL,'
+        ' amount INTEGER NOT NULL,'
+        ' asset_id TEXT NOT NULL,'
+        ' condition_uri TEXT NOT NULL,'
+        ' public_keys TEXT NOT NULL,'
+        ' PRIMARY KEY (transaction_id, output_index))',
+        'CREATE INDEX IF NOT EXISTS outputs_asset_id ON outputs (asset_id)',
+        'CREATE TABLE IF NOT EXISTS owners ('
+        ' public_key TEXT NOT NULL,'
+        ' transaction_id TEXT NOT NULL,'
+        ' output_index INTEGER NOT NULL,'
+        ' PRIMARY KEY (public_key, transaction_id, output_index))',
+        'CREATE TABLE IF NOT EXISTS spent ('
+        ' transaction_id TEXT NOT NULL,'
+        ' output_index INTEGER NOT NULL,'
+        ' PRIMARY KEY (transaction_id, output_index))',
+    )
+
+    def __init__(self, path=':memory:'):
+        """Initializes a :class:`~bigchaindb_driver.utxo.SqliteUTXOIndex`
+        instance.
+
+        Args:
+            path (str): Path of the SQLite database file. Defaults to
+                ``':memory:'``.
+
+        """
+        self.path = path
+        # NOTE: The connection is shared between threads, and guarded by
+        #       the lock.
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._db:
+            for statement in self.SCHEMA:
+                self._db.execute(statement)
+
+    def add_transaction(self, transaction):
+        # NOTE: Commit once per transaction rather than once per output.
+        with self._lock, self._db:
+            super().add_transaction(transaction)
+
+    def unspent(self, public_key=None, asset_id=None):
+        query = ('SELECT o.transaction_id, o.output_index, o.amount,'
+                 ' o.asset_id, o.condition_uri, o.public_keys'
+                 ' FROM outputs o')
+        # NOTE: Spent outputs are deleted, but may remain in databases
+        #       written by earlier versions.
+        clauses = ['NOT EXISTS (SELECT 1 FROM spent s'
+                   ' WHERE s.transaction_id = o.transaction_id'
+                   ' AND s.output_index = o.output_index)']
+        params = []
+        if public_key is not None:
+            query += (' JOIN owners k'
+                      ' ON k.transaction_id = o.transaction_id'
+                      ' AND k.output_index = o.output_index')
+            clauses.append('k.public_key = ?')
+            params.append(public_key)
+        if asset_id is not None:
+            clauses.append('o.asset_id = ?')
+            params.append(asset_id)
+        query += ' WHERE ' + ' AND '.join(clauses)
+        with self._lock:
+            rows = self._db.execute(query, params).fetchall()
+        return [IndexedOutput(*row[:5], public_keys=tuple(json.loads(row[5])))
+                for row in rows]
+
+    def _apply(self, added, transactions, removed):
+        # NOTE: A single database transaction, committed once all the
+        #       changes are made.
+        with self._lock, self._db:
+            super()._apply(added, transactions, removed)
+
+    def close(self):
+        """Closes the underlying database connection."""
+        with self._lock:
+            self._db.close()
+
+    def _add_output(self, output):
+        link = (output.transaction_id, output.output_index)
+        if self._db.execute('SELECT 1 FROM spent WHERE transaction_id = ?'
+                            ' AND output_index = ?', link).fetchone():
+            return
+        self._db.execute(
+            'INSERT OR REPLACE INTO outputs VALUES (?, ?, ?, ?, ?, ?)',
+            (output.transaction_id, output.output_index, output.amount,
+             output.asset_id, output.condition_uri,
+             json.dumps(output.public_keys)),
+        )
+        self._db.executemany(
+            'INSERT OR IGNORE INTO owners VALUES (?, ?, ?)',
+            ((public_key, output.transaction_id, output.output_index)
+             for public_key in output.public_keys),
+        )
+
+    def _mark_spent(self, link):
+        self._db.execute('INSERT OR IGNORE INTO spent VALUES (?, ?)', link)
+        self._discard(link)
+
+    def _unmark_spent(self, link):
+        self._db.execute('DELETE FROM spent WHERE transaction_id = ?'
+                         ' AND output_index = ?', link)
+
+    def _discard(self, link):
+        for table in ('outputs', 'owners'):
+            self._db.execute('DELETE FROM {} WHERE transaction_id = ?'
+                             ' AND output_index = ?'.format(table), link)
@@ -0,0 +1,311 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+"""Offline verification of signed transactions, e.g. to screen large
+batches received from third parties before submitting them.
+
+A transaction is verified against the transaction schema, its id is
+checked against the hash of its body, the keys of its asset and
+metadata are checked with :func:`~.validate_keys`, and its
+fulfillments are validated against the outputs they spend.
+
+"""
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+from .common.exceptions import ValidationError
+from .common.transaction import Output, Transaction
+from .exceptions import InvalidKeysError
+from .schema import validate_transaction
+
+
+Verdict = namedtuple('Verdict', ('transaction_id', 'valid', 'reason'))
+
+KeyViolation = namedtuple('KeyViolation', ('path', 'reason'))
+
+# NOTE: Same rule as `common.utils.validate_key`, i.e. MongoDB's
+#       restrictions on field names.
+INVALID_KEY_PATTERN = re.compile(r'^[$]|\.|\x00')
+
+_CONTAINERS = (dict, list)
+
+DEFAULT_CHUNK_SIZE = 256
+
+
+def verify_transaction(transaction, spent_outputs=None):
+    """Verifies a single signed transaction.
+
+    Args:
+        transaction (dict): The signed transaction to verify.
+        spent_outputs (:obj:`list` of :obj:`dict`): For ``'TRANSFER'``
+            transactions, the output spent by each input, in the order
+            of the inputs. ``None`` stands for an output that could not
+            be found. Ignored for ``'CREATE'`` transactions.
+
+    Returns:
+        :class:`~.Verdict`: The verdict, whose ``reason`` describes the
+        first failed check, if any.
+
+    """
+    txid = transaction.get('id') if isinstance(transaction, dict) else None
+    try:
+        _verify(transaction, spent_outputs)
+    # NOTE: Malformed payloads can fail in many ways (e.g. with a
+    #       `KeyError`, or an ASN.1 decoding error), all of which mean
+    #       that the transaction is invalid.
+    except Exception as exc:
+        return Verdict(txid, False, '{}: {}'.format(type(exc).__name__, exc))
+    return Verdict(txid, True, None)
+
+
+def _verify(transaction, spent_outputs):
+    validate_transaction(transaction)
+    Transaction.validate_id(transaction)
+
+    asset_data = transaction['asset'].get('data')
+    if asset_data:
+        validate_keys('asset', asset_data)
+    if transaction['metadata']:
+        validate_keys('metadata', transaction['metadata'])
+
+    transaction_obj = Transaction.from_dict(transaction)
+    if transaction_obj.operation == Transaction.TRANSFER:
+        missing = [input_['fulfills'] for input_, output
+                   in zip(transaction['inputs'], spent_outputs or ())
+                   if output is None]
+        if spent_outputs is None or missing:
+            raise ValidationError(
+                'Spent outputs not found: {}'.format(
+                    missing or 'no outputs given'))
+        outputs = [Output.from_dict(output) for output in spent_outputs]
+    else:
+        outputs = None
+    if not transaction_obj.inputs_valid(outputs):
+        raise ValidationError('Invalid fulfillment')
+
+
+def _keys_valid(obj):
+    # NOTE: Checks all the keys of `obj` with a handful of string
+    #       operations. Keys are joined with null characters, so a key
+    #       holding a null character shows up as an extra separator.
+    if not obj:
+        return True
+    try:
+        joined = '\x00' + '\x00'.join(obj)
+    except TypeError:
+        return False
+    return not ('.' in joined or '\x00$' in joined or
+                joined.count('\x00') != len(obj))
+
+
+def _pointer(path):
+    parts = []
+    while path is not None:
+        key, path = path
+        parts.append(str(key).replace('~', '~0').replace('/', '~1'))
+    return '/' + '/'.join(reversed(parts))
+
+
+def _is_clean(obj, value_validators):
+    # NOTE: Fast path for the common case of a valid document: no paths
+    #       are tracked, and the walk stops at the first violation.
+    stack = [obj]
+    pop, extend = stack.pop, stack.extend
+    while stack:
+        node = pop()
+        if isinstance(node, dict):
+            if not _keys_valid(node):
+                return False
+            if value_validators and not value_validators.keys().isdisjoint(
+                    node):
+                for key in value_validators.keys() & node.keys():
+                    try:
+                        value_validators[key](node[key])
+                    except ValidationError:
+                        return False
+            extend([value for value in node.values()
+                    if isinstance(value, _CONTAINERS)])
+        else:
+            extend([value for value in node
+                    if isinstance(value, _CONTAINERS)])
+    return True
+
+
+def find_key_violations(obj, value_validators=None):
+    """Finds all the invalid keys of a (nested) document, descending
+    into dictionaries and lists alike.
+
+    Keys must not start with ``"$"``, nor contain ``"."`` or null
+    characters, as with
+    :func:`~bigchaindb_driver.common.utils.validate_key`. The document
+    is walked iteratively, so that its depth is not bounded by the
+    recursion limit. Valid documents are walked once; the path of the
+    violations is only tracked if there are any.
+
+    Args:
+        obj (:obj:`dict` | :obj:`list`): The document to check.
+        value_validators (dict): Optional mapping between keys and
+            functions validating the values held by these keys, at any
+            depth, as with
+            :func:`~bigchaindb_driver.common.utils.validate_all_values_for_key`.
+            Validation functions raise
+            :exc:`~bigchaindb_driver.common.exceptions.ValidationError`
+            on failure.
+
+    Returns:
+        :obj:`list` of :class:`~.KeyViolation`: The violations, each
+        one holding the JSON pointer of the offending key and the
+        reason.
+
+    """
+    value_validators = value_validators or {}
+    if _is_clean(obj, value_validators):
+        return []
+
+    violations = []
+    # NOTE: Paths are linked lists of `(key, parent)` pairs, which are
+    #       only turned into pointers when a violation is found.
+    stack = [(obj, None)]
+    while stack:
+        node, path = stack.pop()
+        if isinstance(node, dict):
+            if not _keys_valid(node):
+                for key in node:
+                    if (not isinstance(key, str) or
+                            INVALID_KEY_PATTERN.search(key)):
+                        violations.append(KeyViolation(
+                            _pointer((key, path)),
+                            'Invalid key name {!r}. The key name cannot '
+                            'contain characters ".", "$" or null '
+                            'characters'.format(key)))
+            for key, value in node.items():
+                if key in value_validators:
+                    try:
+                        value_validators[key](value)
+                    except ValidationError as exc:
+                        violations.append(
+                            KeyViolation(_pointer((key, path)), str(exc)))
+                if isinstance(value, _CONTAINERS):
+                    stack.append((value, (key, path)))
+        else:
+            for index, value in enumerate(node):
+                if isinstance(value, _CONTAINERS):
+                    stack.append((value, (index, path)))
+    return violations
+
+
+def validate_keys(obj_name, obj, value_validators=None):
+    """Validates all the (nested) keys of ``obj``, reporting all the
+    violations at once.
+
+    This is an iterative, list-aware counterpart of
+    :func:`~bigchaindb_driver.common.utils.validate_all_keys`, see
+    :func:`~.find_key_violations`.
+
+    Args:
+        obj_name (str): Name of ``obj``, used in the error message.
+        obj (:obj:`dict` | :obj:`list`): The document to validate.
+        value_validators (dict): See :func:`~.find_key_violations`.
+
+    Raises:
+        :exc:`~.exceptions.InvalidKeysError`: If any key is invalid.
+            Its ``violations`` attribute lists them.
+
+    """
+    violations = find_key_violations(obj, value_validators)
+    if violations:
+        raise InvalidKeysError(
+            '{} invalid key(s) in {} object: {}'.format(
+                len(violations), obj_name,
+                '; '.join('{}: {}'.format(*v) for v in violations)),
+            violations,
+        )
+
+
+def _verify_chunk(chunk):
+    return [verify_transaction(transaction, spent_outputs)
+            for transaction, spent_outputs in chunk]
+
+
+def _outputs_index(transactions, *, check_ids=False):
+    return {
+        transaction['id']: transaction['outputs']
+        for transaction in transactions
+        if isinstance(transaction, dict) and transaction.get('id')
+        and (not check_ids or _has_valid_id(transaction))
+    }
+
+
+def _has_valid_id(transaction):
+    try:
+        body = Transaction._to_str(dict(transaction, id=None))
+    # NOTE: A payload that cannot be serialized has no valid id either.
+    except Exception:
+        return False
+    return Transaction._to_hash(body) == transaction['id']
+
+
+def _spent_outputs(transaction, outputs_index):
+    try:
+        if transaction['operation'] != Transaction.TRANSFER:
+            return None
+        links = [input_['fulfills'] for input_ in transaction['inputs']]
+    except (KeyError, TypeError):
+        return None
+
+    spent_outputs = []
+    for link in links:
+        try:
+            outputs = outputs_index[link['transaction_id']]
+            spent_outputs.append(outputs[link['output_index']])
+        except (KeyError, IndexError, TypeError):
+            spent_outputs.append(None)
+    return spent_outputs
+
+
+def verify_transactions(transactions, *, known_transactions=(),
+                        workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Verifies a batch of signed transactions over a pool of processes.
+
+    The outputs spent by ``'TRANSFER'`` transactions are looked up among
+    ``known_transactions`` first, then among the ``transactions``
+    themselves (so that chains can be verified as a whole) whose id
+    matches the hash of their body. A transaction of the batch thus
+    cannot stand in for a known one. Only the outputs needed by a chunk
+    are sent along with it to the worker processes.
+
+    Args:
+        transactions (:obj:`list` of :obj:`dict`): The signed
+            transactions to verify.
+        known_transactions (:obj:`list` of :obj:`dict`): Transactions,
+            e.g. retrieved from a node, whose outputs may be spent by
+            ``transactions``. Defaults to ``()``.
+        workers (int): Number of worker processes. Defaults to ``None``,
+            meaning one per CPU. With ``1``, or if the batch fits in a
+            single chunk, transactions are verified in the current
+            process.
+        chunk_size (int): Number of transactions sent to a worker at
+            once. Defaults to :data:`DEFAULT_CHUNK_SIZE`.
+
+    Returns:
+        :obj:`list` of :class:`~.Verdict`: One verdict per transaction,
+        in the order of ``transactions``.
+
+    """
+    transactions = list(transactions)
+    outputs_index = _outputs_index(transactions, check_ids=True)
+    outputs_index.update(_outputs_index(known_transactions))
+    items = [(transaction, _spent_outputs(transaction, outputs_index))
+             for transaction in transactions]
+    chunks = [items[i:i + chunk_size]
+              for i in range(0, len(items), chunk_size)]
+
+    if workers == 1 or len(chunks) <= 1:
+        results = map(_verify_chunk, chunks)
+        return [verdict for chunk in results for verdict in chunk]
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = executor.map(_verify_chunk, chunks)
+        return [verdict for chunk in results for verdict in chunk]
@@ -74,6 +74,11 @@ setup(
         'Programming Language :: Python :: 3.6',
     ],
     test_suite='tests',
+    entry_points={
+        'console_scripts': [
+            'bigchaindb-driver-bench=bigchaindb_driver.loadgen:main',
+        ],
+    },
     extras_require={
         'test': tests_require,
         'dev': dev_require + tests_require + docs_require,
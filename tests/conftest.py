@@ -192,6 +192,25 @@ def driver(bdb_node):
     return BigchainDB(bdb_node)
 
 
+@fixture
+def fake_node():
+    from bigchaindb_driver.fakenode import FakeNode
+    with FakeNode() as node:
+        yield node
+
+
+@fixture
+def transport_class():
+    from bigchaindb_driver.transport import Transport
+    return Transport
+
+
+@fixture
+def fake_driver(fake_node, transport_class):
+    from bigchaindb_driver import BigchainDB
+    return BigchainDB(fake_node.url, transport_class=transport_class)
+
+
 @fixture
 def api_root(bdb_node):
     return bdb_node + '/api/v1'
@@ -243,6 +262,26 @@ def signed_alice_transaction(alice_privkey, alice_transaction_obj):
     return signed_transaction.to_dict()
 
 
+@fixture
+def create_recipients(alice_keypair):
+    return [([alice_keypair.vk], 2)]
+
+
+@fixture
+def create(alice_keypair, create_recipients):
+    from bigchaindb_driver.offchain import (
+        fulfill_transaction,
+        prepare_create_transaction,
+    )
+    return fulfill_transaction(
+        prepare_create_transaction(
+            signers=alice_keypair.vk,
+            recipients=create_recipients,
+            asset={'data': {'vehicle': 'bicycle'}},
+            metadata={'planet': 'earth'}),
+        private_keys=alice_keypair.sk)
+
+
 @fixture
 def persisted_alice_transaction(signed_alice_transaction,
                                 transactions_api_full_url):
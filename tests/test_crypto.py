@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
+import pytest
+
 
 def test_generate_keypair():
     from bigchaindb_driver.crypto import CryptoKeypair, generate_keypair
@@ -10,3 +12,60 @@ def test_generate_keypair():
     assert isinstance(keypair, CryptoKeypair)
     assert isinstance(keypair.private_key, str)
     assert isinstance(keypair.public_key, str)
+
+
+def test_derive_keypair_slip10_vector():
+    from binascii import unhexlify
+    from bigchaindb_driver.crypto import _derive_node
+    # NOTE: Test vector 1 of SLIP-0010 for ed25519.
+    seed = unhexlify('000102030405060708090a0b0c0d0e0f')
+    key, chain_code = _derive_node(seed, ())
+    assert key.hex() == (
+        '2b4be7f19ee27bbf30c667b642d5f4aa69fd169872f8fc3059c08ebae2eb19e7')
+    assert chain_code.hex() == (
+        '90046a93de5380a72b5e45010748567d5ea02bbf6522f979e05c0d8d8ca9fffb')
+    key, _ = _derive_node(seed, (0, 1, 2, 2, 1000000000))
+    assert key.hex() == (
+        '8f94d394a8e8fd6b1bc2f3f49f5c47e385281d5c17e65324b0f62483e37e8793')
+
+
+def test_derive_keypair_is_deterministic():
+    from bigchaindb_driver.crypto import derive_keypair
+    seed = b'\x01' * 32
+    keypair = derive_keypair(seed, "m/44'/7'")
+    assert keypair == derive_keypair(seed, 'm/44/7')
+    assert keypair == derive_keypair(seed, [44, 7])
+    assert keypair != derive_keypair(seed, [44, 8])
+    assert keypair != derive_keypair(b'\x02' * 32, [44, 7])
+    assert derive_keypair(seed, 3) == derive_keypair(seed, 'm/3')
+
+
+@pytest.mark.parametrize('seed,path', (
+    (b'\x01' * 15, 0),
+    ('a' * 32, 0),
+    (b'\x01' * 32, 2 ** 31),
+    (b'\x01' * 32, -1),
+    (b'\x01' * 32, '0/1'),
+    (b'\x01' * 32, 'm/a'),
+))
+def test_derive_keypair_invalid(seed, path):
+    from bigchaindb_driver.crypto import derive_keypair
+    with pytest.raises(ValueError):
+        derive_keypair(seed, path)
+
+
+def test_generate_keypairs_random():
+    from bigchaindb_driver.crypto import generate_keypairs
+    keypairs = generate_keypairs(10, chunk_size=3, workers=2)
+    assert len(keypairs) == 10
+    assert len(set(keypairs)) == 10
+
+
+@pytest.mark.parametrize('workers', (1, 2))
+def test_generate_keypairs_derived(workers):
+    from bigchaindb_driver.crypto import derive_keypair, generate_keypairs
+    seed = b'\x01' * 32
+    keypairs = generate_keypairs(5, master_seed=seed, parent_path='m/44',
+                                 start=10, chunk_size=2, workers=workers)
+    assert keypairs == [derive_keypair(seed, [44, i])
+                        for i in range(10, 15)]
@@ -7,7 +7,7 @@
 import json
 
 import base58
-from pytest import mark, raises
+from pytest import fixture, mark, raises
 from requests.utils import default_headers
 from sha3 import sha3_256
 from cryptoconditions import Ed25519Sha256
@@ -304,3 +304,88 @@ class TestAssetsMetadataEndpoint:
         # we are limiting the number of returned results to 2
         response = driver.metadata.get(search='call me maybe', limit=2)
         assert len(response) == 2
+
+
+class TestRetrieveMany:
+
+    @fixture
+    def transactions(self, fake_driver, alice_keypair):
+        from bigchaindb_driver.offchain import (
+            fulfill_transaction,
+            prepare_create_transaction,
+        )
+        transactions = [fulfill_transaction(
+            prepare_create_transaction(signers=alice_keypair.vk,
+                                       asset={'data': {'serial': i}}),
+            private_keys=alice_keypair.sk) for i in range(5)]
+        for transaction in transactions:
+            fake_driver.transactions.send_commit(transaction)
+        return transactions
+
+    @mark.parametrize('concurrency', (1, 4))
+    def test_retrieve_many(self, fake_driver, fake_node, transactions,
+                           concurrency):
+        from bigchaindb_driver.exceptions import NotFoundError
+        txids = [transaction['id'] for transaction in transactions]
+        requests = fake_node.requests
+        missing = '0' * 64
+        result = fake_driver.transactions.retrieve_many(
+            txids[::-1] + [missing] + txids, concurrency=concurrency,
+            verify=True)
+        assert list(result) == txids[::-1] + [missing]
+        assert [result[txid] for txid in txids] == transactions
+        assert isinstance(result[missing], NotFoundError)
+        assert fake_node.requests - requests == 6
+
+    def test_retrieve_many_empty(self, fake_driver):
+        assert fake_driver.transactions.retrieve_many([]) == {}
+
+    def test_retrieve_many_verify(self, fake_driver, transactions):
+        from unittest.mock import patch
+        from bigchaindb_driver.exceptions import InvalidTransactionIdError
+        tampered = dict(transactions[0], metadata={'tampered': True})
+        other = transactions[1]
+        responses = {transactions[0]['id']: tampered,
+                     transactions[2]['id']: other}
+        txids = [transaction['id'] for transaction in transactions[:3]]
+        with patch.object(fake_driver.transport, 'forward_request',
+                          side_effect=lambda path, **kwargs:
+                          responses[path.rsplit('/', 1)[1]]):
+            result = fake_driver.transactions.retrieve_many(
+                [txids[0], txids[2]], verify=True)
+            assert fake_driver.transactions.retrieve_many(
+                [txids[0]])[txids[0]] == tampered
+        for txid in (txids[0], txids[2]):
+            assert isinstance(result[txid], InvalidTransactionIdError)
+            assert result[txid].transaction_id == txid
+
+    def test_retrieve_many_indexes_transactions(self, transactions,
+                                                fake_node, alice_keypair):
+        from bigchaindb_driver import BigchainDB
+        from bigchaindb_driver.utxo import UTXOIndex
+        driver = BigchainDB(fake_node.url, utxo_index=UTXOIndex())
+        driver.transactions.retrieve_many(
+            [transaction['id'] for transaction in transactions])
+        assert len(driver.utxo_index.unspent(alice_keypair.vk)) == 5
+
+        driver = BigchainDB(fake_node.url, utxo_index=UTXOIndex())
+        driver.transactions.retrieve_many(
+            [transaction['id'] for transaction in transactions], index=False)
+        assert driver.utxo_index.unspent() == []
+
+    def test_retrieve_many_keeps_going_when_indexing_fails(
+            self, transactions, fake_node, alice_keypair):
+        from unittest.mock import patch
+        from bigchaindb_driver import BigchainDB
+        from bigchaindb_driver.utxo import UTXOIndex
+        driver = BigchainDB(fake_node.url, utxo_index=UTXOIndex())
+        txids = [transaction['id'] for transaction in transactions[:2]]
+        malformed = {'id': txids[0]}
+        responses = {txids[0]: malformed, txids[1]: transactions[1]}
+        with patch.object(driver.transport, 'forward_request',
+                          side_effect=lambda path, **kwargs:
+                          responses[path.rsplit('/', 1)[1]]):
+            result = driver.transactions.retrieve_many(txids)
+        assert isinstance(result[txids[0]], Exception)
+        assert result[txids[1]] == transactions[1]
+        assert len(driver.utxo_index.unspent(alice_keypair.vk)) == 1
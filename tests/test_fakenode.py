@@ -0,0 +1,121 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from time import monotonic
+
+from pytest import fixture, raises
+
+
+@fixture
+def transfer(create, alice_keypair, bob_keypair):
+    from bigchaindb_driver.offchain import build_transfer_chain
+    return build_transfer_chain(
+        create, hops=[(bob_keypair.vk, alice_keypair.sk)])[0]
+
+
+def test_info(fake_node, fake_driver):
+    assert fake_driver.info()['version'] == '2.0.0'
+    api_info = fake_driver.api_info()
+    assert api_info['transactions'] == fake_node.url + '/api/v1/transactions/'
+    assert api_info['streams'].startswith('ws://')
+
+
+def test_send_and_retrieve(fake_driver, create, transfer):
+    from bigchaindb_driver.exceptions import NotFoundError
+    assert fake_driver.transactions.send_commit(create) == create
+    assert fake_driver.transactions.send_async(transfer) == transfer
+    assert fake_driver.transactions.retrieve(create['id']) == create
+    assert fake_driver.transactions.get(asset_id=create['id']) == [
+        create, transfer]
+    assert fake_driver.transactions.get(
+        asset_id=create['id'], operation='TRANSFER') == [transfer]
+    with raises(NotFoundError):
+        fake_driver.transactions.retrieve('0' * 64)
+
+
+def test_outputs_and_blocks(fake_driver, create, transfer, alice_keypair,
+                            bob_keypair):
+    from bigchaindb_driver.exceptions import NotFoundError
+    fake_driver.transactions.send_commit(create)
+    fake_driver.transactions.send_commit(transfer)
+    link = {'transaction_id': create['id'], 'output_index': 0}
+    assert fake_driver.outputs.get(alice_keypair.vk) == [link]
+    assert fake_driver.outputs.get(alice_keypair.vk, spent=True) == [link]
+    assert fake_driver.outputs.get(alice_keypair.vk, spent=False) == []
+    assert fake_driver.outputs.get(bob_keypair.vk, spent=False) == [
+        {'transaction_id': transfer['id'], 'output_index': 0}]
+    assert fake_driver.blocks.get(txid=transfer['id']) == 2
+    assert fake_driver.blocks.get(txid='0' * 64) is None
+    assert fake_driver.blocks.retrieve('1') == {'height': 1,
+                                                'transactions': [create]}
+    with raises(NotFoundError):
+        fake_driver.blocks.retrieve('3')
+
+
+def test_search(fake_driver, create, transfer):
+    fake_driver.transactions.send_commit(create)
+    fake_driver.transactions.send_commit(transfer)
+    assert fake_driver.assets.get(search='Bicycle') == [
+        {'id': create['id'], 'data': {'vehicle': 'bicycle'}}]
+    assert fake_driver.assets.get(search='car') == []
+    assert fake_driver.metadata.get(search='earth', limit=1) == [
+        {'id': create['id'], 'metadata': {'planet': 'earth'}}]
+
+
+def test_rejects_invalid_transactions(fake_driver, create, transfer):
+    from bigchaindb_driver.exceptions import BadRequest
+    with raises(BadRequest) as exc:
+        fake_driver.transactions.send_commit(transfer)
+    assert 'InputDoesNotExist' in exc.value.info['message']
+    fake_driver.transactions.send_commit(create)
+    with raises(BadRequest) as exc:
+        fake_driver.transactions.send_commit(create)
+    assert 'DuplicateTransaction' in exc.value.info['message']
+    with raises(BadRequest) as exc:
+        fake_driver.transactions.send_commit(dict(transfer, metadata={'x': 1}))
+    assert 'InvalidHash' in exc.value.info['message']
+    with raises(BadRequest) as exc:
+        fake_driver.transactions.send_commit({'id': 'abc'})
+    assert 'SchemaValidationError' in exc.value.info['message']
+
+
+def test_ledger_rejects_double_spends(create, transfer, alice_keypair,
+                                      carol_keypair):
+    from bigchaindb_driver.common.exceptions import DoubleSpend
+    from bigchaindb_driver.fakenode import Ledger
+    from bigchaindb_driver.offchain import build_transfer_chain
+    ledger = Ledger()
+    assert ledger.commit(create) == 1
+    assert ledger.commit(transfer) == 2
+    double_spend = build_transfer_chain(
+        create, hops=[(carol_keypair.public_key, alice_keypair.sk)])[0]
+    with raises(DoubleSpend):
+        ledger.commit(double_spend)
+    assert len(ledger) == 2
+
+
+def test_latency():
+    from bigchaindb_driver import BigchainDB
+    from bigchaindb_driver.fakenode import FakeNode
+    with FakeNode(latency=0.05, jitter=0.01, seed=1) as node:
+        start = monotonic()
+        BigchainDB(node.url).info()
+        assert monotonic() - start >= 0.05
+
+
+def test_error_injection(fake_driver, fake_node):
+    from bigchaindb_driver.exceptions import (
+        GatewayTimeout,
+        ServiceUnavailable,
+    )
+    fake_node.fail_next(2)
+    for _ in range(2):
+        with raises(ServiceUnavailable):
+            fake_driver.info()
+    assert fake_driver.info()['version'] == '2.0.0'
+    fake_node.error_rate = 1
+    fake_node.error_status = 504
+    with raises(GatewayTimeout):
+        fake_driver.info()
+    assert fake_node.requests == 4
@@ -0,0 +1,102 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from pytest import fixture, raises
+
+
+@fixture
+def chain(create, alice_keypair, bob_keypair, carol_keypair):
+    from bigchaindb_driver.offchain import build_transfer_chain
+    return build_transfer_chain(
+        create, hops=[(bob_keypair.vk, alice_keypair.sk),
+                      (carol_keypair.public_key, bob_keypair.sk)])
+
+
+def test_history(create, chain, alice_keypair, bob_keypair, carol_keypair):
+    from bigchaindb_driver.history import AssetHistory
+    history = AssetHistory(create['id'])
+    transfer1, transfer2 = chain
+    assert history.update([transfer2, create]) == [transfer2, create]
+    # NOTE: The output of the CREATE transaction seems unspent, as long
+    #       as the transaction spending it is missing.
+    assert history.current_owners() == {alice_keypair.vk,
+                                        carol_keypair.public_key}
+    assert history.provenance(transfer2['id']) == [transfer2]
+    assert history.spent_by(create['id'], 0) is None
+
+    assert history.update([create, transfer1, transfer2]) == [transfer1]
+    assert len(history) == 3
+    assert transfer1['id'] in history
+    assert history.get(transfer1['id']) == transfer1
+    assert history.current_owners() == {carol_keypair.public_key}
+    assert history.spent_by(create['id'], 0) == transfer1['id']
+    assert history.spent_by(transfer1['id'], 0) == transfer2['id']
+    assert history.spent_by(transfer2['id'], 0) is None
+    assert history.provenance(transfer2['id']) == [create, transfer1,
+                                                   transfer2]
+    unspent, = history.unspent_outputs()
+    assert (unspent.transaction_id, unspent.output_index,
+            unspent.amount) == (transfer2['id'], 0, 2)
+    assert history.unspent_outputs(carol_keypair.public_key) == [unspent]
+    assert history.unspent_outputs(alice_keypair.vk) == []
+    with raises(KeyError):
+        history.provenance('0' * 64)
+
+
+def test_history_of_split_outputs(create, alice_keypair, bob_keypair,
+                                  carol_keypair):
+    from bigchaindb_driver.history import AssetHistory
+    from bigchaindb_driver.offchain import build_transfer_tree
+    split, = build_transfer_tree(create, levels=[(
+        [([bob_keypair.vk], 1), ([carol_keypair.public_key], 1)],
+        alice_keypair.sk)])[0]
+    history = AssetHistory(create['id'])
+    history.update([create, split])
+    assert history.current_owners() == {bob_keypair.vk,
+                                        carol_keypair.public_key}
+    assert sum(output.amount for output in history.unspent_outputs()) == 2
+
+
+def test_history_rejects_other_assets(create, alice_keypair):
+    from bigchaindb_driver.history import AssetHistory
+    history = AssetHistory('0' * 64)
+    with raises(ValueError):
+        history.update([create])
+    assert len(history) == 0
+
+
+def test_history_rejects_batches_with_other_assets(create, chain):
+    from bigchaindb_driver.history import AssetHistory
+    history = AssetHistory(create['id'])
+    other = dict(chain[0], asset={'id': '0' * 64})
+    with raises(ValueError):
+        history.update([create, other])
+    assert len(history) == 0
+    assert history.current_owners() == set()
+
+
+def test_provenance_stops_on_cycles(create, chain):
+    from bigchaindb_driver.history import AssetHistory
+    transfer1, transfer2 = chain
+    # NOTE: Forged, as no valid transactions can spend each other.
+    forged = dict(transfer1, inputs=[dict(
+        transfer1['inputs'][0],
+        fulfills={'transaction_id': transfer2['id'], 'output_index': 0})])
+    history = AssetHistory(create['id'])
+    history.update([create, forged, transfer2])
+    assert history.provenance(transfer2['id']) == [forged, transfer2]
+
+
+def test_refresh_adds_new_transactions(fake_driver, create, chain,
+                                       carol_keypair):
+    from bigchaindb_driver.history import AssetHistory
+    transfer1, transfer2 = chain
+    history = AssetHistory(create['id'])
+    fake_driver.transactions.send_commit(create)
+    fake_driver.transactions.send_commit(transfer1)
+    assert history.refresh(fake_driver) == [create, transfer1]
+    assert history.refresh(fake_driver) == []
+    fake_driver.transactions.send_commit(transfer2)
+    assert history.refresh(fake_driver) == [transfer2]
+    assert history.current_owners() == {carol_keypair.public_key}
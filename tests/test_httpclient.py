@@ -0,0 +1,108 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import socket
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from pytest import fixture, raises
+
+
+@fixture
+def transport_class():
+    from bigchaindb_driver.httpclient import HTTPClientTransport
+    return HTTPClientTransport
+
+
+def test_transport_uses_http_client_connections(fake_driver):
+    from bigchaindb_driver.httpclient import HTTPClientConnection
+    connections = fake_driver.transport.connection_pool.connections
+    assert all(isinstance(connection, HTTPClientConnection)
+               for connection in connections)
+
+
+def test_send_and_retrieve(fake_driver, create, alice_keypair):
+    from bigchaindb_driver.exceptions import NotFoundError
+    assert fake_driver.info()['version'] == '2.0.0'
+    assert fake_driver.transactions.send_commit(create) == create
+    assert fake_driver.transactions.retrieve(create['id']) == create
+    assert fake_driver.transactions.get(asset_id=create['id']) == [create]
+    assert fake_driver.outputs.get(alice_keypair.vk, spent=None) == [
+        {'transaction_id': create['id'], 'output_index': 0}]
+    with raises(NotFoundError) as exc:
+        fake_driver.transactions.retrieve('0' * 64)
+    assert exc.value.status_code == 404
+    assert exc.value.url.endswith('/api/v1/transactions/' + '0' * 64)
+
+
+def test_views(fake_driver, create):
+    from bigchaindb_driver.models import Transaction
+    fake_driver.transactions.send_commit(create)
+    assert fake_driver.transactions.get(asset_id=create['id'], view=True) == [
+        Transaction(create)]
+
+
+def test_http_errors(fake_driver, fake_node):
+    from bigchaindb_driver.exceptions import BadRequest, ServiceUnavailable
+    fake_node.fail_next(1)
+    with raises(ServiceUnavailable):
+        fake_driver.info()
+    with raises(BadRequest) as exc:
+        fake_driver.transactions.send_commit({'id': 'abc'})
+    assert 'SchemaValidationError' in exc.value.info['message']
+
+
+def test_reuses_connections(fake_driver):
+    connection = fake_driver.transport.connection_pool.connections[0]
+    fake_driver.info()
+    idle = list(connection._idle)
+    assert len(idle) == 1
+    fake_driver.info()
+    assert list(connection._idle) == idle
+    connection.close()
+    assert not connection._idle
+    assert fake_driver.info()['version'] == '2.0.0'
+
+
+def test_reconnects_when_the_node_closes_idle_connections(fake_driver):
+    connection = fake_driver.transport.connection_pool.connections[0]
+    fake_driver.info()
+    connection._idle[0].sock.shutdown(socket.SHUT_RDWR)
+    assert fake_driver.info()['version'] == '2.0.0'
+
+
+def test_concurrent_requests(fake_driver):
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: fake_driver.info(), range(64)))
+    assert all(result['version'] == '2.0.0' for result in results)
+    connection = fake_driver.transport.connection_pool.connections[0]
+    assert 1 <= len(connection._idle) <= 8
+
+
+def test_connection_errors_are_requests_connection_errors():
+    from requests.exceptions import ConnectionError
+    from bigchaindb_driver.httpclient import HTTPClientConnection
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    connection = HTTPClientConnection(
+        node_url='http://127.0.0.1:{}'.format(port))
+    with raises(ConnectionError):
+        connection.request('GET', path='/', backoff_cap=1)
+    assert connection._retries == 1
+    assert connection.backoff_time is not None
+
+
+def test_records_bytes(fake_node):
+    from bigchaindb_driver import BigchainDB
+    from bigchaindb_driver.httpclient import HTTPClientTransport
+    from bigchaindb_driver.metrics import MetricsRegistry
+    metrics = MetricsRegistry()
+    bdb = BigchainDB(fake_node.url, transport_class=partial(
+        HTTPClientTransport, metrics=metrics))
+    bdb.info()
+    assert metrics.get('bigchaindb_driver_request_bytes_total',
+                       node=fake_node.url, endpoint='/') == 0
+    assert metrics.get('bigchaindb_driver_response_bytes_total',
+                       node=fake_node.url, endpoint='/') > 0
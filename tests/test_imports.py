@@ -0,0 +1,74 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import json
+import subprocess
+import sys
+
+from pytest import mark
+
+
+HEAVY_MODULES = ('requests', 'cryptoconditions', 'rapidjson',
+                 'rapidjson_schema', 'sha3', 'pyasn1', 'cryptography')
+
+# NOTE: Cold import times, in milliseconds, measured with `-X importtime`,
+#       with a wide margin for slow machines. The heavy dependencies alone
+#       take several times as long.
+IMPORT_TIME_BUDGETS = {
+    'bigchaindb_driver': 20,
+    'bigchaindb_driver.crypto': 60,
+}
+
+
+def run(code, *options):
+    return subprocess.run(
+        [sys.executable] + list(options) + ['-c', code],
+        stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True,
+        universal_newlines=True)
+
+
+def imported_heavy_modules(statement):
+    code = '{}\nimport json, sys\nprint(json.dumps(sorted(sys.modules)))'
+    modules = json.loads(run(code.format(statement)).stdout)
+    return {module.split('.')[0] for module in modules} & set(HEAVY_MODULES)
+
+
+def import_time(module):
+    stderr = run('import ' + module, '-X', 'importtime').stderr
+    for line in stderr.splitlines():
+        fields = line.split('|')
+        if len(fields) == 3 and fields[2].strip() == module and \
+                not fields[2].startswith('  '):
+            return int(fields[1]) / 1000
+
+
+@mark.parametrize('statement,expected', (
+    ('import bigchaindb_driver', set()),
+    ('import bigchaindb_driver.exceptions', set()),
+    ('from bigchaindb_driver.crypto import generate_keypair', set()),
+    ('from bigchaindb_driver import BigchainDB', {'requests'}),
+))
+def test_heavy_modules_are_imported_on_first_use(statement, expected):
+    assert imported_heavy_modules(statement) == expected
+
+
+def test_unknown_attributes():
+    import bigchaindb_driver
+    assert not hasattr(bigchaindb_driver, 'Driver')
+
+
+def test_driver_imports_the_transaction_machinery_on_first_use():
+    assert imported_heavy_modules(
+        'from bigchaindb_driver import BigchainDB\n'
+        'from bigchaindb_driver.crypto import generate_keypair\n'
+        'alice = generate_keypair()\n'
+        'BigchainDB().transactions.prepare(signers=alice.public_key)'
+    ) >= {'cryptoconditions', 'sha3', 'rapidjson'}
+
+
+@mark.skipif(sys.version_info < (3, 7),
+             reason='-X importtime needs Python 3.7')
+@mark.parametrize('module,budget', sorted(IMPORT_TIME_BUDGETS.items()))
+def test_import_time_budget(module, budget):
+    assert min(import_time(module) for _ in range(3)) < budget
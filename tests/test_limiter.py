@@ -0,0 +1,84 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from unittest.mock import patch
+
+
+def test_aimd_limiter_additive_increase():
+    from bigchaindb_driver.limiter import AIMDLimiter
+    limiter = AIMDLimiter(initial_limit=2, latency_factor=None)
+    for _ in range(2):
+        tokens = [limiter.acquire() for _ in range(limiter.limit)]
+        for token in tokens:
+            limiter.release(token, success=True)
+    # NOTE: 2 -> 2.5 -> 2.9 after the first round, -> 3.55 after the
+    #       second one.
+    assert limiter.limit == 3
+    assert limiter.in_flight == 0
+
+
+def test_aimd_limiter_blocks_when_full():
+    from bigchaindb_driver.limiter import AIMDLimiter
+    limiter = AIMDLimiter(initial_limit=1)
+    token = limiter.acquire()
+    assert limiter.acquire(timeout=0.01) is None
+    limiter.release(token, success=True)
+    assert limiter.acquire(timeout=0.01) is not None
+
+
+def test_aimd_limiter_multiplicative_decrease_once_per_burst():
+    from bigchaindb_driver.limiter import AIMDLimiter
+    limiter = AIMDLimiter(initial_limit=8, max_limit=8)
+    tokens = [limiter.acquire() for _ in range(4)]
+    for token in tokens:
+        limiter.release(token, success=False, overloaded=True)
+    assert limiter.limit == 4
+    limiter.release(limiter.acquire(), success=False, overloaded=True)
+    assert limiter.limit == 2
+    for _ in range(3):
+        limiter.release(limiter.acquire(), success=False, overloaded=True)
+    assert limiter.limit == 1
+
+
+@patch('bigchaindb_driver.limiter.monotonic')
+def test_aimd_limiter_latency_spike(monotonic_mock):
+    from bigchaindb_driver.limiter import AIMDLimiter
+    limiter = AIMDLimiter(initial_limit=10, latency_factor=3)
+    monotonic_mock.side_effect = [0, 1, 10, 11, 20, 30]
+    limiter.release(limiter.acquire(), success=True)
+    assert limiter.latency == 1
+    limiter.release(limiter.acquire(), success=True)
+    assert limiter.limit == 10
+    limiter.release(limiter.acquire(), success=True)
+    assert limiter.limit == 5
+    # NOTE: The spike still counts in the smoothed latency.
+    assert limiter.latency == 1.9
+
+
+@patch('bigchaindb_driver.limiter.monotonic')
+def test_aimd_limiter_adapts_to_a_lasting_latency_rise(monotonic_mock):
+    from bigchaindb_driver.limiter import AIMDLimiter
+    limiter = AIMDLimiter(initial_limit=64, max_limit=64, latency_factor=3)
+    times = [0, 1]
+    for i in range(1, 41):
+        times += [i * 100, i * 100 + 10]
+    monotonic_mock.side_effect = times
+    for _ in range(41):
+        limiter.release(limiter.acquire(), success=True)
+    assert 9 < limiter.latency < 10
+    # NOTE: Only the first few samples at the new latency are spikes,
+    #       then the limit grows again.
+    assert limiter.limit > limiter.min_limit
+    limit = limiter._limit
+    monotonic_mock.side_effect = [5000, 5010]
+    limiter.release(limiter.acquire(), success=True)
+    assert limiter._limit > limit
+
+
+def test_aimd_limiter_start_restarts_the_clock():
+    from bigchaindb_driver.limiter import AIMDLimiter
+    limiter = AIMDLimiter()
+    with patch('bigchaindb_driver.limiter.monotonic', side_effect=[0, 5]):
+        token = limiter.start(limiter.acquire())
+    assert token == 5
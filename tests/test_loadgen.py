@@ -0,0 +1,49 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import json
+
+from pytest import mark, raises
+
+
+@mark.parametrize('rank,expected', ((50, 2), (90, 4), (99, 4), (1, 1)))
+def test_percentile(rank, expected):
+    from bigchaindb_driver.loadgen import percentile
+    assert percentile([1, 2, 3, 4], rank) == expected
+    assert percentile([], rank) is None
+
+
+def test_run_against_local_nodes():
+    from bigchaindb_driver.fakenode import FakeNode, Ledger
+    from bigchaindb_driver.loadgen import run
+    ledger = Ledger()
+    with FakeNode(ledger=ledger) as node1, FakeNode(ledger=ledger) as node2:
+        rows = run([node1.url, node2.url], count=4, transfers=2,
+                   keypairs=3, mode='async', concurrency=2)
+    assert len(ledger) == 12
+    assert node1.requests == node2.requests == 6
+    counts = {(row['phase'], row['node']): row['count'] for row in rows}
+    assert counts[('prepare-create', 'local')] == 4
+    assert counts[('prepare-transfer', 'local')] == 8
+    assert counts[('submit-create', 'all')] == 4
+    assert counts[('submit-create', node1.url)] == 2
+    assert counts[('submit-transfer', 'all')] == 8
+    assert not any(row['errors'] for row in rows)
+
+
+def test_main(capsys):
+    from bigchaindb_driver.loadgen import main
+    assert main(['--local', '1', '--count', '3', '--rate', '1000',
+                 '--json']) == 0
+    rows = json.loads(capsys.readouterr().out)
+    assert [row['phase'] for row in rows] == [
+        'keygen', 'prepare-create', 'submit-create']
+    assert main(['--local', '1', '--count', '2']) == 0
+    assert capsys.readouterr().out.startswith('phase ')
+
+
+def test_main_without_nodes():
+    from bigchaindb_driver.loadgen import main
+    with raises(SystemExit):
+        main([])
@@ -0,0 +1,105 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from pytest import mark, raises
+from responses import RequestsMock
+
+
+@mark.parametrize('path,endpoint', (
+    (None, '/'),
+    ('/', '/'),
+    ('/api/v1', '/'),
+    ('/api/v1/transactions/', '/transactions'),
+    ('/api/v1/transactions/abc', '/transactions'),
+    ('/blocks/1', '/blocks'),
+))
+def test_endpoint_label(path, endpoint):
+    from bigchaindb_driver.metrics import endpoint_label
+    assert endpoint_label(path) == endpoint
+
+
+def test_registry():
+    from bigchaindb_driver.metrics import MetricsRegistry
+    registry = MetricsRegistry(buckets=(0.1, 1))
+    registry.inc('requests', node='a')
+    registry.inc('requests', 2, node='a')
+    registry.set('limit', 4, node='a')
+    registry.set('limit', 8, node='a')
+    for value in (0.05, 0.1, 0.5, 2):
+        registry.observe('latency', value, node='a"b')
+    assert registry.get('requests', node='a') == 3
+    assert registry.get('requests', node='b') is None
+    assert registry.get('limit', node='a') == 8
+    assert registry.get('latency', node='a"b') == (2.65, 4)
+    assert registry.export_prometheus() == (
+        '# TYPE latency histogram\n'
+        'latency_bucket{node="a\\"b",le="0.1"} 2\n'
+        'latency_bucket{node="a\\"b",le="1"} 3\n'
+        'latency_bucket{node="a\\"b",le="+Inf"} 4\n'
+        'latency_sum{node="a\\"b"} 2.65\n'
+        'latency_count{node="a\\"b"} 4\n'
+        '# TYPE limit gauge\n'
+        'limit{node="a"} 8\n'
+        '# TYPE requests counter\n'
+        'requests{node="a"} 3\n'
+    )
+
+
+def test_noop_metrics():
+    from bigchaindb_driver.metrics import NOOP_METRICS
+    from bigchaindb_driver.transport import Transport
+    from bigchaindb_driver.utils import normalize_nodes
+    transport = Transport(*normalize_nodes('http://node:9984'))
+    assert transport.metrics is NOOP_METRICS
+    assert not NOOP_METRICS.enabled
+    assert transport.connection_pool.connections[0].metrics is NOOP_METRICS
+
+
+def test_transport_metrics():
+    from bigchaindb_driver.exceptions import NotFoundError
+    from bigchaindb_driver.metrics import MetricsRegistry
+    from bigchaindb_driver.retry import RetryPolicy
+    from bigchaindb_driver.transport import Transport
+    from bigchaindb_driver.utils import normalize_nodes
+    registry = MetricsRegistry()
+    transport = Transport(
+        *normalize_nodes('http://node1:9984', 'http://node2:9984'),
+        retry_policy=RetryPolicy(), metrics=registry)
+    url = '/api/v1/transactions/'
+    with RequestsMock() as requests_mock:
+        requests_mock.add('POST', 'http://node1:9984' + url, status=503,
+                          json={})
+        requests_mock.add('POST', 'http://node2:9984' + url,
+                          json={'id': 'a'})
+        requests_mock.add('GET', 'http://node1:9984' + url + 'b',
+                          status=404, json={})
+        transport.forward_request('POST', path=url, json={'id': 'a'})
+        with raises(NotFoundError):
+            transport.forward_request('GET', path=url + 'b')
+
+    labels = {'endpoint': '/transactions', 'method': 'POST'}
+    assert registry.get('bigchaindb_driver_request_duration_seconds',
+                        node='http://node1:9984', status=503, **labels)[1] == 1
+    assert registry.get('bigchaindb_driver_request_duration_seconds',
+                        node='http://node2:9984', status=200, **labels)[1] == 1
+    assert registry.get('bigchaindb_driver_forward_duration_seconds',
+                        outcome='success', **labels)[1] == 1
+    assert registry.get('bigchaindb_driver_forward_duration_seconds',
+                        outcome='error', endpoint='/transactions',
+                        method='GET')[1] == 1
+    assert registry.get('bigchaindb_driver_retries_total',
+                        reason='status_503') == 1
+    assert registry.get('bigchaindb_driver_backoffs_total',
+                        node='http://node1:9984') == 1
+    assert registry.get('bigchaindb_driver_errors_total',
+                        node='http://node1:9984', endpoint='/transactions',
+                        error='NotFoundError') == 1
+    assert registry.get('bigchaindb_driver_request_bytes_total',
+                        node='http://node2:9984',
+                        endpoint='/transactions') == len('{"id": "a"}')
+    assert registry.get('bigchaindb_driver_response_bytes_total',
+                        node='http://node2:9984',
+                        endpoint='/transactions') > 0
+    assert '# HELP bigchaindb_driver_retries_total' in (
+        registry.export_prometheus())
@@ -0,0 +1,129 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from pytest import fixture, mark, raises
+
+
+@fixture
+def create_recipients(alice_keypair, bob_keypair):
+    return [([alice_keypair.vk], 3), ([bob_keypair.vk], 4)]
+
+
+@fixture
+def transfer(create, alice_keypair, bob_keypair, carol_keypair):
+    from bigchaindb_driver.offchain import build_transfer_chain
+    return build_transfer_chain(
+        create, hops=[(carol_keypair.public_key,
+                       [alice_keypair.sk, bob_keypair.sk])])[0]
+
+
+def test_transaction(create, transfer, alice_keypair, bob_keypair):
+    from bigchaindb_driver.common.transaction import TransactionLink
+    from bigchaindb_driver.models import Transaction
+    view = Transaction(create)
+    assert view.raw == create
+    assert view.raw is not view.raw
+    assert view['id'] == view.id == create['id']
+    assert view.operation == 'CREATE'
+    assert view.version == '2.0'
+    assert view.asset == {'data': {'vehicle': 'bicycle'}}
+    assert view.asset_id == create['id']
+    assert view.metadata == {'planet': 'earth'}
+    assert [output.amount for output in view.outputs] == [3, 4]
+    assert view.outputs[1].public_keys == (bob_keypair.vk,)
+    assert view.outputs[1].link == TransactionLink(create['id'], 1)
+    assert (view.outputs[1].transaction_id,
+            view.outputs[1].output_index) == (create['id'], 1)
+    assert view.outputs[1].raw == create['outputs'][1]
+    assert view.inputs[0].owners_before == (alice_keypair.vk,)
+    assert view.inputs[0].fulfills is None
+
+    view = Transaction(transfer)
+    assert view.asset_id == create['id']
+    assert view.inputs[0].fulfills == TransactionLink(create['id'], 0)
+    assert view.inputs[0].fulfillment == transfer['inputs'][0][
+        'fulfillment']
+    assert view.outputs[0].condition_uri == \
+        transfer['outputs'][0]['condition']['uri']
+    assert view.outputs[0].condition_details == \
+        transfer['outputs'][0]['condition']['details']
+
+
+def test_views_do_not_hold_the_decoded_json(create):
+    from bigchaindb_driver.models import Transaction
+    view = Transaction(create, '{"id": "ignored"}')
+    create['metadata'] = {'changed': True}
+    assert view.id == create['id']
+    assert view.raw == {'id': 'ignored'}
+
+
+def test_views_are_read_only_and_slotted(create):
+    from bigchaindb_driver.models import Transaction
+    view = Transaction(create)
+    with raises(AttributeError):
+        view.id = 'abc'
+    with raises(AttributeError):
+        view.extra = 1
+    with raises(AttributeError):
+        del view.outputs
+    assert not hasattr(view, '__dict__')
+    assert not hasattr(view.outputs[0], '__dict__')
+
+
+def test_views_compare_by_json(create, transfer):
+    from bigchaindb_driver.models import AssetHit, Transaction
+    assert Transaction(create) == Transaction(dict(create))
+    assert Transaction(create) != Transaction(transfer)
+    assert Transaction(create) != create
+    assert Transaction(create).outputs[0] != Transaction(create)
+    assert repr(AssetHit({'id': 'a', 'data': {'b': 1}})) == \
+        "AssetHit({'id': 'a', 'data': {'b': 1}})"
+
+
+@mark.parametrize('text,items', (
+    ('[]', []),
+    (' [ ] ', []),
+    ('[{"a": 1}]', [({'a': 1}, '{"a": 1}')]),
+    ('\n[ {"a": [1, 2]} ,\n\t"b" ]\n',
+     [({'a': [1, 2]}, '{"a": [1, 2]}'), ('b', '"b"')]),
+))
+def test_decode_array(text, items):
+    from bigchaindb_driver.models import decode_array
+    assert list(decode_array(text)) == items
+
+
+@mark.parametrize('text', ('{}', '[1 2]', '[1,', ''))
+def test_decode_array_rejects_other_json(text):
+    from bigchaindb_driver.models import decode_array
+    with raises(ValueError):
+        list(decode_array(text))
+
+
+def test_endpoints_return_views(fake_driver, create, transfer):
+    from bigchaindb_driver.models import (
+        AssetHit,
+        Block,
+        MetadataHit,
+        Transaction,
+    )
+    fake_driver.transactions.send_commit(create)
+    fake_driver.transactions.send_commit(transfer)
+    views = fake_driver.transactions.get(asset_id=create['id'], view=True)
+    assert views == [Transaction(create), Transaction(transfer)]
+    assert fake_driver.transactions.retrieve(
+        transfer['id'], view=True) == Transaction(transfer)
+    assert fake_driver.transactions.retrieve_many(
+        [create['id']], view=True)[create['id']] == Transaction(create)
+    block = fake_driver.blocks.retrieve('2', view=True)
+    assert isinstance(block, Block)
+    assert block.height == 2
+    assert block.transactions == (Transaction(transfer),)
+    assert block.raw == fake_driver.blocks.retrieve('2')
+    asset, = fake_driver.assets.get(search='bicycle', view=True)
+    assert isinstance(asset, AssetHit)
+    assert (asset.id, asset.data) == (create['id'], {'vehicle': 'bicycle'})
+    metadata, = fake_driver.metadata.get(search='earth', view=True)
+    assert isinstance(metadata, MetadataHit)
+    assert (metadata.id, metadata.metadata) == (create['id'],
+                                                {'planet': 'earth'})
@@ -133,3 +133,64 @@ def test_fulfill_transaction_raises(alice_transaction, bob_privkey):
     from bigchaindb_driver.exceptions import MissingPrivateKeyError
     with raises(MissingPrivateKeyError):
         fulfill_transaction(alice_transaction, private_keys=bob_privkey)
+
+
+def test_build_transfer_chain(alice_keypair, bob_keypair,
+                              signed_alice_transaction):
+    from bigchaindb_driver.common.transaction import Transaction
+    from bigchaindb_driver.offchain import build_transfer_chain
+    chain = build_transfer_chain(
+        signed_alice_transaction,
+        hops=[(bob_keypair.vk, alice_keypair.sk),
+              (alice_keypair.vk, bob_keypair.sk),
+              (bob_keypair.vk, (alice_keypair.sk,))],
+    )
+    assert len(chain) == 3
+    parent = signed_alice_transaction
+    for transaction in chain:
+        Transaction.validate_id(transaction)
+        assert transaction['operation'] == 'TRANSFER'
+        assert transaction['asset'] == {'id': signed_alice_transaction['id']}
+        assert transaction['inputs'][0]['fulfills'] == {
+            'transaction_id': parent['id'], 'output_index': 0}
+        transaction_obj = Transaction.from_dict(transaction)
+        parent_obj = Transaction.from_dict(parent)
+        assert transaction_obj.inputs_valid(parent_obj.outputs)
+        parent = transaction
+    assert chain[-1]['outputs'][0]['public_keys'] == [bob_keypair.vk]
+
+
+def test_build_transfer_chain_raises(alice_keypair, bob_keypair,
+                                     signed_alice_transaction):
+    from bigchaindb_driver.offchain import build_transfer_chain
+    from bigchaindb_driver.exceptions import MissingPrivateKeyError
+    with raises(MissingPrivateKeyError):
+        build_transfer_chain(signed_alice_transaction,
+                             hops=[(alice_keypair.vk, bob_keypair.sk)])
+
+
+def test_build_transfer_tree(alice_keypair, bob_keypair):
+    from bigchaindb_driver.common.transaction import Transaction
+    from bigchaindb_driver.offchain import (
+        build_transfer_tree, fulfill_transaction, prepare_create_transaction)
+    create_transaction = fulfill_transaction(
+        prepare_create_transaction(
+            signers=alice_keypair.vk,
+            recipients=[([alice_keypair.vk], 4)]),
+        private_keys=alice_keypair.sk,
+    )
+    tree = build_transfer_tree(
+        create_transaction,
+        levels=[([([bob_keypair.vk], 2), ([bob_keypair.vk], 2)],
+                 alice_keypair.sk),
+                ([([alice_keypair.vk], 1), ([alice_keypair.vk], 1)],
+                 bob_keypair.sk),
+                (bob_keypair.vk, alice_keypair.sk)],
+    )
+    assert [len(level) for level in tree] == [1, 2, 4]
+    for parent, child in zip(tree[1], tree[2][::2]):
+        Transaction.validate_id(child)
+        assert child['inputs'][0]['fulfills']['transaction_id'] == \
+            parent['id']
+        assert child['outputs'][0]['amount'] == '1'
+        assert child['asset'] == {'id': create_transaction['id']}
@@ -0,0 +1,116 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from pytest import fixture, raises
+from responses import RequestsMock
+
+
+TRANSACTIONS_URL = 'http://dummy:9984/api/v1/transactions/'
+
+
+@fixture
+def driver():
+    from bigchaindb_driver import BigchainDB
+    return BigchainDB('http://dummy:9984')
+
+
+@fixture
+def transactions(alice_keypair, signed_alice_transaction):
+    from bigchaindb_driver.offchain import build_transfer_chain
+    return [signed_alice_transaction] + build_transfer_chain(
+        signed_alice_transaction,
+        hops=[(alice_keypair.vk, alice_keypair.sk)] * 2)
+
+
+def test_record_is_idempotent(transactions):
+    from bigchaindb_driver.outbox import Outbox
+    with Outbox() as outbox:
+        outbox.record(transactions)
+        outbox.record(transactions[0])
+        assert len(outbox) == 3
+        assert outbox.unfinished() == transactions
+        assert outbox.state(transactions[0]['id']) == 'pending'
+        assert outbox.state('unknown') is None
+
+
+def test_record_survives_restart(tmpdir, transactions):
+    from bigchaindb_driver.outbox import Outbox
+    path = str(tmpdir.join('outbox.db'))
+    with Outbox(path) as outbox:
+        outbox.record(transactions)
+        outbox.mark(transactions[0]['id'], 'committed')
+    with Outbox(path) as outbox:
+        assert outbox.unfinished() == transactions[1:]
+        assert outbox.purge() == 1
+        assert len(outbox) == 2
+
+
+def test_unsupported_synchronous_setting():
+    from bigchaindb_driver.outbox import Outbox
+    with raises(ValueError):
+        Outbox(synchronous='NORMAL; DROP TABLE outbox')
+    Outbox(synchronous='FULL').close()
+
+
+def test_concurrent_use(transactions):
+    from concurrent.futures import ThreadPoolExecutor
+    from bigchaindb_driver.outbox import Outbox
+
+    def journal(transaction):
+        for _ in range(50):
+            outbox.record(transaction)
+            outbox.mark(transaction['id'], 'sent')
+            outbox.unfinished()
+        return outbox.state(transaction['id'])
+
+    with Outbox() as outbox:
+        with ThreadPoolExecutor(len(transactions)) as executor:
+            states = list(executor.map(journal, transactions))
+        assert states == ['sent'] * 3
+        assert len(outbox) == 3
+
+
+def test_send(driver, transactions):
+    from bigchaindb_driver.exceptions import BadRequest
+    from bigchaindb_driver.outbox import Outbox
+    with Outbox() as outbox, RequestsMock() as requests_mock:
+        requests_mock.add('POST', TRANSACTIONS_URL, json=transactions[0],
+                          status=202)
+        requests_mock.add('POST', TRANSACTIONS_URL, json={}, status=400)
+        outbox.send(driver, transactions[0])
+        assert outbox.state(transactions[0]['id']) == 'sent'
+        with raises(BadRequest):
+            outbox.send(driver, transactions[1], mode='commit')
+        assert outbox.state(transactions[1]['id']) == 'failed'
+
+
+def test_send_unsupported_mode(driver, transactions):
+    from bigchaindb_driver.exceptions import BigchaindbException
+    from bigchaindb_driver.outbox import Outbox
+    with Outbox() as outbox, raises(BigchaindbException):
+        outbox.send(driver, transactions[0], mode='eventually')
+
+
+def test_replay(driver, transactions):
+    from bigchaindb_driver.outbox import Outbox
+    committed, resent, rejected = transactions
+    with Outbox() as outbox, RequestsMock() as requests_mock:
+        outbox.record(transactions)
+        outbox.mark(resent['id'], 'sent')
+        requests_mock.add('GET', TRANSACTIONS_URL + committed['id'],
+                          json=committed)
+        for transaction in (resent, rejected):
+            requests_mock.add('GET', TRANSACTIONS_URL + transaction['id'],
+                              json={}, status=404)
+        requests_mock.add('POST', TRANSACTIONS_URL, json=resent, status=202)
+        requests_mock.add('POST', TRANSACTIONS_URL, json={}, status=400)
+
+        replay = outbox.replay(driver, mode='async')
+        assert replay.committed == [committed['id']]
+        assert replay.resent == [resent['id']]
+        assert replay.failed == [rejected['id']]
+        assert [outbox.state(transaction['id'])
+                for transaction in transactions] == [
+                    'committed', 'sent', 'failed']
+        assert outbox.unfinished() == [resent]
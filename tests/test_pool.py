@@ -4,7 +4,7 @@
 
 
 def test_get_connection():
-    from datetime import datetime
+    from time import monotonic
 
     from bigchaindb_driver.connection import Connection
     from bigchaindb_driver.pool import Pool
@@ -23,17 +23,17 @@ def test_get_connection():
         connection = pool.get_connection()
         assert connection.node_url == 0
 
-    connections[0].backoff_time = datetime.utcnow()
+    connections[0].backoff_time = monotonic()
     for _ in range(10):
         connection = pool.get_connection()
         assert connection.node_url == 1
 
-    connections[1].backoff_time = datetime.utcnow()
+    connections[1].backoff_time = monotonic()
     for _ in range(10):
         connection = pool.get_connection()
         assert connection.node_url == 2
 
-    connections[2].backoff_time = datetime.utcnow()
+    connections[2].backoff_time = monotonic()
     for _ in range(10):
         connection = pool.get_connection()
         assert connection.node_url == 0
@@ -0,0 +1,92 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from pytest import fixture, raises
+
+
+@fixture
+def assets(fake_driver, alice_keypair, bob_keypair):
+    from bigchaindb_driver.offchain import (
+        build_transfer_chain,
+        fulfill_transaction,
+        prepare_create_transaction,
+    )
+    bicycle = fulfill_transaction(
+        prepare_create_transaction(
+            signers=alice_keypair.vk,
+            recipients=[([alice_keypair.vk], 3), ([alice_keypair.vk], 4)],
+            asset={'data': {'vehicle': 'bicycle'}}),
+        private_keys=alice_keypair.sk)
+    car = fulfill_transaction(
+        prepare_create_transaction(
+            signers=bob_keypair.vk,
+            asset={'data': {'vehicle': 'car'}}),
+        private_keys=bob_keypair.sk)
+    car_transfer = build_transfer_chain(
+        car, hops=[(alice_keypair.vk, bob_keypair.sk)])[0]
+    for transaction in (bicycle, car, car_transfer):
+        fake_driver.transactions.send_commit(transaction)
+    return bicycle, car, car_transfer
+
+
+def test_resolve_public_key(fake_driver, assets, alice_keypair,
+                            bob_keypair):
+    from bigchaindb_driver.resolver import InputResolver
+    bicycle, car, car_transfer = assets
+    spendables = InputResolver(fake_driver).resolve_public_key(
+        alice_keypair.vk)
+    assert sorted(spendables) == sorted([bicycle['id'], car['id']])
+    assert spendables[bicycle['id']].amount == 7
+    assert spendables[car['id']].amount == 1
+    assert spendables[car['id']].inputs == [{
+        'fulfillment': car_transfer['outputs'][0]['condition']['details'],
+        'fulfills': {'transaction_id': car_transfer['id'],
+                     'output_index': 0},
+        'owners_before': [alice_keypair.vk],
+    }]
+
+    for asset_id, spendable in spendables.items():
+        transfer = fake_driver.transactions.fulfill(
+            fake_driver.transactions.prepare(
+                operation='TRANSFER',
+                inputs=spendable.inputs,
+                recipients=[([bob_keypair.vk], spendable.amount)],
+                asset={'id': asset_id}),
+            private_keys=alice_keypair.sk)
+        fake_driver.transactions.send_commit(transfer)
+    assert fake_driver.outputs.get(alice_keypair.vk, spent=False) == []
+
+
+def test_resolve_caches_outputs(fake_driver, fake_node, assets):
+    from bigchaindb_driver.resolver import InputResolver
+    bicycle, car, car_transfer = assets
+    resolver = InputResolver(fake_driver, cache_size=2)
+    links = [{'transaction_id': bicycle['id'], 'output_index': 1},
+             {'transaction_id': bicycle['id'], 'output_index': 0},
+             {'transaction_id': bicycle['id'], 'output_index': 1}]
+    requests = fake_node.requests
+    spendables = resolver.resolve(links)
+    assert [input_['fulfills']['output_index']
+            for input_ in spendables[bicycle['id']].inputs] == [1, 0]
+    assert fake_node.requests - requests == 1
+    assert resolver.resolve(links) == spendables
+    assert fake_node.requests - requests == 1
+
+    spendables[bicycle['id']].inputs[0]['fulfillment']['type'] = 'changed'
+    assert resolver.resolve(links)[bicycle['id']].inputs[0][
+        'fulfillment'] == bicycle['outputs'][1]['condition']['details']
+
+    resolver.add_transaction(car)
+    resolver.add_transaction(car_transfer)
+    assert len(resolver) == 2
+    resolver.resolve(links)
+    assert fake_node.requests - requests == 2
+
+
+def test_resolve_raises_retrieval_errors(fake_driver):
+    from bigchaindb_driver.exceptions import NotFoundError
+    from bigchaindb_driver.resolver import InputResolver
+    with raises(NotFoundError):
+        InputResolver(fake_driver).resolve(
+            [{'transaction_id': '0' * 64, 'output_index': 0}])
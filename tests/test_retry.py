@@ -0,0 +1,128 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from pytest import approx, mark, raises
+from responses import RequestsMock
+
+
+def http_error(status_code):
+    from bigchaindb_driver.exceptions import HTTP_EXCEPTIONS, TransportError
+    exc_cls = HTTP_EXCEPTIONS.get(status_code, TransportError)
+    return exc_cls(status_code, '', None, 'http://node:9984')
+
+
+@mark.parametrize('method,status_code,retried', (
+    ('POST', 503, True),
+    ('GET', 503, True),
+    ('GET', 504, True),
+    ('POST', 504, False),
+    ('GET', 400, False),
+    ('GET', 404, False),
+))
+def test_should_retry(method, status_code, retried):
+    from bigchaindb_driver.retry import RetryPolicy
+    policy = RetryPolicy()
+    assert policy.should_retry(method, http_error(status_code), 0) is retried
+    assert policy.counts == (
+        {'status_{}'.format(status_code): 1} if retried else {})
+
+
+def test_should_retry_exception_classes():
+    from bigchaindb_driver.exceptions import NotFoundError
+    from bigchaindb_driver.retry import RetryPolicy
+    policy = RetryPolicy(retry_on={NotFoundError: {'GET'}})
+    assert policy.should_retry('GET', http_error(404), 0)
+    assert not policy.should_retry('POST', http_error(404), 0)
+    assert not policy.should_retry('GET', http_error(503), 0)
+    assert policy.counts == {'NotFoundError': 1}
+
+
+def test_should_retry_max_retries():
+    from bigchaindb_driver.retry import RetryPolicy
+    policy = RetryPolicy(max_retries=2)
+    assert policy.should_retry('GET', http_error(503), 1)
+    assert not policy.should_retry('GET', http_error(503), 2)
+
+
+def test_retry_budget():
+    from bigchaindb_driver.retry import RetryBudget, RetryPolicy
+    policy = RetryPolicy(budget=RetryBudget(ratio=0.5, reserve=1, cap=2))
+    assert policy.should_retry('GET', http_error(503), 0)
+    assert not policy.should_retry('GET', http_error(503), 0)
+    policy.on_request()
+    policy.on_request()
+    assert policy.should_retry('GET', http_error(503), 0)
+    for _ in range(10):
+        policy.on_request()
+    assert policy.budget.balance == 2
+    assert policy.counts == {'status_503': 2, 'budget_exhausted': 1}
+
+
+def test_transport_fails_over_to_another_node():
+    from bigchaindb_driver.retry import RetryPolicy
+    from bigchaindb_driver.transport import Transport
+    from bigchaindb_driver.utils import normalize_nodes
+    policy = RetryPolicy()
+    transport = Transport(
+        *normalize_nodes('http://node1:9984', 'http://node2:9984'),
+        retry_policy=policy)
+    with RequestsMock() as requests_mock:
+        requests_mock.add('POST', 'http://node1:9984/', status=503, json={})
+        requests_mock.add('POST', 'http://node2:9984/', json={'ok': True})
+        assert transport.forward_request('POST', path='/') == {'ok': True}
+    assert policy.counts == {'status_503': 1}
+
+
+def test_transport_raises_non_retryable_errors():
+    from bigchaindb_driver.exceptions import GatewayTimeout
+    from bigchaindb_driver.retry import RetryPolicy
+    from bigchaindb_driver.transport import Transport
+    from bigchaindb_driver.utils import normalize_nodes
+    transport = Transport(
+        *normalize_nodes('http://node1:9984', 'http://node2:9984'),
+        retry_policy=RetryPolicy())
+    with RequestsMock() as requests_mock:
+        requests_mock.add('POST', 'http://node1:9984/', status=504, json={})
+        with raises(GatewayTimeout):
+            transport.forward_request('POST', path='/')
+    assert transport.retry_policy.counts == {}
+
+
+def test_transport_backoff_grows_with_the_retries(monkeypatch):
+    from bigchaindb_driver.retry import RetryPolicy
+    from bigchaindb_driver.transport import Transport
+    from bigchaindb_driver.utils import normalize_nodes
+    sleeps = []
+    monkeypatch.setattr('bigchaindb_driver.connection.time.sleep',
+                        sleeps.append)
+    transport = Transport(*normalize_nodes('http://node1:9984'),
+                          retry_policy=RetryPolicy(max_retries=3))
+    with RequestsMock() as requests_mock:
+        for _ in range(3):
+            requests_mock.add('POST', 'http://node1:9984/', status=503,
+                              json={})
+        requests_mock.add('POST', 'http://node1:9984/', json={'ok': True})
+        assert transport.forward_request('POST', path='/') == {'ok': True}
+    assert sleeps == [approx(0.5, abs=0.1), approx(1, abs=0.1),
+                      approx(2, abs=0.1)]
+
+
+def test_transport_metrics_use_the_reason_of_the_policy():
+    from bigchaindb_driver.exceptions import ServiceUnavailable
+    from bigchaindb_driver.metrics import MetricsRegistry
+    from bigchaindb_driver.retry import RetryPolicy
+    from bigchaindb_driver.transport import Transport
+    from bigchaindb_driver.utils import normalize_nodes
+    registry = MetricsRegistry()
+    policy = RetryPolicy(retry_on={ServiceUnavailable: {'POST'}})
+    transport = Transport(
+        *normalize_nodes('http://node1:9984', 'http://node2:9984'),
+        retry_policy=policy, metrics=registry)
+    with RequestsMock() as requests_mock:
+        requests_mock.add('POST', 'http://node1:9984/', status=503, json={})
+        requests_mock.add('POST', 'http://node2:9984/', json={'ok': True})
+        transport.forward_request('POST', path='/')
+    assert policy.counts == {'ServiceUnavailable': 1}
+    assert registry.get('bigchaindb_driver_retries_total',
+                        reason='ServiceUnavailable') == 1
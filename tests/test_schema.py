@@ -0,0 +1,100 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from copy import deepcopy
+
+from pytest import fixture, mark, raises
+from responses import RequestsMock
+
+
+@fixture
+def signed_transfer(alice_keypair, signed_alice_transaction):
+    from bigchaindb_driver.offchain import build_transfer_chain
+    transfer, = build_transfer_chain(
+        signed_alice_transaction, hops=[(alice_keypair.vk, alice_keypair.sk)])
+    return transfer
+
+
+def test_validate_transaction(alice_transaction, signed_alice_transaction,
+                              signed_transfer):
+    from bigchaindb_driver.schema import validate_transaction
+    validate_transaction(alice_transaction)
+    validate_transaction(signed_alice_transaction)
+    validate_transaction(signed_transfer)
+
+
+def test_validators_are_cached():
+    from bigchaindb_driver.schema import get_validators
+    base, create = get_validators('2.0', 'CREATE')
+    assert get_validators('2.0', 'TRANSFER')[0] is base
+    assert get_validators('2.0', 'CREATE')[1] is create
+
+
+@mark.parametrize('path,value,pointer', (
+    (('version',), '1.0', 'version 1.0'),
+    (('id',), 'not-a-hash', '#/id'),
+    (('outputs', 0, 'amount'), 1, '#/outputs/0/amount'),
+    (('outputs', 0, 'condition', 'uri'), 'ni:///sha-256;x',
+     '#/outputs/0/condition/uri'),
+    (('outputs', 0, 'public_keys', 0), 'O0', '#/outputs/0/public_keys/0'),
+    (('inputs', 0, 'fulfillment'), 'not/base64', '#/inputs/0/fulfillment'),
+    (('inputs', 0, 'fulfills', 'transaction_id'), 'x',
+     '#/inputs/0/fulfills/transaction_id'),
+    (('inputs', 0, 'fulfills', 'output_index'), -1, '#/inputs/0/fulfills'),
+    (('metadata',), {}, '#/metadata'),
+))
+def test_validate_transaction_raises(signed_transfer, path, value, pointer):
+    from bigchaindb_driver.exceptions import SchemaValidationError
+    from bigchaindb_driver.schema import validate_transaction
+    transaction = deepcopy(signed_transfer)
+    node = transaction
+    for key in path[:-1]:
+        node = node[key]
+    node[path[-1]] = value
+    with raises(SchemaValidationError) as exc:
+        validate_transaction(transaction)
+    assert pointer in str(exc.value)
+
+
+def test_validate_transaction_operation_constraints(
+        signed_alice_transaction):
+    from bigchaindb_driver.exceptions import SchemaValidationError
+    from bigchaindb_driver.schema import validate_transaction
+    transaction = deepcopy(signed_alice_transaction)
+    transaction['operation'] = 'TRANSFER'
+    with raises(SchemaValidationError):
+        validate_transaction(transaction)
+    with raises(SchemaValidationError):
+        validate_transaction({'version': '2.0'})
+
+
+@mark.parametrize('field,value', (
+    ('version', ['2.0']),
+    ('operation', {'CREATE': True}),
+))
+def test_validate_transaction_unhashable_fields(signed_alice_transaction,
+                                                field, value):
+    from bigchaindb_driver.exceptions import SchemaValidationError
+    from bigchaindb_driver.schema import get_validators, validate_transaction
+    transaction = dict(signed_alice_transaction, **{field: value})
+    with raises(SchemaValidationError):
+        validate_transaction(transaction)
+    with raises(SchemaValidationError):
+        get_validators(transaction['version'], transaction['operation'])
+
+
+def test_send_validates_transaction(signed_alice_transaction):
+    from bigchaindb_driver import BigchainDB
+    from bigchaindb_driver.exceptions import SchemaValidationError
+    driver = BigchainDB('http://dummy')
+    transaction = deepcopy(signed_alice_transaction)
+    transaction['outputs'][0]['amount'] = 1
+    with RequestsMock() as requests_mock:
+        with raises(SchemaValidationError):
+            driver.transactions.send_commit(transaction, validate=True)
+        assert not requests_mock.calls
+        requests_mock.add('POST', 'http://dummy:9984/api/v1/transactions/',
+                          json=signed_alice_transaction, status=202)
+        driver.transactions.send_async(signed_alice_transaction,
+                                       validate=True)
@@ -0,0 +1,148 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from pytest import fixture, mark, raises
+from responses import RequestsMock
+
+
+def candidates(*amounts, asset_id='asset'):
+    from bigchaindb_driver.selection import SpendableOutput
+    return [SpendableOutput({'index': index}, amount, asset_id)
+            for index, amount in enumerate(amounts)]
+
+
+def amounts(selected):
+    return sorted(c.amount for c in selected)
+
+
+@fixture
+def divisible_transaction(alice_keypair):
+    from bigchaindb_driver.offchain import (
+        fulfill_transaction, prepare_create_transaction)
+    return fulfill_transaction(
+        prepare_create_transaction(
+            signers=alice_keypair.vk,
+            recipients=[([alice_keypair.vk], amount)
+                        for amount in (5, 3, 2, 1)]),
+        private_keys=alice_keypair.sk,
+    )
+
+
+@mark.parametrize('strategy,amount,expected', (
+    ('largest_first', 6, [4, 4]),
+    ('smallest_first', 6, [1, 2, 3]),
+    ('branch_and_bound', 6, [2, 4]),
+    ('branch_and_bound', 9, [1, 4, 4]),
+    ('branch_and_bound', 11, [3, 4, 4]),
+))
+def test_select_outputs(strategy, amount, expected):
+    from bigchaindb_driver.selection import select_outputs
+    selected = select_outputs(candidates(4, 3, 2, 1, 4), amount,
+                              strategy=strategy)
+    assert amounts(selected) == expected
+
+
+def test_branch_and_bound_falls_back_to_largest_first():
+    from bigchaindb_driver.selection import branch_and_bound
+    selected = branch_and_bound(candidates(2, 4, 4), 5)
+    assert amounts(selected) == [4, 4]
+
+
+@mark.parametrize('strategy', ('largest_first', 'smallest_first',
+                               'branch_and_bound'))
+def test_select_outputs_insufficient_funds(strategy):
+    from bigchaindb_driver.exceptions import InsufficientFundsError
+    from bigchaindb_driver.selection import select_outputs
+    with raises(InsufficientFundsError):
+        select_outputs(candidates(1, 2), 4, strategy=strategy)
+
+
+def test_select_outputs_unknown_strategy():
+    from bigchaindb_driver.exceptions import BigchaindbException
+    from bigchaindb_driver.selection import select_outputs
+    with raises(BigchaindbException):
+        select_outputs(candidates(1), 1, strategy='random')
+
+
+def test_branch_and_bound_many_candidates():
+    from bigchaindb_driver.selection import branch_and_bound
+    selected = branch_and_bound(candidates(*([1] * 5000), 7, 3), 10)
+    assert amounts(selected) == [3, 7]
+
+
+def test_prepare_divisible_transfer(alice_keypair, bob_keypair,
+                                    divisible_transaction):
+    from bigchaindb_driver.offchain import fulfill_transaction
+    from bigchaindb_driver.common.transaction import Transaction
+    from bigchaindb_driver.selection import (
+        prepare_divisible_transfer, spendable_outputs)
+    asset_id = divisible_transaction['id']
+    transfer = prepare_divisible_transfer(
+        candidates=spendable_outputs([divisible_transaction],
+                                     alice_keypair.vk),
+        asset_id=asset_id,
+        recipients=bob_keypair.vk,
+        amount=7,
+        change_public_key=alice_keypair.vk,
+    )
+    assert transfer['asset'] == {'id': asset_id}
+    assert [i['fulfills']['output_index'] for i in transfer['inputs']] == \
+        [0, 1]
+    assert [(o['public_keys'], o['amount']) for o in transfer['outputs']] == \
+        [([bob_keypair.vk], '7'), ([alice_keypair.vk], '1')]
+    signed = fulfill_transaction(transfer, private_keys=alice_keypair.sk)
+    outputs = Transaction.from_dict(divisible_transaction).outputs
+    assert Transaction.from_dict(signed).inputs_valid(outputs[:2])
+
+
+def test_prepare_divisible_transfer_without_change(alice_keypair,
+                                                   bob_keypair,
+                                                   divisible_transaction):
+    from bigchaindb_driver.selection import (
+        prepare_divisible_transfer, spendable_outputs)
+    transfer = prepare_divisible_transfer(
+        candidates=spendable_outputs([divisible_transaction],
+                                     alice_keypair.vk),
+        asset_id=divisible_transaction['id'],
+        recipients=bob_keypair.vk,
+        amount=6,
+        change_public_key=alice_keypair.vk,
+        strategy='branch_and_bound',
+    )
+    assert len(transfer['inputs']) == 2
+    assert [o['amount'] for o in transfer['outputs']] == ['6']
+
+
+def test_spendable_output(alice_keypair, divisible_transaction):
+    from bigchaindb_driver.selection import (
+        spendable_output, spendable_outputs)
+    output = spendable_output(divisible_transaction, 1)
+    assert output.input['fulfills'] == {
+        'output_index': 1, 'transaction_id': divisible_transaction['id']}
+    assert output.amount == int(
+        divisible_transaction['outputs'][1]['amount'])
+    assert output.asset_id == divisible_transaction['id']
+    assert output in spendable_outputs([divisible_transaction],
+                                       alice_keypair.vk)
+
+
+def test_fetch_spendable_outputs(alice_keypair, divisible_transaction):
+    from bigchaindb_driver import BigchainDB
+    from bigchaindb_driver.selection import fetch_spendable_outputs
+    driver = BigchainDB('http://dummy')
+    api = 'http://dummy:9984/api/v1'
+    txid = divisible_transaction['id']
+    with RequestsMock() as requests_mock:
+        requests_mock.add('GET', api + '/outputs/', json=[
+            {'transaction_id': txid, 'output_index': 1},
+            {'transaction_id': txid, 'output_index': 3},
+        ])
+        requests_mock.add('GET', api + '/transactions/' + txid,
+                          json=divisible_transaction)
+        outputs = fetch_spendable_outputs(driver, alice_keypair.vk)
+        assert len(requests_mock.calls) == 2
+    assert [(o.amount, o.asset_id) for o in outputs] == [(3, txid),
+                                                         (1, txid)]
+    assert outputs[0].input['fulfills'] == {'transaction_id': txid,
+                                            'output_index': 1}
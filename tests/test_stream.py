@@ -0,0 +1,268 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import asyncio
+import base64
+import hashlib
+import json
+import struct
+import threading
+
+from pytest import fixture, raises
+
+
+class StreamServer:
+    """Stand-in for the WebSocket event stream of a node, running in its
+    own thread and event loop.
+
+    Each connection receives the events queued with :meth:`publish`, and
+    is dropped after ``drop_after`` events, if set.
+    """
+
+    def __init__(self, drop_after=None):
+        self.drop_after = drop_after
+        self.connections = 0
+        self._events = []
+        self._ready = threading.Event()
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+
+    @property
+    def url(self):
+        return 'ws://127.0.0.1:{}/api/v1/streams/valid_transactions'.format(
+            self.port)
+
+    def start(self):
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self):
+        asyncio.run_coroutine_threadsafe(
+            self._shutdown(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def publish(self, *events):
+        self._loop.call_soon_threadsafe(self._events.extend, events)
+
+    def _serve(self):
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(
+            asyncio.start_server(self._handle, '127.0.0.1', 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._server = server
+        self._handlers = set()
+        self._loop.run_forever()
+
+    async def _shutdown(self):
+        self._server.close()
+        for handler in self._handlers:
+            handler.cancel()
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+
+    async def _handle(self, reader, writer):
+        self._handlers.add(asyncio.current_task())
+        try:
+            await self._serve_connection(reader, writer)
+        finally:
+            writer.close()
+            self._handlers.discard(asyncio.current_task())
+
+    async def _serve_connection(self, reader, writer):
+        self.connections += 1
+        headers = {}
+        await reader.readline()
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b''):
+                break
+            name, _, value = line.decode().partition(':')
+            headers[name.strip().lower()] = value.strip()
+        if 'sec-websocket-key' not in headers:
+            return
+        accept = base64.b64encode(hashlib.sha1(
+            (headers['sec-websocket-key'] +
+             '258EAFA5-E914-47DA-95CA-C5AB0DC85B11').encode()).digest())
+        writer.write(b'HTTP/1.1 101 Switching Protocols\r\n'
+                     b'Upgrade: websocket\r\nConnection: Upgrade\r\n'
+                     b'Sec-WebSocket-Accept: ' + accept + b'\r\n\r\n')
+        # NOTE: Ping first, to exercise the pong sent by the client.
+        writer.write(struct.pack('!BB', 0x89, 0))
+        sent = 0
+        while self.drop_after is None or sent < self.drop_after:
+            if self._events:
+                payload = json.dumps(self._events.pop(0)).encode()
+                writer.write(struct.pack('!BBH', 0x81, 126, len(payload)) +
+                             payload)
+                sent += 1
+            else:
+                await asyncio.sleep(0.005)
+
+
+@fixture
+def server():
+    server = StreamServer()
+    server.start()
+    yield server
+    server.stop()
+
+
+def event(txid, asset_id='asset', height=1):
+    return {'transaction_id': txid, 'asset_id': asset_id, 'height': height}
+
+
+def test_apply_mask():
+    from bigchaindb_driver.stream import _apply_mask
+    payload = b'hello, world'
+    mask = b'\x01\x02\x03\x04'
+    masked = _apply_mask(payload, mask)
+    assert masked == bytes(b ^ mask[i % 4] for i, b in enumerate(payload))
+    assert _apply_mask(masked, mask) == payload
+    assert _apply_mask(b'', mask) == b''
+
+
+def test_callbacks_and_filters(server):
+    from bigchaindb_driver.stream import Event, EventStream
+    received = []
+    with EventStream(server.url, asset_ids=['mine']) as stream:
+        stream.subscribe(received.append)
+        waiter = stream.waiter('b')
+        stream.start()
+        server.publish(event('a', 'mine'), event('b', 'other', 2))
+        assert waiter.result(timeout=5) == Event('b', 'other', 2)
+    assert received == [Event('a', 'mine', 1)]
+
+
+def test_waiters_are_cancelled_on_close(server):
+    from bigchaindb_driver.stream import EventStream
+    stream = EventStream(server.url)
+    stream.start()
+    waiter = stream.waiter('a')
+    stream.close()
+    assert waiter.cancelled()
+
+
+def test_reconnects_with_backoff():
+    from bigchaindb_driver.stream import EventStream
+    server = StreamServer(drop_after=1)
+    server.start()
+    try:
+        with EventStream(server.url, backoff_base=0.01) as stream:
+            waiters = [stream.waiter(txid) for txid in 'abc']
+            stream.start()
+            server.publish(*(event(txid) for txid in 'abc'))
+            for waiter in waiters:
+                waiter.result(timeout=5)
+        assert server.connections >= 3
+    finally:
+        server.stop()
+
+
+def test_async_iterator(server):
+    from bigchaindb_driver.stream import EventStream
+
+    async def consume(stream):
+        task = asyncio.ensure_future(stream.run())
+        server.publish(event('a', 'other'), event('b'), event('c'))
+        events = []
+        async for item in stream.events():
+            events.append(item.transaction_id)
+            if len(events) == 2:
+                stream.close()
+        await task
+        return events
+
+    stream = EventStream(server.url, transaction_ids=['b', 'c'])
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(consume(stream)) == ['b', 'c']
+    finally:
+        loop.close()
+
+
+def test_wait_for(server):
+    from bigchaindb_driver.stream import EventStream
+
+    async def wait(stream):
+        task = asyncio.ensure_future(stream.run())
+        server.publish(event('a', height=7))
+        try:
+            return await stream.wait_for('a', timeout=5)
+        finally:
+            stream.close()
+            await task
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(
+            wait(EventStream(server.url))).height == 7
+    finally:
+        loop.close()
+
+
+def test_from_driver(server):
+    from responses import RequestsMock
+    from bigchaindb_driver import BigchainDB
+    from bigchaindb_driver.stream import EventStream
+    driver = BigchainDB('http://dummy:9984')
+    with RequestsMock() as requests_mock:
+        requests_mock.add('GET', 'http://dummy:9984/api/v1',
+                          json={'streams': server.url})
+        assert EventStream.from_driver(driver).url == server.url
+    with RequestsMock() as requests_mock:
+        requests_mock.add('GET', 'http://dummy:9984/api/v1', status=404,
+                          json={})
+        assert EventStream.from_driver(driver).url == (
+            'ws://dummy:9985/api/v1/streams/valid_transactions')
+
+
+def test_wait_for_again_after_a_timeout(server):
+    from bigchaindb_driver.stream import EventStream
+
+    async def wait(stream):
+        task = asyncio.ensure_future(stream.run())
+        try:
+            with raises(asyncio.TimeoutError):
+                await stream.wait_for('a', timeout=0.05)
+            assert stream._waiters == {}
+            waiter = asyncio.ensure_future(stream.wait_for('a', timeout=5))
+            await asyncio.sleep(0)
+            server.publish(event('a', height=7))
+            return await waiter
+        finally:
+            stream.close()
+            await task
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(
+            wait(EventStream(server.url))).height == 7
+    finally:
+        loop.close()
+
+
+def test_a_timeout_does_not_cancel_other_waiters(server):
+    from bigchaindb_driver.stream import EventStream
+
+    async def wait(stream):
+        task = asyncio.ensure_future(stream.run())
+        try:
+            patient = asyncio.ensure_future(stream.wait_for('a', timeout=5))
+            with raises(asyncio.TimeoutError):
+                await stream.wait_for('a', timeout=0.05)
+            assert len(stream._waiters['a']) == 1
+            server.publish(event('a', height=7))
+            return await patient
+        finally:
+            stream.close()
+            await task
+
+    loop = asyncio.new_event_loop()
+    try:
+        assert loop.run_until_complete(
+            wait(EventStream(server.url))).height == 7
+    finally:
+        loop.close()
@@ -0,0 +1,88 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from pytest import fixture, raises
+from responses import RequestsMock
+
+
+@fixture
+def aggregator():
+    from bigchaindb_driver.tracing import SpanAggregator, set_tracer
+    aggregator = SpanAggregator()
+    previous = set_tracer(aggregator)
+    yield aggregator
+    set_tracer(previous)
+
+
+def test_noop_tracer_is_the_default():
+    from bigchaindb_driver.tracing import NOOP_TRACER, get_tracer, span
+    assert get_tracer() is NOOP_TRACER
+    assert not NOOP_TRACER.enabled
+    with span('stage') as noop_span:
+        assert noop_span is span('other stage')
+
+
+def test_set_tracer_none_turns_tracing_off(aggregator):
+    from bigchaindb_driver.tracing import NOOP_TRACER, get_tracer, set_tracer
+    assert set_tracer(None) is aggregator
+    assert get_tracer() is NOOP_TRACER
+
+
+def test_aggregator_self_times(aggregator, monkeypatch):
+    from bigchaindb_driver import tracing
+    clock = iter((0, 1, 3, 4, 4.5, 10))
+    monkeypatch.setattr(tracing, 'perf_counter', lambda: next(clock))
+    with tracing.span('outer'):
+        with tracing.span('inner'):
+            pass
+        with raises(ValueError), tracing.span('inner'):
+            raise ValueError
+    assert aggregator.stats == {
+        'outer': (1, 10, 7.5),
+        'inner': (2, 2.5, 2.5),
+    }
+    report = aggregator.report().splitlines()
+    assert report[0].split()[0] == 'stage'
+    assert report[1].split() == [
+        'outer', '1', '10000.000', '10000.000', '7500.000', '75.0']
+    assert report[2].split() == [
+        'inner', '2', '2500.000', '1250.000', '2500.000', '25.0']
+    aggregator.reset()
+    assert aggregator.stats == {}
+    assert aggregator.report().split() == [
+        'stage', 'calls', 'total', '(ms)', 'mean', '(ms)', 'self', '(ms)',
+        'self', '%']
+
+
+def test_offchain_spans(aggregator, alice_keypair):
+    from bigchaindb_driver.offchain import (
+        fulfill_transaction,
+        prepare_transaction,
+    )
+    prepared = prepare_transaction(signers=alice_keypair.vk,
+                                   asset={'data': {'serial': 1}})
+    fulfill_transaction(prepared, private_keys=alice_keypair.sk)
+    stats = aggregator.stats
+    for name in ('prepare_transaction', 'fulfill_transaction',
+                 'transaction.create', 'transaction.from_dict',
+                 'transaction.to_dict', 'transaction.serialize',
+                 'transaction.hash', 'transaction.sign',
+                 'transaction.sign_input'):
+        assert stats[name][0] >= 1, name
+    assert stats['transaction.sign'][0] == 1
+    assert stats['transaction.sign_input'][0] == 1
+    outermost = stats['prepare_transaction'][1] + \
+        stats['fulfill_transaction'][1]
+    assert abs(sum(stat[2] for stat in stats.values()) - outermost) < 1e-6
+
+
+def test_forward_request_spans(aggregator):
+    from bigchaindb_driver.transport import Transport
+    transport = Transport({'endpoint': 'http://dummy:9984', 'headers': {}})
+    with RequestsMock() as requests_mock:
+        requests_mock.add('GET', 'http://dummy:9984/', json={})
+        transport.forward_request('GET', path='/')
+    stats = aggregator.stats
+    assert stats['transport.forward_request'][0] == 1
+    assert stats['connection.request'][0] == 1
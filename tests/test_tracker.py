@@ -0,0 +1,169 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+import json
+from urllib.parse import parse_qs, urlparse
+
+from pytest import fixture, raises
+from responses import RequestsMock
+
+
+BLOCKS_URL = 'http://dummy:9984/api/v1/blocks/'
+
+
+@fixture
+def driver():
+    from bigchaindb_driver import BigchainDB
+    return BigchainDB('http://dummy:9984')
+
+
+class Ledger:
+    """Serves the blocks endpoint from a list of blocks."""
+
+    def __init__(self):
+        self.blocks = []
+        self.lookups = []
+
+    def commit(self, *txids):
+        self.blocks.append({
+            'height': len(self.blocks) + 1,
+            'transactions': [{'id': txid} for txid in txids],
+        })
+
+    def get(self, request):
+        txid, = parse_qs(urlparse(request.url).query)['transaction_id']
+        self.lookups.append(txid)
+        heights = [block['height'] for block in self.blocks
+                   if {'id': txid} in block['transactions']]
+        return 200, {}, json.dumps(heights)
+
+    def retrieve(self, request):
+        height = int(urlparse(request.url).path.rsplit('/', 1)[1])
+        return 200, {}, json.dumps(self.blocks[height - 1])
+
+    def mock(self, requests_mock):
+        requests_mock.add_callback('GET', BLOCKS_URL, callback=self.get,
+                                   content_type='application/json')
+        for height in range(1, 10):
+            requests_mock.add_callback(
+                'GET', BLOCKS_URL + str(height), callback=self.retrieve,
+                content_type='application/json')
+
+
+@fixture
+def ledger():
+    return Ledger()
+
+
+def test_poll_resolves_committed_transactions(driver, ledger):
+    from bigchaindb_driver.tracker import CommitTracker
+    ledger.commit('a', 'b', 'c')
+    with CommitTracker(driver, background=False, batch_size=1) as tracker:
+        futures = [tracker.track(txid) for txid in ('a', 'b', 'c', 'd')]
+        again = tracker.track({'id': 'a'})
+        assert again is not futures[0]
+        with RequestsMock(assert_all_requests_are_fired=False) as mock:
+            ledger.mock(mock)
+            assert tracker.poll() == 3
+        assert [future.result() for future in futures[:3]] == [1, 1, 1]
+        assert again.result() == 1
+        assert not futures[3].done()
+        assert tracker.pending == 1
+        # NOTE: 'b' and 'c' are resolved through the block of 'a'.
+        assert ledger.lookups == ['a']
+    assert futures[3].cancelled()
+
+
+def test_poll_respects_poll_interval(driver, ledger):
+    from bigchaindb_driver.tracker import CommitTracker
+    with CommitTracker(driver, background=False,
+                       poll_interval=60) as tracker:
+        future = tracker.track('a')
+        with RequestsMock(assert_all_requests_are_fired=False) as mock:
+            ledger.mock(mock)
+            assert tracker.poll() == 0
+            ledger.commit('a')
+            assert tracker.poll() == 0
+        assert ledger.lookups == ['a']
+        assert not future.done()
+
+
+def test_poll_times_out(driver):
+    from bigchaindb_driver.exceptions import CommitTimeoutError
+    from bigchaindb_driver.tracker import CommitTracker
+    with CommitTracker(driver, background=False) as tracker:
+        future = tracker.track('a', timeout=0)
+        assert tracker.poll() == 1
+        with raises(CommitTimeoutError) as exc:
+            future.result()
+    assert exc.value.transaction_id == 'a'
+
+
+def test_track_in_background(driver, ledger):
+    from bigchaindb_driver.tracker import CommitTracker
+    ledger.commit('a')
+    with RequestsMock(assert_all_requests_are_fired=False) as mock:
+        ledger.mock(mock)
+        with CommitTracker(driver, poll_interval=0.01) as tracker:
+            assert tracker.track('a').result(timeout=5) == 1
+
+
+def test_track_async(driver, ledger):
+    import asyncio
+    from bigchaindb_driver.tracker import CommitTracker
+    ledger.commit('a')
+
+    async def wait_for_commit(tracker):
+        return await tracker.track_async('a')
+
+    with RequestsMock(assert_all_requests_are_fired=False) as mock:
+        ledger.mock(mock)
+        with CommitTracker(driver, poll_interval=0.01) as tracker:
+            loop = asyncio.new_event_loop()
+            try:
+                assert loop.run_until_complete(wait_for_commit(tracker)) == 1
+            finally:
+                loop.close()
+
+
+def test_track_async_timeout_leaves_other_callers(driver, ledger):
+    import asyncio
+    from bigchaindb_driver.tracker import CommitTracker
+
+    async def wait_for_commit(tracker):
+        with raises(asyncio.TimeoutError):
+            await asyncio.wait_for(tracker.track_async('a'), 0.05)
+
+    with CommitTracker(driver, background=False) as tracker:
+        future = tracker.track('a')
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(wait_for_commit(tracker))
+        finally:
+            loop.close()
+        assert not future.done()
+        again = tracker.track('a')
+        assert not again.done()
+        ledger.commit('a')
+        with RequestsMock(assert_all_requests_are_fired=False) as mock:
+            ledger.mock(mock)
+            assert tracker.poll() == 1
+        assert future.result() == again.result() == 1
+
+
+def test_poll_drops_abandoned_transactions(driver):
+    from bigchaindb_driver.tracker import CommitTracker
+    with CommitTracker(driver, background=False) as tracker:
+        tracker.track('a').cancel()
+        assert tracker.poll() == 0
+        assert tracker.pending == 0
+
+
+def test_track_closed(driver):
+    from bigchaindb_driver.exceptions import BigchaindbException
+    from bigchaindb_driver.tracker import CommitTracker
+    tracker = CommitTracker(driver)
+    tracker.close()
+    with raises(BigchaindbException):
+        tracker.track('a')
@@ -2,6 +2,8 @@
 # SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
 # Code is Apache-2.0 and docs are CC-BY-4.0
 
+import os
+
 import pytest
 
 from unittest.mock import patch
@@ -31,7 +33,7 @@ def test_init_with_headers():
                                               'custom': 'c'}
 
 
-@patch('bigchaindb_driver.transport.time')
+@patch('bigchaindb_driver.transport.monotonic')
 @patch('bigchaindb_driver.transport.Connection._request')
 def test_timeout_after_first_node(request_mock, time_mock):
 
@@ -54,7 +56,7 @@ def test_timeout_after_first_node(request_mock, time_mock):
     assert request_kwargs['timeout'] == 1
 
 
-@patch('bigchaindb_driver.transport.time')
+@patch('bigchaindb_driver.transport.monotonic')
 @patch('bigchaindb_driver.transport.Connection._request')
 def test_timeout_after_second_node(request_mock, time_mock):
 
@@ -77,7 +79,7 @@ def test_timeout_after_second_node(request_mock, time_mock):
     assert second_request_kwargs['timeout'] == 1
 
 
-@patch('bigchaindb_driver.transport.time')
+@patch('bigchaindb_driver.transport.monotonic')
 @patch('bigchaindb_driver.transport.Connection._request')
 def test_timeout_during_request(request_mock, time_mock):
 
@@ -94,3 +96,196 @@ def test_timeout_during_request(request_mock, time_mock):
     request_kwargs = request_mock.call_args_list[0][1]
     assert 'first_node' in request_kwargs['url']
     assert request_kwargs['timeout'] == 100
+
+
+def test_limiter_is_released_on_overload():
+    from functools import partial
+    from responses import RequestsMock
+    from bigchaindb_driver.exceptions import ServiceUnavailable
+    from bigchaindb_driver.limiter import AIMDLimiter
+    transport = Transport(*normalize_nodes('http://node:9984'),
+                          limiter_class=partial(AIMDLimiter,
+                                                initial_limit=4))
+    limiter, = transport.limiters.values()
+    with RequestsMock() as requests_mock:
+        requests_mock.add('POST', 'http://node:9984/', status=503, json={})
+        requests_mock.add('GET', 'http://node:9984/', status=503, json={})
+        with pytest.raises(ServiceUnavailable):
+            transport.forward_request('POST', path='/')
+        with pytest.raises(ServiceUnavailable):
+            transport.forward_request('GET', path='/')
+    assert limiter.limit == 2
+    assert limiter.in_flight == 0
+
+
+@patch('bigchaindb_driver.transport.Connection._request')
+def test_limiter_latency_excludes_backoff(request_mock):
+    from time import monotonic
+    from bigchaindb_driver.connection import HttpResponse
+    from bigchaindb_driver.limiter import AIMDLimiter
+    request_mock.return_value = HttpResponse(200, {}, {})
+    transport = Transport(*normalize_nodes('http://node:9984'),
+                          timeout=5, limiter_class=AIMDLimiter)
+    limiter, = transport.limiters.values()
+    connection, = transport.connection_pool.connections
+    connection.backoff_time = monotonic() + 0.2
+    start = monotonic()
+    transport.forward_request('POST', path='/')
+    assert monotonic() - start >= 0.2
+    assert limiter.latency < 0.1
+    assert request_mock.call_args[1]['timeout'] < 4.9
+
+
+def test_limiter_times_out():
+    from bigchaindb_driver.limiter import AIMDLimiter
+    transport = Transport(*normalize_nodes('http://node:9984'),
+                          timeout=0.01, limiter_class=AIMDLimiter)
+    limiter, = transport.limiters.values()
+    limiter.in_flight = limiter.limit
+    with pytest.raises(TimeoutError):
+        transport.forward_request('POST', path='/')
+
+
+@patch('bigchaindb_driver.transport.monotonic')
+@patch('bigchaindb_driver.transport.Connection._request')
+def test_timeout_per_request(request_mock, monotonic_mock):
+    request_mock.side_effect = ConnectionError
+    monotonic_mock.side_effect = [0, 1]
+    transport = Transport(*normalize_nodes('first_node', 'second_node'),
+                          timeout=100)
+
+    with pytest.raises(TimeoutError):
+        transport.forward_request('GET', timeout=1)
+
+    assert len(request_mock.call_args_list) == 1
+    assert request_mock.call_args_list[0][1]['timeout'] == 1
+
+
+@patch('bigchaindb_driver.transport.monotonic')
+@patch('bigchaindb_driver.transport.Connection._request')
+def test_deadline_caps_timeout(request_mock, monotonic_mock):
+    request_mock.side_effect = ConnectionError
+    monotonic_mock.side_effect = [10, 10, 12]
+    transport = Transport(*normalize_nodes('first_node', 'second_node'),
+                          timeout=100)
+
+    with pytest.raises(TimeoutError):
+        transport.forward_request('GET', deadline=12)
+
+    assert len(request_mock.call_args_list) == 1
+    assert request_mock.call_args_list[0][1]['timeout'] == 2
+
+
+@pytest.mark.parametrize('endpoint,method,args', (
+    ('transactions', 'get', {'asset_id': 'a'}),
+    ('transactions', 'retrieve', {'txid': 'a'}),
+    ('transactions', 'send_async', {'transaction': {}}),
+    ('transactions', 'send_sync', {'transaction': {}}),
+    ('transactions', 'send_commit', {'transaction': {}}),
+    ('outputs', 'get', {'public_key': 'a'}),
+    ('blocks', 'get', {'txid': 'a'}),
+    ('blocks', 'retrieve', {'block_height': '1'}),
+    ('assets', 'get', {'search': 'a'}),
+    ('metadata', 'get', {'search': 'a'}),
+))
+def test_endpoints_pass_timeout(endpoint, method, args):
+    from bigchaindb_driver import BigchainDB
+    driver = BigchainDB('first_node')
+    with patch.object(driver.transport, 'forward_request',
+                      return_value=[]) as forward_request:
+        getattr(getattr(driver, endpoint), method)(timeout=0.5, **args)
+    assert forward_request.call_args[1]['timeout'] == 0.5
+
+
+def test_connections_are_rebuilt_after_fork():
+    from bigchaindb_driver.limiter import AIMDLimiter
+    transport = Transport(*normalize_nodes('node1', 'node2'),
+                          limiter_class=AIMDLimiter)
+    connections = transport.connection_pool.connections
+    limiters = transport.limiters
+    assert transport.connection_pool.connections is connections
+    with patch('bigchaindb_driver.transport.os.getpid', return_value=-1):
+        new_connections = transport.connection_pool.connections
+        assert not set(new_connections) & set(connections)
+        assert len(new_connections) == 2
+        assert set(transport.limiters) == set(new_connections)
+        assert transport.limiters is not limiters
+        assert transport.connection_pool.connections is new_connections
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason='requires fork')
+def test_forked_process_uses_own_connections():
+    from bigchaindb_driver.fakenode import FakeNode
+    from bigchaindb_driver.httpclient import HTTPClientTransport
+    with FakeNode() as node:
+        transport = HTTPClientTransport(*normalize_nodes(node.url))
+        transport.forward_request('GET', '/')
+        connection = transport.connection_pool.connections[0]
+        idle = list(connection._idle)
+        pid = os.fork()
+        if not pid:
+            status = 1
+            try:
+                transport.forward_request('GET', '/')
+                if transport.connection_pool.connections[0] is not \
+                        connection:
+                    status = 0
+            finally:
+                os._exit(status)
+        _, status = os.waitpid(pid, 0)
+        assert os.WEXITSTATUS(status) == 0
+        assert list(connection._idle) == idle
+        transport.forward_request('GET', '/')
+        assert list(connection._idle) == idle
+        assert node.requests == 3
+
+
+@patch('bigchaindb_driver.transport.Connection._request')
+def test_shared_backoff(request_mock):
+    from bigchaindb_driver.connection import HttpResponse
+    from bigchaindb_driver.pool import SharedBackoff
+
+    def request(url, **kwargs):
+        if 'node1' in url:
+            raise ConnectionError
+        return HttpResponse(200, {}, {'url': url})
+
+    request_mock.side_effect = request
+    nodes = normalize_nodes('node1', 'node2')
+    shared_backoff = SharedBackoff(2)
+    worker1 = Transport(*nodes, shared_backoff=shared_backoff)
+    worker2 = Transport(*nodes, shared_backoff=shared_backoff)
+    assert worker1.forward_request('GET', '/')['url'] == 'http://node2:9984/'
+    assert request_mock.call_count == 2
+    backoff_times = shared_backoff.backoff_times()
+    assert 0 < backoff_times[0] <= 0.5
+    assert backoff_times[1] == 0
+    # NOTE: The second worker skips the node in backoff.
+    assert worker2.forward_request('GET', '/')['url'] == 'http://node2:9984/'
+    assert request_mock.call_count == 3
+    assert worker2.connection_pool.connections[0]._retries == 1
+
+
+def test_shared_backoff_size_must_match_nodes():
+    from bigchaindb_driver.pool import SharedBackoff
+    with pytest.raises(ValueError):
+        Transport(*normalize_nodes('node1', 'node2'),
+                  shared_backoff=SharedBackoff(1))
+
+
+def test_forward_request_without_decoding():
+    from responses import RequestsMock
+    from bigchaindb_driver.exceptions import NotFoundError
+    from bigchaindb_driver.transport import Transport
+    from bigchaindb_driver.utils import normalize_nodes
+    transport = Transport(*normalize_nodes('http://node1:9984'))
+    with RequestsMock() as requests_mock:
+        requests_mock.add('GET', 'http://node1:9984/', body='[{"a": 1}]',
+                          content_type='application/json')
+        requests_mock.add('GET', 'http://node1:9984/b', status=404,
+                          json={'message': 'Not found'})
+        assert transport.forward_request(
+            'GET', path='/', decode=False) == '[{"a": 1}]'
+        with pytest.raises(NotFoundError) as exc:
+            transport.forward_request('GET', path='/b', decode=False)
+    assert exc.value.info == {'message': 'Not found'}
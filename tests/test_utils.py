@@ -35,3 +35,11 @@ def test_single_node_normalization(node, normalized_node):
 def test_iterable_of_nodes_normalization(nodes, normalized_nodes):
     from bigchaindb_driver.utils import normalize_nodes
     assert normalize_nodes(*nodes) == normalized_nodes
+
+
+def test_get_asset_id():
+    from bigchaindb_driver.utils import get_asset_id
+    assert get_asset_id({'id': 'a', 'operation': 'CREATE',
+                         'asset': {'data': None}}) == 'a'
+    assert get_asset_id({'id': 'b', 'operation': 'TRANSFER',
+                         'asset': {'id': 'a'}}) == 'a'
@@ -0,0 +1,170 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from pytest import fixture
+from responses import RequestsMock
+
+
+@fixture(params=('memory', 'sqlite'))
+def utxo_index(request, tmpdir):
+    from bigchaindb_driver.utxo import SqliteUTXOIndex, UTXOIndex
+    if request.param == 'memory':
+        return UTXOIndex()
+    return SqliteUTXOIndex(str(tmpdir.join('utxo.db')))
+
+
+@fixture
+def alice_to_bob(alice_keypair, bob_keypair, signed_alice_transaction):
+    from bigchaindb_driver.offchain import build_transfer_chain
+    transfer, = build_transfer_chain(
+        signed_alice_transaction, hops=[(bob_keypair.vk, alice_keypair.sk)])
+    return transfer
+
+
+def links(outputs):
+    return {(output.transaction_id, output.output_index)
+            for output in outputs}
+
+
+def test_add_transaction(utxo_index, alice_keypair, bob_keypair,
+                         signed_alice_transaction, alice_to_bob):
+    asset_id = signed_alice_transaction['id']
+    utxo_index.add_transaction(signed_alice_transaction)
+    output, = utxo_index.unspent(public_key=alice_keypair.vk)
+    assert output.transaction_id == asset_id
+    assert output.output_index == 0
+    assert output.amount == 1
+    assert output.asset_id == asset_id
+    assert output.public_keys == (alice_keypair.vk,)
+
+    utxo_index.add_transaction(alice_to_bob)
+    utxo_index.add_transaction(alice_to_bob)
+    assert utxo_index.unspent(public_key=alice_keypair.vk) == []
+    assert links(utxo_index.unspent(public_key=bob_keypair.vk)) == {
+        (alice_to_bob['id'], 0)}
+    assert links(utxo_index.unspent(asset_id=asset_id)) == {
+        (alice_to_bob['id'], 0)}
+    assert utxo_index.unspent(public_key=bob_keypair.vk,
+                              asset_id='other') == []
+
+
+def test_add_transaction_out_of_order(utxo_index, alice_keypair,
+                                      signed_alice_transaction,
+                                      alice_to_bob):
+    utxo_index.add_transaction(alice_to_bob)
+    utxo_index.add_transaction(signed_alice_transaction)
+    assert links(utxo_index.unspent()) == {(alice_to_bob['id'], 0)}
+
+
+def test_reconcile(utxo_index, alice_keypair, bob_keypair,
+                   signed_alice_transaction, alice_to_bob):
+    from bigchaindb_driver import BigchainDB
+    driver = BigchainDB('http://dummy', utxo_index=utxo_index)
+    api = 'http://dummy:9984/api/v1'
+    utxo_index.add_transaction(signed_alice_transaction)
+    utxo_index.add_transaction(alice_to_bob)
+    with RequestsMock() as requests_mock:
+        # the node never saw the transfer to bob
+        requests_mock.add(
+            'GET', api + '/outputs/',
+            json=[{'transaction_id': signed_alice_transaction['id'],
+                   'output_index': 0}],
+        )
+        requests_mock.add(
+            'GET', api + '/transactions/' + signed_alice_transaction['id'],
+            json=signed_alice_transaction,
+        )
+        result = utxo_index.reconcile(driver, alice_keypair.vk)
+    assert result.added == {(signed_alice_transaction['id'], 0)}
+    assert result.removed == set()
+    assert links(utxo_index.unspent(public_key=alice_keypair.vk)) == {
+        (signed_alice_transaction['id'], 0)}
+
+    with RequestsMock() as requests_mock:
+        requests_mock.add('GET', api + '/outputs/', json=[])
+        result = utxo_index.reconcile(driver, bob_keypair.vk)
+    assert result.added == set()
+    assert result.removed == {(alice_to_bob['id'], 0)}
+    assert utxo_index.unspent(public_key=bob_keypair.vk) == []
+
+
+def test_driver_updates_index(utxo_index, bob_keypair, alice_to_bob):
+    from bigchaindb_driver import BigchainDB
+    driver = BigchainDB('http://dummy', utxo_index=utxo_index)
+    assert driver.utxo_index is utxo_index
+    with RequestsMock() as requests_mock:
+        requests_mock.add('POST', 'http://dummy:9984/api/v1/transactions/',
+                          json=alice_to_bob, status=202)
+        driver.transactions.send_async(alice_to_bob)
+    assert links(utxo_index.unspent(public_key=bob_keypair.vk)) == {
+        (alice_to_bob['id'], 0)}
+
+
+def test_memory_index_drops_spent_outputs(alice_keypair,
+                                          signed_alice_transaction,
+                                          alice_to_bob):
+    from bigchaindb_driver.utxo import UTXOIndex
+    utxo_index = UTXOIndex()
+    utxo_index.add_transaction(signed_alice_transaction)
+    utxo_index.add_transaction(alice_to_bob)
+    assert list(utxo_index._outputs) == [(alice_to_bob['id'], 0)]
+    assert alice_keypair.vk not in utxo_index._by_public_key
+    assert signed_alice_transaction['id'] in utxo_index._by_asset_id
+
+
+def test_sqlite_index_drops_spent_outputs(alice_keypair,
+                                          signed_alice_transaction,
+                                          alice_to_bob):
+    from bigchaindb_driver.utxo import SqliteUTXOIndex
+    utxo_index = SqliteUTXOIndex()
+    utxo_index.add_transaction(alice_to_bob)
+    utxo_index.add_transaction(signed_alice_transaction)
+    for table in ('outputs', 'owners'):
+        assert utxo_index._db.execute(
+            'SELECT DISTINCT transaction_id FROM ' + table).fetchall() == [
+                (alice_to_bob['id'],)]
+
+
+def test_reconcile_leaves_index_on_error(utxo_index, bob_keypair,
+                                         signed_alice_transaction,
+                                         alice_to_bob):
+    from pytest import raises
+    from bigchaindb_driver import BigchainDB
+    from bigchaindb_driver.exceptions import NotFoundError
+    driver = BigchainDB('http://dummy', utxo_index=utxo_index)
+    api = 'http://dummy:9984/api/v1'
+    utxo_index.add_transaction(alice_to_bob)
+    with RequestsMock() as requests_mock:
+        requests_mock.add(
+            'GET', api + '/outputs/',
+            json=[{'transaction_id': signed_alice_transaction['id'],
+                   'output_index': 0}],
+        )
+        requests_mock.add(
+            'GET', api + '/transactions/' + signed_alice_transaction['id'],
+            status=404,
+        )
+        with raises(NotFoundError):
+            utxo_index.reconcile(driver, bob_keypair.vk)
+    assert links(utxo_index.unspent()) == {(alice_to_bob['id'], 0)}
+
+
+def test_concurrent_use(utxo_index, alice_keypair):
+    from concurrent.futures import ThreadPoolExecutor
+    from bigchaindb_driver.offchain import (
+        fulfill_transaction,
+        prepare_create_transaction,
+    )
+    transactions = [fulfill_transaction(
+        prepare_create_transaction(signers=alice_keypair.vk,
+                                   asset={'data': {'serial': i}}),
+        private_keys=alice_keypair.sk) for i in range(20)]
+
+    def add(transaction):
+        utxo_index.add_transaction(transaction)
+        return len(utxo_index.unspent(public_key=alice_keypair.vk))
+
+    with ThreadPoolExecutor(4) as executor:
+        list(executor.map(add, transactions))
+    assert len(utxo_index.unspent(public_key=alice_keypair.vk)) == 20
@@ -0,0 +1,176 @@
+# Copyright BigchainDB GmbH and BigchainDB contributors
+# SPDX-License-Identifier: (Apache-2.0 AND CC-BY-4.0)
+# Code is Apache-2.0 and docs are CC-BY-4.0
+
+from copy import deepcopy
+
+from pytest import fixture, mark
+
+
+@fixture
+def chain(alice_keypair, bob_keypair, signed_alice_transaction):
+    from bigchaindb_driver.offchain import build_transfer_chain
+    return build_transfer_chain(
+        signed_alice_transaction,
+        hops=[(bob_keypair.vk, alice_keypair.sk),
+              (alice_keypair.vk, bob_keypair.sk)],
+    )
+
+
+def test_verify_transaction(signed_alice_transaction, chain):
+    from bigchaindb_driver.validation import Verdict, verify_transaction
+    assert verify_transaction(signed_alice_transaction) == Verdict(
+        signed_alice_transaction['id'], True, None)
+    verdict = verify_transaction(
+        chain[0], [signed_alice_transaction['outputs'][0]])
+    assert verdict.valid
+
+
+@mark.parametrize('tamper,reason', (
+    (lambda tx: tx.update(id='0' * 64), 'InvalidHash'),
+    (lambda tx: tx['outputs'][0].update(amount=1), 'SchemaValidationError'),
+    (lambda tx: tx['asset']['data'].update({'a.b': 1}), 'InvalidKeysError'),
+    (lambda tx: tx.update(metadata={'x': [{'$y': 1}]}), 'InvalidKeysError'),
+))
+def test_verify_transaction_invalid(signed_alice_transaction, tamper,
+                                    reason):
+    from bigchaindb_driver.common.transaction import Transaction
+    from bigchaindb_driver.validation import verify_transaction
+    transaction = deepcopy(signed_alice_transaction)
+    tamper(transaction)
+    if reason != 'InvalidHash':
+        transaction['id'] = None
+        transaction['id'] = Transaction._to_hash(
+            Transaction._to_str(transaction))
+    verdict = verify_transaction(transaction)
+    assert not verdict.valid
+    assert verdict.reason.startswith(reason + ':')
+
+
+def test_verify_transaction_bad_signature(bob_keypair, chain,
+                                          signed_alice_transaction):
+    from bigchaindb_driver.validation import verify_transaction
+    # the output spent by chain[1] is bob's, not alice's
+    verdict = verify_transaction(
+        chain[1], [signed_alice_transaction['outputs'][0]])
+    assert verdict == (chain[1]['id'], False,
+                       'ValidationError: Invalid fulfillment')
+
+
+def test_verify_transaction_missing_outputs(chain):
+    from bigchaindb_driver.validation import verify_transaction
+    assert not verify_transaction(chain[0]).valid
+    assert 'not found' in verify_transaction(chain[0], [None]).reason
+
+
+@mark.parametrize('workers,chunk_size', ((1, 256), (2, 1)))
+def test_verify_transactions(signed_alice_transaction, chain, workers,
+                             chunk_size):
+    from bigchaindb_driver.validation import verify_transactions
+    forged = deepcopy(chain[1])
+    forged['metadata'] = {'forged': True}
+    verdicts = verify_transactions(
+        chain + [forged, 'garbage'],
+        known_transactions=[signed_alice_transaction],
+        workers=workers,
+        chunk_size=chunk_size,
+    )
+    assert [v.valid for v in verdicts] == [True, True, False, False]
+    assert [v.transaction_id for v in verdicts[:3]] == \
+        [chain[0]['id'], chain[1]['id'], chain[1]['id']]
+    assert verdicts[2].reason.startswith('InvalidHash:')
+
+    verdicts = verify_transactions(chain, workers=workers,
+                                   chunk_size=chunk_size)
+    assert [v.valid for v in verdicts] == [False, True]
+
+
+def test_verify_transactions_known_transactions_take_precedence(
+        signed_alice_transaction, carol_keypair, bob_keypair):
+    from bigchaindb_driver.offchain import (
+        fulfill_transaction,
+        prepare_create_transaction,
+        prepare_transfer_transaction,
+    )
+    from bigchaindb_driver.validation import verify_transactions
+    carol_create = prepare_create_transaction(
+        signers=carol_keypair.public_key)
+    # NOTE: The forged parent claims the id of a known transaction, but
+    #       its outputs are locked with carol's key.
+    forged = dict(signed_alice_transaction,
+                  outputs=carol_create['outputs'])
+    txid = signed_alice_transaction['id']
+    spender = fulfill_transaction(
+        prepare_transfer_transaction(
+            inputs={
+                'fulfillment': forged['outputs'][0]['condition']['details'],
+                'fulfills': {'transaction_id': txid, 'output_index': 0},
+                'owners_before': [carol_keypair.public_key],
+            },
+            recipients=bob_keypair.vk,
+            asset={'id': txid}),
+        private_keys=carol_keypair.private_key)
+
+    verdicts = verify_transactions(
+        [forged, spender], known_transactions=[signed_alice_transaction])
+    assert [v.valid for v in verdicts] == [False, False]
+    verdicts = verify_transactions([forged, spender])
+    assert [v.valid for v in verdicts] == [False, False]
+
+
+@mark.parametrize('obj', (
+    {},
+    [],
+    {'a': 1, 'b': {'c': [1, {'d': None}], 'e$': ''}},
+    {'': {'a-b': [[{'x_y': 'z.z'}]]}},
+))
+def test_validate_keys(obj):
+    from bigchaindb_driver.validation import validate_keys
+    validate_keys('asset', obj)
+
+
+def test_find_key_violations():
+    from bigchaindb_driver.validation import find_key_violations
+    obj = {
+        'ok': {'a.b': 1, '$c': 2},
+        'list': [{'d\x00': 3}, [{'e': {'f/g.h': 4}}]],
+        1: 'not a string',
+    }
+    violations = find_key_violations(obj)
+    assert sorted(v.path for v in violations) == [
+        '/1', '/list/0/d\x00', '/list/1/0/e/f~1g.h', '/ok/$c', '/ok/a.b']
+
+
+def test_find_key_violations_with_value_validators():
+    from bigchaindb_driver.common.exceptions import ValidationError
+    from bigchaindb_driver.validation import find_key_violations
+
+    def validate_language(value):
+        if value not in ('en', 'de'):
+            raise ValidationError('Unsupported language')
+
+    obj = {'language': 'en', 'items': [{'language': 'xx'}]}
+    violations = find_key_violations(
+        obj, value_validators={'language': validate_language})
+    assert violations == [('/items/0/language', 'Unsupported language')]
+
+
+def test_validate_keys_reports_all_violations():
+    from pytest import raises
+    from bigchaindb_driver.exceptions import InvalidKeysError
+    from bigchaindb_driver.validation import validate_keys
+    with raises(InvalidKeysError) as exc:
+        validate_keys('metadata', {'a.b': [{'$c': 1}]})
+    assert len(exc.value.violations) == 2
+    assert str(exc.value).startswith('2 invalid key(s) in metadata object')
+
+
+def test_validate_keys_deep_document():
+    from bigchaindb_driver.validation import find_key_violations
+    obj = leaf = {}
+    for _ in range(10000):
+        leaf['a'] = [{}]
+        leaf = leaf['a'][0]
+    leaf['b.c'] = 1
+    violation, = find_key_violations(obj)
+    assert violation.path.endswith('/a/0/b.c')